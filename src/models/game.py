@@ -1,5 +1,10 @@
-from typing import List, Dict, Optional
-from utils.utils import SteamService
+import concurrent.futures
+from typing import Callable, List, Dict, Optional
+from utils.utils import SteamAPIError, SteamService, get_steam_service
+from services.app_index import get_app_index
+
+# Marca propriedades ainda não carregadas (resultados vazios também ficam em cache)
+_NOT_LOADED = object()
 
 class SteamGame:
     """
@@ -17,15 +22,19 @@ class SteamGame:
         _achievements (Dict): Cache das conquistas
     """
 
-    def __init__(self, app_id_or_name: str, steam_utils: Optional[SteamService] = None):
+    def __init__(self, app_id_or_name: str, steam_utils: Optional[SteamService] = None,
+                 eager: bool = False, verbose: bool = True):
         """
         Inicializa um jogo do Steam.
         
         Args:
             app_id_or_name: ID do jogo na Steam ou nome do jogo
-            steam_utils: Instância de SteamUtils (opcional)
+            steam_utils: Instância de SteamService (opcional, padrão: serviço compartilhado)
+            eager: Se True, preenche todas as propriedades com uma única requisição
+            verbose: Se False, não imprime mensagens de carregamento
         """
-        self.steam_utils = steam_utils or SteamService()
+        self.steam_utils = steam_utils or get_steam_service()
+        self.verbose = verbose
         
         # Verifica se o input é um ID (apenas números) ou nome
         if app_id_or_name.isdigit():
@@ -35,15 +44,97 @@ class SteamGame:
             self.app_id = self.search_game_id(app_id_or_name)
             
         # Inicialização dos caches
-        self._basic_info = None
-        self._full_details = None
-        self._requirements = None
-        self._media = None
-        self._categories = None
-        self._price = None
-        self._achievements = None
+        self._basic_info = _NOT_LOADED
+        self._full_details = _NOT_LOADED
+        self._requirements = _NOT_LOADED
+        self._media = _NOT_LOADED
+        self._categories = _NOT_LOADED
+        self._price = _NOT_LOADED
+        self._achievements = _NOT_LOADED
+        
+        if self.verbose:
+            print(f"🎮 Inicializando jogo com ID: {self.app_id}")
+        if eager:
+            self.hydrate()
+
+    @classmethod
+    def load_many(cls, app_ids: List[str], steam_utils: Optional[SteamService] = None,
+                  eager: bool = False, max_workers: int = 10) -> List['SteamGame']:
+        """
+        Carrega vários jogos em paralelo a partir do cache de documentos compartilhado.
+        
+        Args:
+            app_ids: IDs dos jogos na Steam
+            steam_utils: Instância de SteamService (opcional, padrão: serviço compartilhado)
+            eager: Se True, preenche todas as propriedades; se False, apenas as informações básicas
+            max_workers: Número máximo de threads
+            
+        Returns:
+            Lista de jogos, na ordem dos IDs
+        """
+        steam_utils = steam_utils or get_steam_service()
+        games = [cls(str(app_id), steam_utils=steam_utils, verbose=False) for app_id in app_ids]
         
-        print(f"🎮 Inicializando jogo com ID: {self.app_id}")
+        def load(game: 'SteamGame') -> None:
+            if eager:
+                game.hydrate()
+            else:
+                game.basic_info
+        
+        print(f"\n🎮 Carregando {len(games)} jogos...")
+        steam_utils.transport.ensure_pool_size(max_workers)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(load, game): game for game in games}
+            for idx, future in enumerate(concurrent.futures.as_completed(futures), 1):
+                try:
+                    future.result()
+                except Exception as e:
+                    print(f"\n⚠️ Aviso: Erro ao carregar jogo {futures[future].app_id}: {str(e)}")
+                print(f"\r⏳ Progresso: {idx}/{len(games)} jogos", end="")
+        
+        print()
+        return games
+
+    def hydrate(self) -> 'SteamGame':
+        """
+        Preenche todas as propriedades a partir de um único documento appdetails.
+        
+        O documento completo é buscado uma vez; as demais propriedades são
+        projetadas dele sem novas requisições. Propriedades que não existem
+        para o jogo (como preço de jogos gratuitos) continuam sob demanda.
+        Uma projeção que falha com SteamAPIError também fica sob demanda (e é
+        informada no modo verbose); outros erros são propagados.
+        """
+        self._full_details = self.steam_utils.get_game_full_details(self.app_id)
+        loaders = {
+            '_basic_info': self.steam_utils.get_game_info,
+            '_requirements': self.steam_utils.get_game_requirements,
+            '_media': self.steam_utils.get_game_media,
+            '_categories': self.steam_utils.get_game_categories,
+            '_price': self.steam_utils.get_game_price,
+            '_achievements': self.steam_utils.get_game_achievements,
+        }
+        if 'price_overview' not in self._full_details:
+            # Jogo gratuito ou sem preço: não há o que projetar, o preço continua sob demanda
+            del loaders['_price']
+        for attr, loader in loaders.items():
+            if getattr(self, attr) is _NOT_LOADED:
+                try:
+                    setattr(self, attr, loader(self.app_id))
+                except SteamAPIError as e:
+                    if self.verbose:
+                        print(f"⚠️ {attr.strip('_')} indisponível para o jogo {self.app_id}: {e}")
+        return self
+
+    def _load(self, attr: str, message: str, loader: Callable[[str], Dict]) -> Dict:
+        """Carrega uma propriedade uma única vez, mantendo em cache inclusive resultados vazios."""
+        value = getattr(self, attr)
+        if value is _NOT_LOADED:
+            if self.verbose:
+                print(message)
+            value = loader(self.app_id)
+            setattr(self, attr, value)
+        return value
 
     # Métodos estáticos
     @staticmethod
@@ -51,6 +142,9 @@ class SteamGame:
         """
         Busca o ID do jogo pelo nome.
         
+        Consulta primeiro o índice local de nomes (sem rede) e só recorre à
+        busca remota da loja se o índice estiver vazio ou não encontrar o jogo.
+        
         Args:
             game_name: Nome do jogo
             
@@ -61,7 +155,11 @@ class SteamGame:
             ValueError: Se nenhum jogo for encontrado
         """
         try:
-            steam_utils = SteamService()
+            appid = get_app_index().resolve(game_name)
+            if appid is not None:
+                return str(appid)
+            
+            steam_utils = get_steam_service()
             results = steam_utils.steam.apps.search_games(game_name)
             if not results.get('apps'):
                 raise ValueError(f"Nenhum jogo encontrado com o nome: {game_name}")
@@ -75,10 +173,10 @@ class SteamGame:
     @property
     def basic_info(self) -> Dict:
         """Obtém e armazena em cache as informações básicas do jogo."""
-        if not self._basic_info:
-            print(f"📋 Buscando informações básicas do jogo {self.app_id}...")
-            self._basic_info = self.steam_utils.get_game_info(self.app_id)
-        return self._basic_info
+        return self._load(
+            '_basic_info', f"📋 Buscando informações básicas do jogo {self.app_id}...",
+            self.steam_utils.get_game_info
+        )
 
     @property
     def name(self) -> str:
@@ -104,50 +202,47 @@ class SteamGame:
     @property
     def full_details(self) -> Dict:
         """Obtém e armazena em cache todos os detalhes do jogo."""
-        if not self._full_details:
-            print(f"📚 Buscando detalhes completos do jogo {self.app_id}...")
-            self._full_details = self.steam_utils.get_game_full_details(self.app_id)
-        return self._full_details
+        return self._load(
+            '_full_details', f"📚 Buscando detalhes completos do jogo {self.app_id}...",
+            self.steam_utils.get_game_full_details
+        )
 
     @property
     def requirements(self) -> Dict:
         """Obtém e armazena em cache os requisitos do sistema."""
-        if not self._requirements:
-            print(f"💻 Buscando requisitos do sistema para {self.app_id}...")
-            self._requirements = self.steam_utils.get_game_requirements(self.app_id)
-        return self._requirements
+        return self._load(
+            '_requirements', f"💻 Buscando requisitos do sistema para {self.app_id}...",
+            self.steam_utils.get_game_requirements
+        )
 
     @property
     def media(self) -> Dict:
         """Obtém e armazena em cache as mídias do jogo."""
-        if not self._media:
-            print(f"🎬 Buscando mídia para {self.app_id}...")
-            self._media = self.steam_utils.get_game_media(self.app_id)
-        return self._media
+        return self._load('_media', f"🎬 Buscando mídia para {self.app_id}...", self.steam_utils.get_game_media)
 
     @property
     def categories(self) -> Dict:
         """Obtém e armazena em cache as categorias e gêneros."""
-        if not self._categories:
-            print(f"🏷️ Buscando categorias para {self.app_id}...")
-            self._categories = self.steam_utils.get_game_categories(self.app_id)
-        return self._categories
+        return self._load(
+            '_categories', f"🏷️ Buscando categorias para {self.app_id}...",
+            self.steam_utils.get_game_categories
+        )
 
     @property
     def price(self) -> Dict:
         """Obtém e armazena em cache as informações de preço."""
-        if not self._price:
-            print(f"💰 Buscando informações de preço para {self.app_id}...")
-            self._price = self.steam_utils.get_game_price(self.app_id)
-        return self._price
+        return self._load(
+            '_price', f"💰 Buscando informações de preço para {self.app_id}...",
+            self.steam_utils.get_game_price
+        )
 
     @property
     def achievements(self) -> Dict:
         """Obtém e armazena em cache as conquistas do jogo."""
-        if not self._achievements:
-            print(f"🏆 Buscando conquistas para {self.app_id}...")
-            self._achievements = self.steam_utils.get_game_achievements(self.app_id)
-        return self._achievements
+        return self._load(
+            '_achievements', f"🏆 Buscando conquistas para {self.app_id}...",
+            self.steam_utils.get_game_achievements
+        )
 
     # Métodos de acesso direto aos dados
     def get_screenshots(self) -> List[Dict]:
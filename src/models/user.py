@@ -1,19 +1,22 @@
-from typing import List, Dict
-from utils.utils import SteamService
+from typing import List, Dict, Optional
+from utils.utils import SteamService, get_steam_service
+from services.compatibility import CompatibilityMatrix
+from services.social import FriendGraphCrawler, FriendGraphStore
 
 class SteamUser:
     """
     Classe que representa um usuário do Steam com suas funcionalidades.
     """
-    def __init__(self, username: str = None, steam_id: str = None):
+    def __init__(self, username: str = None, steam_id: str = None, steam_utils: SteamService = None):
         """
         Inicializa um usuário do Steam.
         
         Args:
             username: Nome de usuário do Steam
             steam_id: ID do Steam (opcional se username for fornecido)
+            steam_utils: Instância de SteamService (opcional, padrão: serviço compartilhado)
         """
-        self.steam_utils = SteamService()
+        self.steam_utils = steam_utils or get_steam_service()
         self._username = username
         self._steam_id = steam_id
         self._profile_details = None
@@ -49,6 +52,66 @@ class SteamUser:
         """Retorna a lista de amigos do usuário."""
         return self.steam_utils.get_friends_list(self._steam_id)
 
+    @classmethod
+    def load_many(cls, steam_ids: List[str], steam_utils: Optional[SteamService] = None,
+                  include_games: bool = True, max_workers: int = 10) -> List['SteamUser']:
+        """
+        Carrega vários usuários de uma vez, com perfis e bibliotecas já preenchidos.
+        
+        Os perfis vêm de GetPlayerSummaries em lotes de 100 Steam IDs e as
+        bibliotecas são buscadas em paralelo, então um grupo grande custa poucas
+        requisições sequenciais.
+        
+        Args:
+            steam_ids: Steam IDs dos usuários
+            steam_utils: Instância de SteamService (opcional, padrão: serviço compartilhado)
+            include_games: Se True, carrega também as bibliotecas de jogos
+            max_workers: Número máximo de threads
+            
+        Returns:
+            Lista de usuários, na ordem dos Steam IDs (perfis inexistentes são ignorados)
+        """
+        steam_utils = steam_utils or get_steam_service()
+        steam_ids = list(dict.fromkeys(str(steam_id) for steam_id in steam_ids))
+        
+        print(f"\n👥 Carregando {len(steam_ids)} usuários...")
+        summaries = steam_utils.get_player_summaries(steam_ids)
+        not_found = [steam_id for steam_id in steam_ids if steam_id not in summaries]
+        if not_found:
+            print(f"⚠️ Aviso: {len(not_found)} perfis não encontrados: {', '.join(not_found[:10])}")
+        
+        libraries = steam_utils.get_libraries(list(summaries), max_workers) if include_games and summaries else {}
+        
+        users = []
+        for steam_id in steam_ids:
+            summary = summaries.get(steam_id)
+            if summary is None:
+                continue
+            user = cls(username=summary.get('personaname'), steam_id=steam_id, steam_utils=steam_utils)
+            user._profile_details = {'player': summary}
+            if steam_id in libraries:
+                games = libraries[steam_id]
+                user._games = {'game_count': len(games), 'games': games}
+            users.append(user)
+        
+        print(f"✅ {len(users)} usuários carregados")
+        return users
+
+    def crawl_friends(self, max_depth: int = 2, max_nodes: int = 10000, max_workers: int = 8,
+                      store: FriendGraphStore = None) -> FriendGraphStore:
+        """
+        Explora o grafo de amizades a partir deste usuário e o grava no armazenamento local.
+        
+        Args:
+            max_depth: Distância máxima, em amizades, a partir do usuário
+            max_nodes: Número máximo de perfis no grafo
+            max_workers: Número máximo de requisições simultâneas
+            store: Grafo local (padrão: FriendGraphStore())
+        """
+        crawler = FriendGraphCrawler(store=store, api_key=self.steam_utils.KEY, max_workers=max_workers)
+        crawler.crawl(int(self._steam_id), max_depth=max_depth, max_nodes=max_nodes)
+        return crawler.store
+
     @property
     def steam_id(self) -> str:
         """Retorna o Steam ID do usuário."""
@@ -78,4 +141,24 @@ class SteamUser:
             other_user: Outro usuário do Steam para comparação
             num_games: Número de jogos a serem exibidos na comparação
         """
-        return self.steam_utils.print_common_games(self._steam_id, other_user._steam_id, num_games)
\ No newline at end of file
+        return self.steam_utils.print_common_games(self._steam_id, other_user._steam_id, num_games)
+
+    @staticmethod
+    def compatibility_matrix(users: List['SteamUser'], steam_utils: Optional[SteamService] = None,
+                             max_workers: int = 10) -> CompatibilityMatrix:
+        """
+        Calcula a compatibilidade de todos os pares de um grupo de usuários.
+        
+        Bibliotecas já carregadas pelos usuários são reaproveitadas; as demais
+        são buscadas em paralelo.
+        
+        Args:
+            users: Usuários do grupo
+            steam_utils: Instância de SteamService (opcional, padrão: serviço compartilhado)
+            max_workers: Número máximo de threads
+        """
+        steam_utils = steam_utils or get_steam_service()
+        libraries = {user.steam_id: user._games for user in users if user._games}
+        return steam_utils.get_compatibility_matrix(
+            [user.steam_id for user in users], libraries=libraries, max_workers=max_workers
+        )
@@ -0,0 +1,293 @@
+import os
+import re
+import sys
+import time
+import sqlite3
+import bisect
+import threading
+import unicodedata
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from utils.cache import CACHE_DIR
+from utils.http import get_transport
+
+APP_LIST_URL = "https://api.steampowered.com/ISteamApps/GetAppList/v2/"
+
+DEFAULT_INDEX_PATH = os.path.join(CACHE_DIR, "apps.sqlite3")
+
+# Lista de apps considerada desatualizada após uma semana
+APP_LIST_TTL = 7 * 24 * 60 * 60
+
+# Pontuação mínima para resolve: só nome idêntico ou correspondência por termos (aproximações ficam abaixo)
+MIN_RESOLVE_SCORE = 0.5
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+def normalize_name(name: str) -> str:
+    """Normaliza um nome de jogo: sem acentos, símbolos (™, ®, :) e caixa, com espaços simples."""
+    decomposed = unicodedata.normalize('NFKD', name.casefold())
+    stripped = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return _NON_ALNUM.sub(' ', stripped).strip()
+
+def _trigrams(normalized: str) -> set:
+    """Retorna os trigramas de um nome normalizado (com bordas marcadas por espaço)."""
+    padded = f"  {normalized} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class AppNameIndex:
+    """
+    Índice local de nomes de apps da Steam para resolver nomes sem acessar a rede.
+
+    A lista completa de apps (GetAppList) é gravada em SQLite. As buscas usam
+    índices em memória carregados sob demanda: nome normalizado exato, tokens
+    (com o último token da consulta tratado como prefixo) e, como último
+    recurso, trigramas para tolerar erros de digitação.
+
+    Attributes:
+        path (str): Caminho do arquivo SQLite
+    """
+
+    def __init__(self, path: str = None):
+        """
+        Args:
+            path: Caminho do arquivo SQLite (padrão: STEAMATCH_APPS_PATH ou ~/.cache/steamatch)
+        """
+        self.path = path or os.environ.get("STEAMATCH_APPS_PATH", DEFAULT_INDEX_PATH)
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._trigram_postings: Optional[Dict[str, array]] = None
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS apps (
+                appid INTEGER PRIMARY KEY,
+                name TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+            """
+        )
+        self._conn.commit()
+
+    def ingest(self) -> int:
+        """
+        Baixa a lista completa de apps da Steam e substitui o índice local.
+
+        Returns:
+            int: Número de apps gravados
+        """
+        print("\n📥 Baixando lista de apps da Steam...")
+        response = get_transport().get(APP_LIST_URL, timeout=60)
+        if response.status_code != 200:
+            raise ValueError(f"API retornou status {response.status_code}")
+
+        apps = response.json().get('applist', {}).get('apps', [])
+        rows = [(int(app['appid']), app['name'].strip()) for app in apps if app.get('name', '').strip()]
+
+        with self._lock:
+            self._conn.execute("DELETE FROM apps")
+            self._conn.executemany("INSERT OR REPLACE INTO apps (appid, name) VALUES (?, ?)", rows)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('ingested_at', ?)", (str(time.time()),)
+            )
+            self._conn.commit()
+            self._loaded = False
+            self._trigram_postings = None
+
+        print(f"✅ {len(rows)} apps indexados")
+        return len(rows)
+
+    def ingested_at(self) -> Optional[float]:
+        """Retorna o timestamp da última ingestão, se houver."""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'ingested_at'").fetchone()
+        return float(row[0]) if row else None
+
+    def is_stale(self, max_age: float = APP_LIST_TTL) -> bool:
+        """Indica se o índice está vazio ou mais antigo que `max_age` segundos."""
+        ingested_at = self.ingested_at()
+        return ingested_at is None or time.time() - ingested_at > max_age
+
+    def _ensure_loaded(self) -> None:
+        """Carrega os nomes e monta os índices de nome exato e de tokens."""
+        with self._lock:
+            if self._loaded:
+                return
+            rows = self._conn.execute("SELECT appid, name FROM apps ORDER BY appid").fetchall()
+
+            self._appids = array('q', (appid for appid, _ in rows))
+            self._names = [name for _, name in rows]
+            self._normalized = [normalize_name(name) for name in self._names]
+            self._exact: Dict[str, List[int]] = {}
+            token_postings: Dict[str, List[int]] = {}
+            for position, normalized in enumerate(self._normalized):
+                self._exact.setdefault(normalized, []).append(position)
+                for token in set(normalized.split()):
+                    token_postings.setdefault(token, []).append(position)
+
+            self._token_postings = {token: array('I', positions) for token, positions in token_postings.items()}
+            self._sorted_tokens = sorted(self._token_postings)
+            self._loaded = True
+
+    def _ensure_trigrams(self) -> Dict[str, array]:
+        """Monta (uma única vez) o índice de trigramas usado na busca aproximada."""
+        self._ensure_loaded()
+        with self._lock:
+            if self._trigram_postings is None:
+                postings: Dict[str, List[int]] = {}
+                for position, normalized in enumerate(self._normalized):
+                    for trigram in _trigrams(normalized):
+                        postings.setdefault(trigram, []).append(position)
+                self._trigram_counts = np.fromiter(
+                    (len(_trigrams(normalized)) for normalized in self._normalized),
+                    dtype=np.int32, count=len(self._normalized)
+                )
+                self._trigram_postings = {trigram: array('I', positions) for trigram, positions in postings.items()}
+            return self._trigram_postings
+
+    def _prefix_postings(self, prefix: str) -> set:
+        """Retorna as posições dos apps com algum token começando por `prefix`."""
+        positions = set()
+        start = bisect.bisect_left(self._sorted_tokens, prefix)
+        for token in self._sorted_tokens[start:]:
+            if not token.startswith(prefix):
+                break
+            positions.update(self._token_postings[token])
+        return positions
+
+    def _token_candidates(self, tokens: List[str]) -> set:
+        """Apps que contêm todos os tokens da consulta (o último como prefixo)."""
+        candidates = None
+        for token in sorted(tokens[:-1], key=lambda token: len(self._token_postings.get(token, ()))):
+            postings = set(self._token_postings.get(token, ()))
+            candidates = postings if candidates is None else candidates & postings
+            if not candidates:
+                return set()
+        last = self._prefix_postings(tokens[-1])
+        return last if candidates is None else candidates & last
+
+    def _fuzzy_candidates(self, normalized: str, limit: int) -> List[Tuple[int, float]]:
+        """Ranqueia os apps pela similaridade de trigramas (coeficiente de Dice)."""
+        postings = self._ensure_trigrams()
+        query = _trigrams(normalized)
+        lists = [np.frombuffer(postings[trigram], dtype=np.uint32) for trigram in query if trigram in postings]
+        if not lists:
+            return []
+
+        shared = np.bincount(np.concatenate(lists), minlength=len(self._names))
+        scores = 2 * shared / (len(query) + self._trigram_counts)
+        best = np.argpartition(-scores, min(limit, len(scores) - 1))[:limit]
+        return [(int(position), float(scores[position])) for position in best if scores[position] > 0.3]
+
+    def search(self, name: str, limit: int = 5) -> List[Tuple[int, str, float]]:
+        """
+        Busca apps pelo nome, sem acessar a rede.
+
+        Ordem de preferência: nome idêntico, nome que começa com a consulta,
+        nome contendo todos os termos e, por fim, similaridade aproximada. Em
+        cada nível, nomes mais curtos (jogo base antes de DLCs e trilhas
+        sonoras) vêm primeiro.
+
+        Args:
+            name: Nome (ou parte do nome) do jogo
+            limit: Número máximo de resultados
+
+        Returns:
+            Lista de tuplas (appid, nome, pontuação entre 0 e 1)
+        """
+        self._ensure_loaded()
+        normalized = normalize_name(name)
+        if not normalized:
+            return []
+
+        scored: Dict[int, float] = {position: 1.0 for position in self._exact.get(normalized, ())}
+        for position in self._token_candidates(normalized.split()):
+            if position not in scored:
+                candidate = self._normalized[position]
+                # Correspondências por termos ficam entre 0.5 e 0.95, acima de qualquer aproximação
+                coverage = len(normalized) / max(len(candidate), len(normalized))
+                scored[position] = 0.5 + (0.45 if candidate.startswith(normalized) else 0.35) * coverage
+
+        if len(scored) < limit:
+            # Aproximações ficam abaixo de MIN_RESOLVE_SCORE: aparecem na busca, mas não resolvem o nome
+            for position, score in self._fuzzy_candidates(normalized, limit):
+                scored.setdefault(position, score * 0.45)
+
+        ranked = sorted(scored.items(), key=lambda item: (-item[1], len(self._names[item[0]]), self._appids[item[0]]))
+        return [(self._appids[position], self._names[position], round(score, 3)) for position, score in ranked[:limit]]
+
+    def resolve(self, name: str, min_score: float = MIN_RESOLVE_SCORE) -> Optional[int]:
+        """
+        Retorna o appid mais provável para o nome.
+
+        Returns:
+            int: appid, ou None se nada atingir `min_score` (o chamador recorre à busca remota)
+        """
+        results = self.search(name, limit=1)
+        return results[0][0] if results and results[0][2] >= min_score else None
+
+    def resolve_many(self, names: List[str]) -> Dict[str, Optional[int]]:
+        """Resolve vários nomes de uma vez."""
+        return {name: self.resolve(name) for name in names}
+
+    def stats(self) -> Dict:
+        """Retorna o caminho, o número de apps e a data da última ingestão."""
+        with self._lock:
+            apps = self._conn.execute("SELECT COUNT(*) FROM apps").fetchone()[0]
+        return {'path': self.path, 'apps': apps, 'ingested_at': self.ingested_at()}
+
+    def __len__(self) -> int:
+        return self.stats()['apps']
+
+    def close(self) -> None:
+        """Fecha a conexão com o banco."""
+        with self._lock:
+            self._conn.close()
+
+_app_index: Optional[AppNameIndex] = None
+_app_index_lock = threading.Lock()
+
+def get_app_index() -> AppNameIndex:
+    """Retorna o índice de nomes de apps compartilhado pelo processo."""
+    global _app_index
+    with _app_index_lock:
+        if _app_index is None:
+            _app_index = AppNameIndex()
+        return _app_index
+
+def main(argv: List[str]) -> None:
+    """
+    Interface de linha de comando do índice de nomes.
+
+    Uso:
+        python -m services.app_index ingest
+        python -m services.app_index search NOME
+        python -m services.app_index stats
+    """
+    index = get_app_index()
+    command = argv[0] if argv else 'stats'
+
+    if command == 'ingest':
+        index.ingest()
+    elif command == 'search' and len(argv) > 1:
+        for appid, name, score in index.search(' '.join(argv[1:]), limit=10):
+            print(f"   • {appid:>8} {name} ({score:.2f})")
+    elif command == 'stats':
+        stats = index.stats()
+        print(f"📇 Índice de apps: {stats['path']}")
+        print(f"   • {stats['apps']} apps")
+    else:
+        print(f"❌ Comando desconhecido: {command}")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,160 @@
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+from services.scoring import TagMatrix
+from utils.vocabulary import Vocabulary
+
+# Vocabulário de tags e gêneros compartilhado pelos snapshots do processo
+TAG_VOCABULARY = Vocabulary()
+
+def _term_weights(values) -> Dict[str, float]:
+    """Converte tags/gêneros (dict termo->peso, lista de dicts ou de strings) em termo -> peso."""
+    if isinstance(values, dict):
+        return {term: float(weight) for term, weight in values.items()}
+
+    weights = {}
+    for value in values or []:
+        if isinstance(value, dict) and 'description' in value:
+            weights[value['description']] = 1.0
+        elif isinstance(value, str):
+            weights[value] = 1.0
+    return weights
+
+class CompactGameRecord:
+    """
+    Registro compacto de um jogo para catálogos grandes.
+
+    Usa `__slots__` em vez de `__dict__` e guarda tags e gêneros como arrays
+    de IDs inteiros internados no vocabulário, com os pesos das tags em um
+    array de floats de 32 bits.
+    """
+
+    __slots__ = ('appid', 'name', 'playtime_forever', 'rank', 'tag_ids', 'tag_weights', 'genre_ids')
+
+    def __init__(self, appid: int, name: str, playtime_forever: float = 0, rank: int = 0,
+                 tag_ids: array = None, tag_weights: array = None, genre_ids: array = None):
+        self.appid = appid
+        self.name = name
+        self.playtime_forever = playtime_forever
+        self.rank = rank
+        self.tag_ids = tag_ids if tag_ids is not None else array('I')
+        self.tag_weights = tag_weights if tag_weights is not None else array('f')
+        self.genre_ids = genre_ids if genre_ids is not None else array('I')
+
+    @classmethod
+    def from_game(cls, game, vocabulary: Vocabulary = TAG_VOCABULARY) -> 'CompactGameRecord':
+        """
+        Cria um registro a partir de um GameInfo de qualquer um dos recomendadores.
+
+        Args:
+            game: Objeto com appid, name, playtime_forever, rank, tags e genres
+            vocabulary: Vocabulário onde tags e gêneros serão internados
+        """
+        tags = _term_weights(game.tags)
+        return cls(
+            appid=int(game.appid),
+            name=game.name,
+            playtime_forever=game.playtime_forever,
+            rank=getattr(game, 'rank', 0),
+            tag_ids=array('I', (vocabulary.intern(tag) for tag in tags)),
+            tag_weights=array('f', tags.values()),
+            genre_ids=array('I', (vocabulary.intern(genre) for genre in _term_weights(game.genres)))
+        )
+
+    def tags(self, vocabulary: Vocabulary = TAG_VOCABULARY) -> Dict[str, float]:
+        """Retorna as tags como dict termo -> peso."""
+        return {vocabulary.term(tag_id): weight for tag_id, weight in zip(self.tag_ids, self.tag_weights)}
+
+    def genres(self, vocabulary: Vocabulary = TAG_VOCABULARY) -> List[str]:
+        """Retorna os nomes dos gêneros."""
+        return [vocabulary.term(genre_id) for genre_id in self.genre_ids]
+
+    def as_kwargs(self, vocabulary: Vocabulary = TAG_VOCABULARY) -> Dict:
+        """Retorna os campos no formato aceito pelo construtor de GameInfo."""
+        return {
+            'appid': self.appid,
+            'name': self.name,
+            'playtime_forever': self.playtime_forever,
+            'rank': self.rank,
+            'tags': self.tags(vocabulary),
+            'genres': self.genres(vocabulary)
+        }
+
+    def __repr__(self) -> str:
+        return f"CompactGameRecord(appid={self.appid}, name={self.name!r}, tags={len(self.tag_ids)})"
+
+class CompactCatalog:
+    """
+    Snapshot compacto de um catálogo de jogos.
+
+    Attributes:
+        vocabulary (Vocabulary): Vocabulário de tags e gêneros dos registros
+    """
+
+    def __init__(self, games: Iterable = (), vocabulary: Vocabulary = TAG_VOCABULARY):
+        """
+        Args:
+            games: Jogos (GameInfo ou CompactGameRecord) a incluir
+            vocabulary: Vocabulário compartilhado (padrão: TAG_VOCABULARY)
+        """
+        self.vocabulary = vocabulary
+        self._records: List[CompactGameRecord] = []
+        self._positions: Dict[int, int] = {}
+        for game in games:
+            self.add(game)
+
+    def add(self, game) -> CompactGameRecord:
+        """Adiciona (ou substitui) um jogo no snapshot."""
+        record = game if isinstance(game, CompactGameRecord) else CompactGameRecord.from_game(game, self.vocabulary)
+        position = self._positions.get(record.appid)
+        if position is None:
+            self._positions[record.appid] = len(self._records)
+            self._records.append(record)
+        else:
+            self._records[position] = record
+        return record
+
+    def get(self, appid: int) -> Optional[CompactGameRecord]:
+        """Retorna o registro do jogo, se existir."""
+        position = self._positions.get(int(appid))
+        return self._records[position] if position is not None else None
+
+    def __getitem__(self, position: int) -> CompactGameRecord:
+        return self._records[position]
+
+    def __iter__(self) -> Iterator[CompactGameRecord]:
+        return iter(self._records)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, appid: int) -> bool:
+        return int(appid) in self._positions
+
+    def to_tag_matrix(self) -> TagMatrix:
+        """
+        Monta a matriz jogo × tag do ScoringEngine diretamente a partir dos arrays.
+
+        O motor de pontuação deve usar o mesmo vocabulário do snapshot.
+        """
+        lengths = np.fromiter((len(record.tag_ids) for record in self._records), dtype=np.int64,
+                              count=len(self._records))
+        indptr = np.zeros(len(self._records) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=indptr[1:])
+
+        indices = np.empty(indptr[-1], dtype=np.int32)
+        data = np.empty(indptr[-1], dtype=np.float32)
+        for row, record in enumerate(self._records):
+            start, end = indptr[row], indptr[row + 1]
+            if start == end:
+                continue
+            indices[start:end] = np.frombuffer(record.tag_ids, dtype=np.uint32)
+            weights = np.frombuffer(record.tag_weights, dtype=np.float32)
+            total = weights.sum()
+            data[start:end] = weights / total * 100 if total > 0 else 0
+
+        appids = np.fromiter((record.appid for record in self._records), dtype=np.int64,
+                             count=len(self._records))
+        return TagMatrix(appids, indptr, indices, data, self.vocabulary)
@@ -0,0 +1,196 @@
+from typing import Dict, Iterator, List, Tuple, Union
+
+import numpy as np
+
+def _library_games(library: Union[Dict, List[Dict]]) -> List[Dict]:
+    """Extrai a lista de jogos de uma resposta GetOwnedGames (dict com 'games' ou lista)."""
+    if isinstance(library, dict):
+        return library.get('games', []) or []
+    return library or []
+
+class LibraryMatrix:
+    """
+    Bibliotecas de vários usuários codificadas sobre um índice único de appids.
+
+    Cada usuário é uma linha; cada jogo, uma coluna. `owned` é o bitset de
+    posse (uma linha booleana por usuário) e `playtime` guarda as horas
+    jogadas de cada usuário em cada jogo (0 quando não possui).
+
+    Attributes:
+        steam_ids (List[str]): Steam ID de cada linha
+        appids (np.ndarray): appid de cada coluna
+        names (Dict[int, str]): Nome de cada jogo, quando informado pela API
+        owned (np.ndarray): Matriz booleana usuários × jogos
+        playtime (np.ndarray): Matriz float32 de horas jogadas, usuários × jogos
+    """
+
+    def __init__(self, steam_ids: List[str], appids: np.ndarray, names: Dict[int, str],
+                 owned: np.ndarray, playtime: np.ndarray):
+        self.steam_ids = steam_ids
+        self.appids = appids
+        self.names = names
+        self.owned = owned
+        self.playtime = playtime
+        self._rows = {steam_id: row for row, steam_id in enumerate(steam_ids)}
+
+    @classmethod
+    def from_libraries(cls, libraries: Dict[str, Union[Dict, List[Dict]]]) -> 'LibraryMatrix':
+        """
+        Codifica as bibliotecas de vários usuários.
+
+        Args:
+            libraries: Steam ID -> resposta GetOwnedGames (dict com 'games' ou lista de jogos)
+        """
+        steam_ids = [str(steam_id) for steam_id in libraries]
+        games_per_user = [_library_games(library) for library in libraries.values()]
+
+        names: Dict[int, str] = {}
+        rows: List[np.ndarray] = []
+        columns: List[np.ndarray] = []
+        minutes: List[np.ndarray] = []
+        for games in games_per_user:
+            for game in games:
+                if 'name' in game:
+                    names.setdefault(int(game['appid']), game['name'])
+            columns.append(np.fromiter((game['appid'] for game in games), dtype=np.int64, count=len(games)))
+            minutes.append(np.fromiter((game.get('playtime_forever', 0) for game in games),
+                                       dtype=np.float32, count=len(games)))
+            rows.append(np.full(len(games), len(rows), dtype=np.int64))
+
+        all_rows = np.concatenate(rows) if rows else np.zeros(0, dtype=np.int64)
+        all_appids = np.concatenate(columns) if columns else np.zeros(0, dtype=np.int64)
+        all_minutes = np.concatenate(minutes) if minutes else np.zeros(0, dtype=np.float32)
+
+        appids, column_of = np.unique(all_appids, return_inverse=True)
+        owned = np.zeros((len(steam_ids), len(appids)), dtype=bool)
+        playtime = np.zeros((len(steam_ids), len(appids)), dtype=np.float32)
+        owned[all_rows, column_of] = True
+        playtime[all_rows, column_of] = all_minutes / 60
+
+        return cls(steam_ids, appids, names, owned, playtime)
+
+    def __len__(self) -> int:
+        return len(self.steam_ids)
+
+    def row(self, steam_id: Union[str, int]) -> int:
+        """Retorna a linha de um usuário."""
+        return self._rows[str(steam_id)]
+
+    def game_name(self, appid: int) -> str:
+        """Retorna o nome do jogo, ou um nome genérico se a API não o informou."""
+        return self.names.get(int(appid), f"Jogo {appid}")
+
+class CompatibilityMatrix:
+    """
+    Compatibilidade entre todos os pares de usuários de um grupo.
+
+    Attributes:
+        library (LibraryMatrix): Bibliotecas codificadas
+        common_games (np.ndarray): Matriz n × n com o número de jogos em comum de cada par
+        shared_playtime (np.ndarray): Matriz n × n com a soma das horas dos dois
+            usuários nos jogos em comum
+    """
+
+    def __init__(self, library: LibraryMatrix):
+        """
+        Calcula as matrizes de todos os pares em uma única passada vetorizada.
+
+        Com B = bitset de posse e P = horas jogadas (zero fora da biblioteca),
+        `B·Bᵀ` conta os jogos em comum de cada par e `P·Bᵀ + B·Pᵀ` soma as
+        horas dos dois usuários apenas nos jogos que ambos possuem.
+
+        Args:
+            library: Bibliotecas codificadas por LibraryMatrix.from_libraries
+        """
+        self.library = library
+        owned = library.owned.astype(np.float32)
+        played_in_common = library.playtime @ owned.T
+
+        self.common_games = np.rint(owned @ owned.T).astype(np.int64)
+        self.shared_playtime = played_in_common + played_in_common.T
+
+    @classmethod
+    def from_libraries(cls, libraries: Dict[str, Union[Dict, List[Dict]]]) -> 'CompatibilityMatrix':
+        """Codifica as bibliotecas e calcula a compatibilidade de todos os pares."""
+        return cls(LibraryMatrix.from_libraries(libraries))
+
+    @property
+    def steam_ids(self) -> List[str]:
+        """Steam IDs na ordem das linhas/colunas das matrizes."""
+        return self.library.steam_ids
+
+    def pair(self, steamid1: Union[str, int], steamid2: Union[str, int]) -> Tuple[int, float]:
+        """Retorna (jogos em comum, horas somadas nos jogos em comum) de um par."""
+        i, j = self.library.row(steamid1), self.library.row(steamid2)
+        return int(self.common_games[i, j]), float(self.shared_playtime[i, j])
+
+    def top_games(self, steamid1: Union[str, int], steamid2: Union[str, int], limit: int = 10) -> List[Dict]:
+        """
+        Retorna os jogos em comum mais jogados de um par, no formato de get_games_in_common.
+
+        Args:
+            steamid1: Steam ID do primeiro usuário
+            steamid2: Steam ID do segundo usuário
+            limit: Número máximo de jogos
+        """
+        i, j = self.library.row(steamid1), self.library.row(steamid2)
+        common = np.flatnonzero(self.library.owned[i] & self.library.owned[j])
+        hours1 = self.library.playtime[i, common]
+        hours2 = self.library.playtime[j, common]
+        total = hours1 + hours2
+
+        order = np.argsort(-total, kind='stable')[:limit]
+        return [
+            {
+                'appid': int(self.library.appids[common[k]]),
+                'name': self.library.game_name(self.library.appids[common[k]]),
+                'user1_playtime_hours': round(float(hours1[k]), 2),
+                'user2_playtime_hours': round(float(hours2[k]), 2),
+                'total_playtime_hours': round(float(total[k]), 2)
+            }
+            for k in order.tolist()
+        ]
+
+    def top_pairs(self, limit: int = 10, by: str = 'common_games') -> List[Tuple[str, str, int, float]]:
+        """
+        Retorna os pares mais compatíveis do grupo.
+
+        Args:
+            limit: Número máximo de pares
+            by: Critério de ordenação ('common_games' ou 'shared_playtime')
+
+        Returns:
+            Lista de tuplas (steam_id1, steam_id2, jogos em comum, horas somadas)
+        """
+        if by not in ('common_games', 'shared_playtime'):
+            raise ValueError("Critério deve ser 'common_games' ou 'shared_playtime'")
+
+        first, second = np.triu_indices(len(self.library), k=1)
+        values = getattr(self, by)[first, second]
+        order = np.argsort(-values, kind='stable')[:limit]
+        return [
+            (
+                self.steam_ids[first[k]],
+                self.steam_ids[second[k]],
+                int(self.common_games[first[k], second[k]]),
+                float(self.shared_playtime[first[k], second[k]])
+            )
+            for k in order.tolist()
+        ]
+
+    def iter_pairs(self, games_per_pair: int = 5) -> Iterator[Tuple[str, str, int, float, List[Dict]]]:
+        """
+        Percorre todos os pares (i < j) com seus totais e jogos em comum mais jogados.
+
+        Args:
+            games_per_pair: Número de jogos retornados para cada par
+        """
+        for i, j in zip(*np.triu_indices(len(self.library), k=1)):
+            steamid1, steamid2 = self.steam_ids[i], self.steam_ids[j]
+            yield (
+                steamid1,
+                steamid2,
+                int(self.common_games[i, j]),
+                float(self.shared_playtime[i, j]),
+                self.top_games(steamid1, steamid2, games_per_pair)
+            )
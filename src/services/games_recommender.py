@@ -1,19 +1,155 @@
 import os
+import asyncio
 import requests
-from concurrent.futures import ThreadPoolExecutor
-from typing import List, Dict, Tuple, Optional
-import threading
-from functools import partial
+from typing import List, Dict, Tuple, Optional, Iterator, AsyncIterator
 import concurrent.futures
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict
 import time
+import heapq
 from dotenv import load_dotenv
+from utils.cache import get_persistent_cache
+from utils.http import get_transport
+from utils.circuit_breaker import CircuitOpenError
+from utils.async_http import get_async_transport, run_sync
+from utils.vocabulary import normalize_term
+from utils.singleflight import SingleFlight, AsyncSingleFlight
+from utils.retry import retry_policy, retry_as_completed
+from services.tag_catalog import TagCatalog, get_tag_catalog, steamspy_terms
+from services.market_index import MarketIndex, term_descriptions
+from services.scoring import ScoringEngine, TagMatrix
+from services.compact_catalog import CompactCatalog
+from services.streaming import RankingUpdate, stream_top_k, astream_top_k
+from services.pipeline import Pipeline, Stage
+from services.user_snapshot import UserSnapshot, UserSnapshotStore
 
 load_dotenv()
 
 STEAM_API_KEY = os.getenv('STEAM_API_KEY')
 STEAM_ID = os.getenv('STEAM_ID')
 
+STEAMSPY_APPDETAILS_URL = "https://steamspy.com/api.php?request=appdetails&appid={appid}"
+
+# Buscas simultâneas do mesmo jogo (SteamSpy ou loja) compartilham uma única requisição
+_flight = SingleFlight()
+_async_flight = AsyncSingleFlight()
+
+def _cache_steamspy_document(cache, appid: int, data) -> Dict:
+    """
+    Guarda o appdetails do SteamSpy no cache, apenas se for um documento válido (com 'appid').
+    
+    As tags completas também vão para o catálogo local, que passa a atender o
+    app nas próximas execuções sem acessar a rede.
+    
+    Raises:
+        requests.RequestException: Se o corpo não for um appdetails válido
+    """
+    if not isinstance(data, dict) or 'appid' not in data:
+        raise requests.RequestException(f"SteamSpy retornou um appdetails inválido para o jogo {appid}")
+    cache.set('steamspy', appid, data)
+    get_tag_catalog().store_details(appid, data)
+    return data
+
+def request_steamspy_appdetails(appid: int) -> Dict:
+    """
+    Faz uma única tentativa de obter o appdetails do SteamSpy, consultando antes o cache em disco.
+    
+    Threads que pedem o mesmo jogo ao mesmo tempo aguardam a mesma requisição.
+    Quem chama decide se e quando repetir (ver retry_policy('steamspy')). Com
+    o circuito do SteamSpy aberto, devolve a cópia expirada do cache, se houver.
+    
+    Raises:
+        requests.RequestException: Se o SteamSpy não responder com sucesso
+        CircuitOpenError: Se o circuito está aberto e não há cópia em cache
+    """
+    cache = get_persistent_cache()
+    cached = cache.get('steamspy', appid)
+    if cached is not None:
+        return cached
+    
+    def fetch() -> Dict:
+        try:
+            response = get_transport().get(STEAMSPY_APPDETAILS_URL.format(appid=appid), timeout=5,
+                                           endpoint='steamspy')
+        except CircuitOpenError:
+            stale = cache.get_stale('steamspy', appid)
+            if stale is None:
+                raise
+            return stale
+        if response.status_code != 200:
+            raise requests.RequestException(f"SteamSpy retornou status {response.status_code}")
+        return _cache_steamspy_document(cache, appid, response.json())
+    
+    return _flight.do(('steamspy', appid), fetch)
+
+def fetch_steamspy_appdetails(appid: int, max_retries: int = None) -> Dict:
+    """
+    Obtém o appdetails do SteamSpy, repetindo falhas conforme retry_policy('steamspy').
+    
+    As esperas entre tentativas bloqueiam a thread que chama; em pools de
+    threads, prefira request_steamspy_appdetails com retries agendados. Com o
+    circuito aberto, desiste na hora, sem esperar.
+    
+    Args:
+        appid: ID do jogo
+        max_retries: Número total de tentativas (padrão: o da política)
+    
+    Returns:
+        Dict com os dados do jogo (vazio se todas as tentativas falharem)
+    """
+    policy = retry_policy('steamspy')
+    attempts = max_retries or policy.max_attempts
+    for attempt in range(1, attempts + 1):
+        try:
+            return request_steamspy_appdetails(appid)
+        except Exception as e:
+            if attempt == attempts or not policy.should_retry(attempt, e):
+                break
+            time.sleep(policy.delay(attempt))
+    return {}
+
+async def fetch_steamspy_appdetails_async(appid: int, max_retries: int = None) -> Dict:
+    """Versão assíncrona de fetch_steamspy_appdetails (esperas com asyncio.sleep)."""
+    cache = get_persistent_cache()
+    cached = cache.get('steamspy', appid)
+    if cached is not None:
+        return cached
+    
+    async def fetch() -> Dict:
+        try:
+            response = await get_async_transport().get(
+                STEAMSPY_APPDETAILS_URL.format(appid=appid), timeout=5, endpoint='steamspy'
+            )
+        except CircuitOpenError:
+            stale = cache.get_stale('steamspy', appid)
+            if stale is None:
+                raise
+            return stale
+        if response.status_code != 200:
+            raise requests.RequestException(f"SteamSpy retornou status {response.status_code}")
+        return _cache_steamspy_document(cache, appid, response.json())
+    
+    policy = retry_policy('steamspy')
+    attempts = max_retries or policy.max_attempts
+    for attempt in range(1, attempts + 1):
+        try:
+            return await _async_flight.do(('steamspy', appid), fetch)
+        except Exception as e:
+            if attempt == attempts or not policy.should_retry(attempt, e):
+                break
+            await asyncio.sleep(policy.delay(attempt))
+    return {}
+
+def report_degraded_hosts(since: Dict = None) -> None:
+    """
+    Informa os hosts cujo circuito abriu durante a execução (dados vieram do cache ou vazios).
+    
+    Args:
+        since: Checkpoint dos disjuntores no início da execução (breakers.checkpoint())
+    """
+    for host, stats in get_transport().breakers.degraded(since).items():
+        print(f"🔌 {host}: circuito {stats['state']}, {stats['rejected']} requisições recusadas "
+              f"(modo degradado: dados do cache ou vazios)")
+
 @dataclass
 class GameInfo:
     """Classe para armazenar informações de um jogo."""
@@ -24,67 +160,47 @@ class GameInfo:
     genres: Dict = None
     score: float = 0
     matching_tags: List = None
+    rank: int = 0
+
+@dataclass
+class CandidateFilter:
+    """
+    Critérios para descartar candidatos antes de qualquer busca na rede.
+    
+    Attributes:
+        exclude_profile_games: Descarta os jogos usados para construir o perfil
+        max_playtime_hours: Descarta jogos com mais horas jogadas que este limite
+        exclude_played: Descarta qualquer jogo que já tenha sido jogado
+    """
+    exclude_profile_games: bool = True
+    max_playtime_hours: Optional[float] = None
+    exclude_played: bool = False
 
 class SteamGameRecommender:
     """Sistema de recomendação de jogos do Steam."""
     
-    def __init__(self, steam_id: str):
+    OWNED_GAMES_URL = "https://api.steampowered.com/IPlayerService/GetOwnedGames/v1/"
+    
+    def __init__(self, steam_id: str, catalog: TagCatalog = None):
         self.api_key = STEAM_API_KEY
         self.steam_id = steam_id
+        self.catalog = catalog or get_tag_catalog()
         self.user_games: List[GameInfo] = []
         self.user_profile: Dict = {}
+        self.profile_games: List[GameInfo] = []
+        self._tag_memo: Dict[int, Tuple[Dict, Dict]] = {}
         
     def fetch_user_library(self) -> None:
         """Busca a biblioteca de jogos do usuário."""
         print("\n📚 Buscando biblioteca do usuário...")
         
         try:
-            url = "https://api.steampowered.com/IPlayerService/GetOwnedGames/v1/"
-            params = {
-                'key': self.api_key,
-                'steamid': self.steam_id,
-                'include_appinfo': True,
-                'include_played_free_games': True
-            }
-            
             # Adiciona logs para debug
-            print(f"🔄 Fazendo requisição para: {url}")
+            print(f"🔄 Fazendo requisição para: {self.OWNED_GAMES_URL}")
             print(f"🔑 Usando Steam ID: {self.steam_id}")
             
-            response = requests.get(url, params=params, timeout=10)
-            
-            # Verifica o status da resposta
-            print(f"📡 Status da resposta: {response.status_code}")
-            
-            if response.status_code != 200:
-                print(f"❌ Erro na resposta da API: {response.text}")
-                raise ValueError(f"API retornou status {response.status_code}")
-            
-            try:
-                data = response.json()
-            except ValueError as e:
-                print(f"❌ Resposta não é um JSON válido: {response.text[:200]}...")
-                raise
-            
-            if 'response' not in data:
-                print(f"❌ Formato inesperado na resposta: {data}")
-                raise ValueError("Formato de resposta inválido da API Steam")
-            
-            if 'games' not in data['response']:
-                print(f"❌ Nenhum jogo encontrado na resposta: {data['response']}")
-                raise ValueError("Nenhum jogo encontrado na biblioteca")
-            
-            raw_games = data['response']['games']
-            self.user_games = [
-                GameInfo(
-                    appid=game['appid'],
-                    name=game.get('name', f"Jogo {game['appid']}"),
-                    playtime_forever=game.get('playtime_forever', 0) / 60
-                )
-                for game in raw_games if game.get('appid')
-            ]
-            
-            print(f"✅ Encontrados {len(self.user_games)} jogos")
+            response = get_transport().get(self.OWNED_GAMES_URL, params=self._library_params(), timeout=10)
+            self._load_library(response)
             
         except requests.exceptions.RequestException as e:
             print(f"❌ Erro na requisição HTTP: {str(e)}")
@@ -96,38 +212,203 @@ class SteamGameRecommender:
             print(f"❌ Erro inesperado: {str(e)}")
             raise
     
+    async def fetch_user_library_async(self) -> None:
+        """Versão assíncrona de fetch_user_library."""
+        print("\n📚 Buscando biblioteca do usuário...")
+        
+        try:
+            response = await get_async_transport().get(self.OWNED_GAMES_URL, params=self._library_params(), timeout=10)
+            self._load_library(response)
+        except Exception as e:
+            print(f"❌ Erro ao buscar biblioteca: {str(e)}")
+            raise
+    
+    def _library_params(self) -> Dict:
+        """Parâmetros da chamada GetOwnedGames do usuário."""
+        return {
+            'key': self.api_key,
+            'steamid': self.steam_id,
+            'include_appinfo': True,
+            'include_played_free_games': True
+        }
+    
+    def _load_library(self, response) -> None:
+        """Valida a resposta de GetOwnedGames (síncrona ou assíncrona) e preenche user_games."""
+        # Verifica o status da resposta
+        print(f"📡 Status da resposta: {response.status_code}")
+        
+        if response.status_code != 200:
+            print(f"❌ Erro na resposta da API: {response.text}")
+            raise ValueError(f"API retornou status {response.status_code}")
+        
+        try:
+            data = response.json()
+        except ValueError as e:
+            print(f"❌ Resposta não é um JSON válido: {response.text[:200]}...")
+            raise
+        
+        if 'response' not in data:
+            print(f"❌ Formato inesperado na resposta: {data}")
+            raise ValueError("Formato de resposta inválido da API Steam")
+        
+        if 'games' not in data['response']:
+            print(f"❌ Nenhum jogo encontrado na resposta: {data['response']}")
+            raise ValueError("Nenhum jogo encontrado na biblioteca")
+        
+        raw_games = data['response']['games']
+        self.user_games = [
+            GameInfo(
+                appid=game['appid'],
+                name=game.get('name', f"Jogo {game['appid']}"),
+                playtime_forever=game.get('playtime_forever', 0) / 60
+            )
+            for game in raw_games if game.get('appid')
+        ]
+        
+        print(f"✅ Encontrados {len(self.user_games)} jogos")
+    
+    @staticmethod
+    def _steamspy_tags(response: Dict) -> Tuple[Dict, Dict]:
+        """Extrai tags e gêneros de um appdetails do SteamSpy (listas viram dicionários)."""
+        return steamspy_terms(response)
+    
     @staticmethod
     def get_game_info_steamspy(appid: int) -> Tuple[Dict, Dict]:
-        """Obtém informações do jogo via SteamSpy."""
+        """Obtém informações do jogo via SteamSpy (uma única tentativa), consultando antes o cache em disco."""
         try:
-            url = f"https://steamspy.com/api.php?request=appdetails&appid={appid}"
-            response = requests.get(url, timeout=5).json()
-            
-            tags = response.get('tags', {})
-            if isinstance(tags, list):
-                tags = {tag: 1 for tag in tags}
-                
-            genres = response.get('genres', {})
-            if isinstance(genres, list):
-                genres = {genre: 1 for genre in genres}
-                
-            return tags, genres
-            
+            return SteamGameRecommender._steamspy_tags(fetch_steamspy_appdetails(appid, max_retries=1))
         except Exception as e:
             print(f"⚠️ Erro ao buscar dados do jogo {appid}: {str(e)}")
             return {}, {}
     
-    def build_user_profile(self, num_games: int = 10) -> None:
+    @staticmethod
+    async def get_game_info_steamspy_async(appid: int) -> Tuple[Dict, Dict]:
+        """Versão assíncrona de get_game_info_steamspy."""
+        try:
+            return SteamGameRecommender._steamspy_tags(await fetch_steamspy_appdetails_async(appid, max_retries=1))
+        except Exception as e:
+            print(f"⚠️ Erro ao buscar dados do jogo {appid}: {str(e)}")
+            return {}, {}
+    
+    def get_game_tags(self, appid: int) -> Tuple[Dict, Dict]:
+        """
+        Obtém tags e gêneros do jogo.
+        
+        Consulta, nesta ordem, a memória da execução atual, o catálogo local e o
+        SteamSpy. A memória vale até reset_run e guarda apenas buscas bem-sucedidas:
+        uma falha devolve ({}, {}) e o jogo é buscado de novo na próxima consulta.
+        Com o CandidateFilter padrão os jogos do perfil não são candidatos, então
+        a memória não evita buscas entre a construção do perfil e a pontuação; ela
+        serve às consultas repetidas da execução (mais de uma recomendação, o
+        caminho vetorizado e o snapshot de refresh_suggestions).
+        """
+        entry = self._tag_memo.get(appid)
+        if entry is not None:
+            return entry
+        
+        entry = self.catalog.lookup(appid)
+        if entry is None:
+            # Uma única tentativa, como a busca original do perfil: falhas não travam a thread em esperas
+            document = fetch_steamspy_appdetails(appid, max_retries=1)
+            if not document:
+                return {}, {}
+            entry = self._steamspy_tags(document)
+        self._tag_memo[appid] = entry
+        return entry
+    
+    def request_game_tags(self, appid: int) -> Tuple[Dict, Dict]:
+        """
+        Como get_game_tags, mas com uma única tentativa no SteamSpy, que levanta exceção se falhar.
+        
+        Usado nos pools de threads, onde as novas tentativas são agendadas em
+        vez de dormir na thread.
+        """
+        entry = self._tag_memo.get(appid)
+        if entry is not None:
+            return entry
+        
+        entry = self.catalog.lookup(appid)
+        if entry is None:
+            entry = self._steamspy_tags(request_steamspy_appdetails(appid))
+        self._tag_memo[appid] = entry
+        return entry
+    
+    async def get_game_tags_async(self, appid: int) -> Tuple[Dict, Dict]:
+        """Versão assíncrona de get_game_tags, com a mesma memória da execução (só sucessos)."""
+        entry = self._tag_memo.get(appid)
+        if entry is not None:
+            return entry
+        
+        entry = self.catalog.lookup(appid)
+        if entry is None:
+            document = await fetch_steamspy_appdetails_async(appid, max_retries=1)
+            if not document:
+                return {}, {}
+            entry = self._steamspy_tags(document)
+        self._tag_memo[appid] = entry
+        return entry
+    
+    def reset_run(self) -> None:
+        """Descarta a memória de tags da execução anterior."""
+        self._tag_memo = {}
+    
+    def select_candidates(self, candidate_filter: CandidateFilter = None, report: bool = True) -> List[GameInfo]:
+        """
+        Seleciona os jogos da biblioteca que devem ser pontuados.
+        
+        Args:
+            candidate_filter: Critérios de exclusão (sem filtro, todos os jogos são candidatos)
+            report: Exibe quantos jogos o filtro descartou
+            
+        Returns:
+            Lista de jogos candidatos
+        """
+        if candidate_filter is None:
+            return list(self.user_games)
+        
+        profile_appids = {game.appid for game in self.profile_games}
+        candidates = []
+        for game in self.user_games:
+            if candidate_filter.exclude_profile_games and game.appid in profile_appids:
+                continue
+            if candidate_filter.exclude_played and game.playtime_forever > 0:
+                continue
+            if (candidate_filter.max_playtime_hours is not None
+                    and game.playtime_forever > candidate_filter.max_playtime_hours):
+                continue
+            candidates.append(game)
+        
+        if report:
+            print(f"\n🧹 {len(self.user_games) - len(candidates)} jogos descartados pelo filtro, "
+                  f"{len(candidates)} candidatos restantes")
+        return candidates
+    
+    @staticmethod
+    def profile_weight(playtime_hours: float) -> float:
+        """Peso de um jogo no perfil, proporcional ao tempo de jogo (limitado a 100h)."""
+        return 1 + (0.1 * min(playtime_hours, 100))
+    
+    def build_user_profile(self, num_games: int = 10,
+                           game_tags: Optional[Dict[int, Tuple[Dict, Dict]]] = None) -> None:
         """
         Constrói o perfil do usuário baseado nos jogos mais jogados.
         
         Args:
             num_games: Número de jogos a considerar para o perfil
+            game_tags: Tags já buscadas por appid, como retornado por fetch_game_tags_async.
+                Com elas o perfil é montado sem nenhuma requisição: jogos ausentes
+                entram sem tags, como uma busca que falhou.
         """
         print(f"\n🔄 Analisando perfil baseado nos top {num_games} jogos mais jogados...")
         
+        if game_tags is None:
+            lookup = self.get_game_tags
+        else:
+            lookup = lambda appid: game_tags.get(appid, ({}, {}))
+        
         tag_count = {}
         processed_games = 0
+        self.profile_games = []
         
         # Ordena por tempo de jogo e pega os top N
         top_games = sorted(
@@ -140,13 +421,14 @@ class SteamGameRecommender:
             try:
                 if game.playtime_forever > 0:
                     print(f"\n📊 Analisando {game.name} ({game.playtime_forever:.1f}h jogadas)")
-                    tags, genres = self.get_game_info_steamspy(game.appid)
+                    tags, genres = lookup(game.appid)
                     
                     # Peso baseado no tempo de jogo
-                    weight = 1 + (0.1 * min(game.playtime_forever, 100))
+                    weight = self.profile_weight(game.playtime_forever)
                     for tag in tags:
                         tag_count[tag] = tag_count.get(tag, 0) + weight
                         
+                    self.profile_games.append(game)
                     processed_games += 1
                     
             except Exception as e:
@@ -165,94 +447,386 @@ class SteamGameRecommender:
     def process_game(self, game: GameInfo) -> GameInfo:
         """Processa um jogo para recomendação."""
         try:
-            tags, genres = self.get_game_info_steamspy(game.appid)
-            
-            # Normaliza os pesos das tags
-            total_weight = sum(float(weight) for weight in tags.values())
-            normalized_tags = {
-                tag: (float(weight) / total_weight * 100) if total_weight > 0 else 0
-                for tag, weight in tags.items()
-            }
-            
-            # Calcula pontuação e matching tags
-            tag_scores = []
-            total_score = 0
-            
-            for tag, normalized_weight in normalized_tags.items():
-                tag_score = self.user_profile.get(tag, 0)
-                if tag_score > 0:
-                    tag_scores.append({
-                        'tag': tag,
-                        'score': tag_score,
-                        'weight': round(normalized_weight, 2)
-                    })
-                    total_score += tag_score
-            
-            game.score = total_score
-            game.matching_tags = sorted(tag_scores, key=lambda x: x['score'], reverse=True)
-            game.tags = normalized_tags
-            game.genres = genres
+            tags, genres = self.get_game_tags(game.appid)
+            return self.apply_tags(game, tags, genres)
             
+        except Exception as e:
+            print(f"\n❌ Erro ao processar {game.name}: {str(e)}")
             return game
+    
+    def score_game(self, game: GameInfo) -> GameInfo:
+        """Pontua um jogo com uma única tentativa de busca de tags (levanta exceção se falhar)."""
+        return self.apply_tags(game, *self.request_game_tags(game.appid))
+    
+    async def process_game_async(self, game: GameInfo) -> GameInfo:
+        """Versão assíncrona de process_game."""
+        try:
+            tags, genres = await self.get_game_tags_async(game.appid)
+            return self.apply_tags(game, tags, genres)
             
         except Exception as e:
             print(f"\n❌ Erro ao processar {game.name}: {str(e)}")
             return game
     
-    def recommend_games(self, max_recommendations: int = 10, max_workers: int = 10) -> List[GameInfo]:
+    def apply_tags(self, game: GameInfo, tags: Dict, genres: Dict) -> GameInfo:
+        """Pontua o jogo contra o perfil a partir de tags já conhecidas."""
+        # Normaliza os pesos das tags
+        total_weight = sum(float(weight) for weight in tags.values())
+        normalized_tags = {
+            tag: (float(weight) / total_weight * 100) if total_weight > 0 else 0
+            for tag, weight in tags.items()
+        }
+        
+        # Calcula pontuação e matching tags
+        tag_scores = []
+        total_score = 0
+        
+        for tag, normalized_weight in normalized_tags.items():
+            tag_score = self.user_profile.get(tag, 0)
+            if tag_score > 0:
+                tag_scores.append({
+                    'tag': tag,
+                    'score': tag_score,
+                    'weight': round(normalized_weight, 2)
+                })
+                total_score += tag_score
+        
+        game.score = total_score
+        game.matching_tags = sorted(tag_scores, key=lambda x: x['score'], reverse=True)
+        game.tags = normalized_tags
+        game.genres = genres
+        
+        return game
+    
+    def iter_recommendations(self, max_recommendations: int = 10, max_workers: int = 10,
+                             candidate_filter: CandidateFilter = None) -> Iterator[RankingUpdate]:
+        """
+        Gera o ranking parcial de recomendações à medida que os jogos são processados.
+        
+        Apenas o top-k atual é mantido (em um heap limitado), então a memória
+        não cresce com o tamanho da biblioteca.
+        
+        Args:
+            max_recommendations: Tamanho do ranking
+            max_workers: Número máximo de threads
+            candidate_filter: Critérios para descartar candidatos antes da busca (opcional)
+            
+        Returns:
+            Iterador de RankingUpdate, um por jogo processado
+        """
+        if not self.user_profile:
+            raise ValueError("Perfil do usuário não construído. Execute build_user_profile primeiro.")
+        
+        candidates = self.select_candidates(candidate_filter)
+        get_transport().ensure_pool_size(max_workers)
+        
+        # Falhas no SteamSpy são reagendadas, sem deixar threads do pool dormindo
+        return stream_top_k(
+            self.score_game,
+            candidates,
+            total=len(candidates),
+            k=max_recommendations,
+            key=lambda game: game.score,
+            accept=lambda game: game.score > 0,
+            max_workers=max_workers,
+            retry=retry_policy('steamspy')
+        )
+    
+    def recommend_games(self, max_recommendations: int = 10, max_workers: int = 10,
+                        candidate_filter: CandidateFilter = None) -> List[GameInfo]:
         """
         Recomenda jogos baseado no perfil do usuário.
         
         Args:
             max_recommendations: Número máximo de jogos a recomendar
             max_workers: Número máximo de threads
+            candidate_filter: Critérios para descartar candidatos antes da busca (opcional)
+        """
+        updates = self.iter_recommendations(max_recommendations, max_workers, candidate_filter)
+        
+        print(f"\n🚀 Iniciando análise com {max_workers} threads...")
+        
+        top_recommendations = []
+        start_time = time.time()
+        breakers = get_transport().breakers.checkpoint()
+        
+        for update in updates:
+            top_recommendations = update.ranking
+            progress = (update.processed / update.total) * 100
+            print(f"\r⏳ Progresso: {progress:.1f}% ({update.processed}/{update.total} jogos)", end="")
+        
+        execution_time = time.time() - start_time
+        print(f"\n⚡ Tempo de execução: {execution_time:.2f} segundos")
+        report_degraded_hosts(breakers)
+        
+        self._print_recommendations(top_recommendations)
+        return top_recommendations
+
+    def iter_recommendations_async(self, max_recommendations: int = 10, max_concurrency: int = 200,
+                                   candidate_filter: CandidateFilter = None) -> AsyncIterator[RankingUpdate]:
+        """
+        Versão assíncrona de iter_recommendations: todas as buscas correm em uma única thread.
+        
+        Args:
+            max_recommendations: Tamanho do ranking
+            max_concurrency: Número máximo de jogos em andamento
+            candidate_filter: Critérios para descartar candidatos antes da busca (opcional)
         """
         if not self.user_profile:
             raise ValueError("Perfil do usuário não construído. Execute build_user_profile primeiro.")
-            
-        print(f"\n🚀 Iniciando análise com {max_workers} threads...")
         
-        processed = 0
-        total = len(self.user_games)
-        lock = threading.Lock()
+        candidates = self.select_candidates(candidate_filter)
+        return astream_top_k(
+            self.process_game_async,
+            candidates,
+            total=len(candidates),
+            k=max_recommendations,
+            key=lambda game: game.score,
+            accept=lambda game: game.score > 0,
+            max_concurrency=max_concurrency
+        )
+    
+    async def recommend_games_async(self, max_recommendations: int = 10, max_concurrency: int = 200,
+                                    candidate_filter: CandidateFilter = None) -> List[GameInfo]:
+        """
+        Versão assíncrona de recommend_games.
         
-        def update_progress():
-            nonlocal processed
-            with lock:
-                processed += 1
-                progress = (processed / total) * 100
-                print(f"\r⏳ Progresso: {progress:.1f}% ({processed}/{total} jogos)", end="")
+        Args:
+            max_recommendations: Número máximo de jogos a recomendar
+            max_concurrency: Número máximo de jogos em andamento
+            candidate_filter: Critérios para descartar candidatos antes da busca (opcional)
+        """
+        updates = self.iter_recommendations_async(max_recommendations, max_concurrency, candidate_filter)
         
-        recommendations = []
+        print(f"\n🚀 Iniciando análise assíncrona com até {max_concurrency} requisições simultâneas...")
+        
+        top_recommendations = []
         start_time = time.time()
+        breakers = get_transport().breakers.checkpoint()
+        
+        async for update in updates:
+            top_recommendations = update.ranking
+            progress = (update.processed / update.total) * 100
+            print(f"\r⏳ Progresso: {progress:.1f}% ({update.processed}/{update.total} jogos)", end="")
+        
+        execution_time = time.time() - start_time
+        print(f"\n⚡ Tempo de execução: {execution_time:.2f} segundos")
+        report_degraded_hosts(breakers)
+        
+        self._print_recommendations(top_recommendations)
+        return top_recommendations
+
+    def fetch_game_tags(self, games: List[GameInfo], max_workers: int = 10) -> Dict[int, Tuple[Dict, Dict]]:
+        """
+        Busca tags e gêneros de vários jogos em paralelo, sem pontuá-los.
+        
+        Args:
+            games: Jogos a consultar
+            max_workers: Número máximo de threads
+            
+        Returns:
+            Dict appid -> (tags, gêneros)
+        """
+        get_transport().ensure_pool_size(max_workers)
+        game_tags = {}
         
         with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_to_game = {
-                executor.submit(self.process_game, game): game 
-                for game in self.user_games
-            }
+            # Falhas no SteamSpy são reagendadas, sem deixar threads do pool dormindo
+            results = retry_as_completed(
+                executor,
+                lambda game: self.request_game_tags(game.appid),
+                games,
+                retry_policy('steamspy')
+            )
             
-            for future in concurrent.futures.as_completed(future_to_game):
+            for processed, (game, future) in enumerate(results, 1):
                 try:
-                    game = future.result()
-                    if game.score > 0:
-                        recommendations.append(game)
-                    update_progress()
+                    game_tags[game.appid] = future.result()
                 except Exception as e:
-                    print(f"\n❌ Erro: {str(e)}")
+                    print(f"\n❌ Erro ao buscar tags de {game.name}: {str(e)}")
+                    game_tags[game.appid] = ({}, {})  # Sem memorizar: a próxima consulta tenta de novo
+                print(f"\r⏳ Buscando tags: {processed}/{len(games)} jogos", end="")
         
-        execution_time = time.time() - start_time
-        print(f"\n⚡ Tempo de execução: {execution_time:.2f} segundos")
+        print()
+        return game_tags
+
+    async def fetch_game_tags_async(self, games: List[GameInfo],
+                                    max_concurrency: int = 200) -> Dict[int, Tuple[Dict, Dict]]:
+        """
+        Versão assíncrona de fetch_game_tags.
+        
+        Args:
+            games: Jogos a consultar
+            max_concurrency: Número máximo de buscas em andamento
+            
+        Returns:
+            Dict appid -> (tags, gêneros)
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        game_tags = {}
+        processed = 0
+        
+        async def fetch(game: GameInfo) -> None:
+            nonlocal processed
+            async with semaphore:
+                try:
+                    game_tags[game.appid] = await self.get_game_tags_async(game.appid)
+                except Exception as e:
+                    print(f"\n❌ Erro ao buscar tags de {game.name}: {str(e)}")
+                    game_tags[game.appid] = ({}, {})
+            processed += 1
+            print(f"\r⏳ Buscando tags: {processed}/{len(games)} jogos", end="")
+        
+        await asyncio.gather(*(fetch(game) for game in games))
+        print()
+        return game_tags
+
+    def score_games(self, games: List[GameInfo], game_tags: Dict[int, Tuple[Dict, Dict]],
+                    max_recommendations: int = 10, engine: ScoringEngine = None) -> List[GameInfo]:
+        """
+        Pontua os jogos contra o perfil em uma única operação matricial.
+        
+        Args:
+            games: Jogos candidatos
+            game_tags: Tags e gêneros por appid, como retornado por fetch_game_tags
+            max_recommendations: Número máximo de jogos a retornar
+            engine: Motor de pontuação (opcional)
+            
+        Returns:
+            Os jogos mais bem pontuados, com score, tags e matching_tags preenchidos
+        """
+        engine = engine or ScoringEngine()
+        matrix = TagMatrix.from_tags(
+            ((game.appid, game_tags.get(game.appid, ({}, {}))[0]) for game in games),
+            engine.vocabulary
+        )
+        scores, matches = engine.score(matrix, engine.encode_profile(self.user_profile))
+        
+        top_recommendations = []
+        for row in engine.top_k(scores, max_recommendations).tolist():
+            game = games[row]
+            tags, genres = game_tags.get(game.appid, ({}, {}))
+            start, end = matrix.indptr[row], matrix.indptr[row + 1]
+            game.score = float(scores[row])
+            game.matching_tags = matches.get(row)
+            game.tags = {
+                engine.vocabulary.term(tag_id): round(weight, 2)
+                for tag_id, weight in zip(matrix.indices[start:end].tolist(), matrix.data[start:end].tolist())
+            }
+            game.genres = genres
+            top_recommendations.append(game)
+        
+        return top_recommendations
+
+    def snapshot_library(self) -> CompactCatalog:
+        """
+        Cria um snapshot compacto da biblioteca, com as tags já conhecidas de cada jogo.
+        
+        Returns:
+            CompactCatalog com um registro por jogo da biblioteca
+        """
+        snapshot = CompactCatalog()
+        for game in self.user_games:
+            tags, genres = self._tag_memo.get(game.appid, (game.tags, game.genres))
+            snapshot.add(GameInfo(
+                appid=game.appid,
+                name=game.name,
+                playtime_forever=game.playtime_forever,
+                tags=tags,
+                genres=genres
+            ))
+        return snapshot
+
+    def score_snapshot(self, snapshot: CompactCatalog, max_recommendations: int = 10) -> List[GameInfo]:
+        """
+        Pontua um snapshot compacto contra o perfil, sem nenhuma busca na rede.
+        
+        Args:
+            snapshot: Snapshot gerado por snapshot_library (ou qualquer CompactCatalog)
+            max_recommendations: Número máximo de jogos a retornar
+            
+        Returns:
+            Os jogos mais bem pontuados, reconstruídos como GameInfo
+        """
+        engine = ScoringEngine(snapshot.vocabulary)
+        matrix = snapshot.to_tag_matrix()
+        scores, matches = engine.score(matrix, engine.encode_profile(self.user_profile))
+        
+        top_recommendations = []
+        for row in engine.top_k(scores, max_recommendations).tolist():
+            game = GameInfo(**snapshot[row].as_kwargs(snapshot.vocabulary))
+            game.score = float(scores[row])
+            game.matching_tags = matches.get(row)
+            top_recommendations.append(game)
+        return top_recommendations
+
+    def recommend_games_vectorized(self, max_recommendations: int = 10, max_workers: int = 10,
+                                   candidate_filter: CandidateFilter = None) -> List[GameInfo]:
+        """
+        Recomenda jogos usando o motor de pontuação vetorizado (NumPy).
+        
+        A busca das tags e a pontuação são etapas separadas: primeiro todas as
+        tags são obtidas, depois todos os jogos são pontuados de uma só vez.
+        
+        Args:
+            max_recommendations: Número máximo de jogos a recomendar
+            max_workers: Número máximo de threads para a busca de tags
+            candidate_filter: Critérios para descartar candidatos antes da busca (opcional)
+        """
+        if not self.user_profile:
+            raise ValueError("Perfil do usuário não construído. Execute build_user_profile primeiro.")
+        
+        candidates = self.select_candidates(candidate_filter)
+        
+        print(f"\n🚀 Iniciando análise vetorizada com {max_workers} threads...")
+        start_time = time.time()
+        
+        game_tags = self.fetch_game_tags(candidates, max_workers=max_workers)
+        fetch_time = time.time() - start_time
+        
+        top_recommendations = self.score_games(candidates, game_tags, max_recommendations)
+        score_time = time.time() - start_time - fetch_time
+        
+        print(f"⚡ Busca: {fetch_time:.2f}s | Pontuação: {score_time * 1000:.1f}ms")
+        
+        self._print_recommendations(top_recommendations)
+        return top_recommendations
+
+    async def recommend_games_vectorized_async(self, max_recommendations: int = 10, max_concurrency: int = 200,
+                                               candidate_filter: CandidateFilter = None) -> List[GameInfo]:
+        """
+        Versão assíncrona de recommend_games_vectorized.
+        
+        Args:
+            max_recommendations: Número máximo de jogos a recomendar
+            max_concurrency: Número máximo de buscas de tags em andamento
+            candidate_filter: Critérios para descartar candidatos antes da busca (opcional)
+        """
+        if not self.user_profile:
+            raise ValueError("Perfil do usuário não construído. Execute build_user_profile primeiro.")
         
-        # Ordena e limita as recomendações
-        recommendations.sort(key=lambda x: x.score, reverse=True)
-        top_recommendations = recommendations[:max_recommendations]
+        candidates = self.select_candidates(candidate_filter)
         
-        # Exibe as recomendações
+        print(f"\n🚀 Iniciando análise vetorizada assíncrona com até {max_concurrency} requisições simultâneas...")
+        start_time = time.time()
+        
+        game_tags = await self.fetch_game_tags_async(candidates, max_concurrency=max_concurrency)
+        fetch_time = time.time() - start_time
+        
+        top_recommendations = self.score_games(candidates, game_tags, max_recommendations)
+        score_time = time.time() - start_time - fetch_time
+        
+        print(f"⚡ Busca: {fetch_time:.2f}s | Pontuação: {score_time * 1000:.1f}ms")
+        
+        self._print_recommendations(top_recommendations)
+        return top_recommendations
+
+    def _print_recommendations(self, recommendations: List[GameInfo]) -> None:
+        """Exibe as recomendações formatadas."""
         print("\n🎯 RECOMENDAÇÕES:")
         print("=" * 80)
         
-        for i, game in enumerate(top_recommendations, 1):
+        for i, game in enumerate(recommendations, 1):
             print(f"\n{i}. 🎮 {game.name}")
             print(f"   📊 Pontuação: {game.score:.2f}")
             
@@ -264,25 +838,47 @@ class SteamGameRecommender:
             
             if game.genres:
                 print("   🎯 Gêneros:")
-                for genre, weight in list(game.genres.items())[:3]:
-                    print(f"      • {genre}: {weight}%")
+                if isinstance(game.genres, dict):
+                    for genre, weight in list(game.genres.items())[:3]:
+                        print(f"      • {genre}: {weight}%")
+                else:
+                    # Registros compactos (snapshots) guardam só os nomes dos gêneros
+                    for genre in list(game.genres)[:3]:
+                        print(f"      • {genre}")
             
             print("   " + "-" * 40)
-        
-        return top_recommendations
 
-    def suggest_games(self, top_played_games_limit: int = 15, recommendation_limit: int = 10) -> List[GameInfo]:
+    def suggest_games(self, top_played_games_limit: int = 15, recommendation_limit: int = 10,
+                      vectorized: bool = False, candidate_filter: CandidateFilter = None,
+                      asynchronous: bool = False, max_concurrency: int = 200) -> List[GameInfo]:
         """
         Generates personalized game recommendations based on user's gaming profile and preferences.
         
+        Successful tag lookups are memoized until reset_run. With the default
+        candidate filter the profile games are not candidates, so the memo only
+        saves lookups that repeat within the run (see get_game_tags).
+        
         Args:
             top_played_games_limit: Number of most played games to analyze for profile building
             recommendation_limit: Maximum number of games to recommend
+            vectorized: Use the NumPy scoring engine instead of per-game scoring
+            candidate_filter: Candidate exclusion rules (default: skip the profile games)
+            asynchronous: Run every request on a single asyncio event loop instead of a thread pool.
+                Uses run_sync, which raises RuntimeError when called from a running event loop;
+                await suggest_games_async there instead
+            max_concurrency: Maximum number of in-flight requests when asynchronous
             
         Returns:
             List of recommended games sorted by relevance score
         """
+        if asynchronous:
+            return run_sync(self.suggest_games_async(
+                top_played_games_limit, recommendation_limit, vectorized, candidate_filter, max_concurrency
+            ))
+        
         print("\n🎮 Initializing personalized game recommendation engine...")
+        self.reset_run()
+        candidate_filter = candidate_filter or CandidateFilter()
         
         # Fetch user's game library
         self.fetch_user_library()
@@ -291,18 +887,272 @@ class SteamGameRecommender:
         self.build_user_profile(num_games=top_played_games_limit)
         
         # Generate tailored recommendations
+        if vectorized:
+            return self.recommend_games_vectorized(
+                max_recommendations=recommendation_limit,
+                max_workers=20,
+                candidate_filter=candidate_filter
+            )
         return self.recommend_games(
             max_recommendations=recommendation_limit,
-            max_workers=20
+            max_workers=20,
+            candidate_filter=candidate_filter
+        )
+
+    async def suggest_games_async(self, top_played_games_limit: int = 15, recommendation_limit: int = 10,
+                                  vectorized: bool = False, candidate_filter: CandidateFilter = None,
+                                  max_concurrency: int = 200) -> List[GameInfo]:
+        """
+        Async counterpart of suggest_games: library, profile and candidate lookups share one event loop.
+        
+        The profile games' tags are fetched concurrently up front, so building
+        the profile itself needs no further requests.
+        
+        Args:
+            top_played_games_limit: Number of most played games to analyze for profile building
+            recommendation_limit: Maximum number of games to recommend
+            vectorized: Use the NumPy scoring engine instead of per-game scoring
+            candidate_filter: Candidate exclusion rules (default: skip the profile games)
+            max_concurrency: Maximum number of in-flight requests
+            
+        Returns:
+            List of recommended games sorted by relevance score
+        """
+        print("\n🎮 Initializing personalized game recommendation engine (async)...")
+        self.reset_run()
+        candidate_filter = candidate_filter or CandidateFilter()
+        
+        await self.fetch_user_library_async()
+        
+        top_games = heapq.nlargest(top_played_games_limit, self.user_games, key=lambda game: game.playtime_forever)
+        game_tags = await self.fetch_game_tags_async(top_games, max_concurrency=max_concurrency)
+        # Só as tags já buscadas: uma falha não pode cair no transporte síncrono dentro do loop de eventos
+        self.build_user_profile(num_games=top_played_games_limit, game_tags=game_tags)
+        
+        if vectorized:
+            return await self.recommend_games_vectorized_async(
+                max_recommendations=recommendation_limit,
+                max_concurrency=max_concurrency,
+                candidate_filter=candidate_filter
+            )
+        return await self.recommend_games_async(
+            max_recommendations=recommendation_limit,
+            max_concurrency=max_concurrency,
+            candidate_filter=candidate_filter
+        )
+
+    def _score_from_tags(self, tags: Dict) -> float:
+        """Pontuação de um jogo a partir de tags já conhecidas (igual a apply_tags)."""
+        return sum(weight for weight in (self.user_profile.get(tag, 0) for tag in tags) if weight > 0)
+
+    def take_snapshot(self, profile_size: int, candidate_filter: CandidateFilter = None) -> UserSnapshot:
+        """
+        Captura biblioteca, perfil, tags consultadas e pontuações da execução atual.
+        
+        Jogos cuja busca de tags falhou ficam fora do snapshot, então a próxima
+        atualização incremental os busca e pontua de novo.
+        
+        Args:
+            profile_size: Número de jogos usados no perfil
+            candidate_filter: Filtro usado para selecionar os candidatos pontuados
+        """
+        candidates = self.select_candidates(candidate_filter, report=False)
+        game_tags = self._known_tags()
+        return UserSnapshot(
+            steam_id=self.steam_id,
+            library={game.appid: (game.name, game.playtime_forever) for game in self.user_games},
+            profile=dict(self.user_profile),
+            profile_weights={game.appid: self.profile_weight(game.playtime_forever) for game in self.profile_games},
+            profile_size=profile_size,
+            candidate_filter=asdict(candidate_filter) if candidate_filter else None,
+            game_tags=game_tags,
+            scores={
+                game.appid: self._score_from_tags(game_tags[game.appid][0])
+                for game in candidates if game.appid in game_tags
+            }
+        )
+
+    def _known_tags(self) -> Dict[int, Tuple[Dict, Dict]]:
+        """Tags memorizadas na execução, sem as buscas que falharam (tags e gêneros vazios)."""
+        return {appid: entry for appid, entry in self._tag_memo.items() if entry[0] or entry[1]}
+
+    def refresh_suggestions(self, top_played_games_limit: int = 15, recommendation_limit: int = 10,
+                            candidate_filter: CandidateFilter = None, store: UserSnapshotStore = None,
+                            max_age: float = 7 * 24 * 60 * 60) -> List[GameInfo]:
+        """
+        Atualiza as recomendações de forma incremental a partir do snapshot do usuário.
+        
+        Sem snapshot (ou com um snapshot mais antigo que `max_age`, ou feito com
+        outro tamanho de perfil ou outro filtro de candidatos), faz a
+        reconstrução completa de suggest_games e grava o resultado. Caso
+        contrário, relê a biblioteca (GetOwnedGames, que traz também as compras
+        novas), aplica ao perfil só as variações de tempo de jogo e re-pontua
+        apenas os candidatos novos ou cujas tags tiveram o peso alterado.
+        
+        Args:
+            top_played_games_limit: Número de jogos mais jogados usados no perfil
+            recommendation_limit: Número máximo de jogos a recomendar
+            candidate_filter: Critérios de exclusão (padrão: ignora os jogos do perfil)
+            store: Armazenamento de snapshots (padrão: UserSnapshotStore())
+            max_age: Idade máxima, em segundos, desde a última reconstrução completa
+            
+        Returns:
+            Lista de jogos recomendados
+        """
+        store = store or UserSnapshotStore()
+        candidate_filter = candidate_filter or CandidateFilter()
+        snapshot = store.load(self.steam_id)
+        
+        if (snapshot is None or snapshot.profile_size != top_played_games_limit
+                or snapshot.candidate_filter != asdict(candidate_filter)
+                or time.time() - snapshot.built_at > max_age):
+            recommendations = self.suggest_games(
+                top_played_games_limit=top_played_games_limit,
+                recommendation_limit=recommendation_limit,
+                candidate_filter=candidate_filter
+            )
+            snapshot = self.take_snapshot(top_played_games_limit, candidate_filter)
+            snapshot.built_at = time.time()
+            store.save(snapshot)
+            return recommendations
+        
+        print("\n♻️ Atualizando recomendações a partir do snapshot salvo...")
+        self.reset_run()
+        self._tag_memo = dict(snapshot.game_tags)
+        self.user_profile = dict(snapshot.profile)
+        
+        # Relê a biblioteca inteira: traz as variações de tempo de jogo e as compras novas
+        self.fetch_user_library()
+        library = {game.appid: (game.name, game.playtime_forever) for game in self.user_games}
+        
+        # Ajusta o perfil somando apenas as diferenças de peso dos jogos do perfil
+        top_games = sorted(self.user_games, key=lambda x: x.playtime_forever, reverse=True)[:top_played_games_limit]
+        self.profile_games = [game for game in top_games if game.playtime_forever > 0]
+        new_weights = {game.appid: self.profile_weight(game.playtime_forever) for game in self.profile_games}
+        
+        changed_tags = set()
+        for appid in set(new_weights) | set(snapshot.profile_weights):
+            delta = new_weights.get(appid, 0) - snapshot.profile_weights.get(appid, 0)
+            if abs(delta) < 1e-9:
+                continue
+            tags, _ = self.get_game_tags(appid)
+            if appid not in self._tag_memo:
+                # Busca falhou: mantém o peso antigo para aplicar a diferença na próxima atualização
+                if appid in snapshot.profile_weights:
+                    new_weights[appid] = snapshot.profile_weights[appid]
+                else:
+                    new_weights.pop(appid, None)
+                continue
+            for tag in tags:
+                self.user_profile[tag] = self.user_profile.get(tag, 0) + delta
+                changed_tags.add(tag)
+        self.user_profile = {tag: weight for tag, weight in self.user_profile.items() if weight > 1e-9}
+        
+        # Re-pontua apenas os candidatos novos ou com tags cujo peso mudou
+        candidates = self.select_candidates(candidate_filter)
+        affected = [
+            game for game in candidates
+            if game.appid not in snapshot.scores
+            or game.appid not in self._tag_memo
+            or not changed_tags.isdisjoint(self._tag_memo[game.appid][0])
+        ]
+        missing = [game for game in affected if game.appid not in self._tag_memo]
+        if missing:
+            self.fetch_game_tags(missing, max_workers=20)
+        
+        scores = {game.appid: snapshot.scores[game.appid] for game in candidates if game.appid in snapshot.scores}
+        for game in affected:
+            if game.appid in self._tag_memo:
+                scores[game.appid] = self._score_from_tags(self._tag_memo[game.appid][0])
+            else:
+                # Busca falhou: sem pontuação salva, o jogo é tentado de novo na próxima atualização
+                scores.pop(game.appid, None)
+        
+        print(f"🔁 {len(affected)} de {len(candidates)} candidatos re-pontuados "
+              f"({len(changed_tags)} tags alteradas no perfil)")
+        
+        games_by_id = {game.appid: game for game in candidates}
+        top_scores = heapq.nlargest(
+            recommendation_limit,
+            ((score, appid) for appid, score in scores.items() if score > 0)
         )
+        recommendations = [
+            self.apply_tags(games_by_id[appid], *self._tag_memo[appid])
+            for _, appid in top_scores
+        ]
+        self._print_recommendations(recommendations)
+        
+        snapshot.library = library
+        snapshot.profile = dict(self.user_profile)
+        snapshot.profile_weights = new_weights
+        snapshot.game_tags = self._known_tags()
+        snapshot.scores = scores
+        store.save(snapshot)
+        
+        return recommendations
 
 class SteamMarketRecommender:
     """Sistema de recomendação baseado no mercado geral da Steam."""
     
-    def __init__(self):
+    def __init__(self, catalog: TagCatalog = None):
         self.api_key = STEAM_API_KEY
+        self.catalog = catalog or get_tag_catalog()
         self.popular_games: List[GameInfo] = []
+        self.index: Optional[MarketIndex] = None
+        
+    APP_DETAILS_URL = "https://store.steampowered.com/api/appdetails"
+    
+    @staticmethod
+    def _details_request(game: Dict) -> Tuple[Dict, str]:
+        """Monta os parâmetros appdetails do jogo e a chave correspondente no cache em disco."""
+        params = {
+            'appids': game['appid'],
+            'cc': 'us',
+            'l': 'en',
+            'filters': 'categories,genres,basic'
+        }
+        cache_key = f"{game['appid']}:{params['filters']}:{params['cc']}:{params['l']}"
+        return params, cache_key
+    
+    @staticmethod
+    def _details_document(app_id: str, response) -> Dict:
+        """Valida uma resposta appdetails (síncrona ou assíncrona) e retorna o documento do jogo."""
+        if response.status_code != 200:
+            raise requests.RequestException(f"HTTP {response.status_code}")
+        
+        details_data = response.json()
+        
+        if not details_data or not details_data.get(app_id, {}).get('success'):
+            raise ValueError("Invalid game data")
+        
+        return details_data[app_id]
+    
+    @staticmethod
+    def _build_game_info(game: Dict, game_data: Dict, tag_names) -> GameInfo:
+        """Monta o GameInfo a partir dos dados da loja e das tags do SteamSpy."""
+        # Process categories and genres
+        categories = [
+            {'description': cat.get('description', '')}
+            for cat in game_data.get('categories', [])
+            if cat.get('description')
+        ]
+        
+        genres = [
+            {'description': genre.get('description', '')}
+            for genre in game_data.get('genres', [])
+            if genre.get('description')
+        ]
         
+        categories.extend({'description': tag} for tag in tag_names)
+        
+        return GameInfo(
+            appid=game['appid'],
+            name=game_data.get('name', f"Game {game['appid']}"),
+            tags=categories,
+            genres=genres,
+            rank=game.get('rank', 0)
+        )
+    
     def fetch_game_details(self, game: Dict, max_retries: int = 3) -> Optional[GameInfo]:
         """
         Fetches detailed information for a single game with retry mechanism.
@@ -314,143 +1164,352 @@ class SteamMarketRecommender:
         Returns:
             GameInfo object if successful, None otherwise
         """
-        for attempt in range(max_retries):
+        document = self.fetch_store_document(game, max_retries)
+        if document is None:
+            return None
+        return self._build_game_info(game, document['data'], self.fetch_tag_names(game))
+
+    def request_store_document(self, game: Dict) -> Dict:
+        """
+        Makes a single attempt at the store appdetails document of a game (categories, genres, basic).
+        
+        The caller decides whether and when to retry (see retry_policy('appdetails')).
+        While the store's circuit is open, falls back to an expired cached copy if any.
+        
+        Raises:
+            requests.RequestException: On HTTP errors (including 429 after the transport's own retries)
+            CircuitOpenError: If the store's circuit is open and nothing is cached
+            ValueError: If the store reports the game as unavailable
+        """
+        cache = get_persistent_cache()
+        params, cache_key = self._details_request(game)
+        
+        document = cache.get('appdetails', cache_key)
+        if document is None:
             try:
-                app_details_url = "https://store.steampowered.com/api/appdetails"
-                params = {
-                    'appids': game['appid'],
-                    'cc': 'us',
-                    'l': 'en',
-                    'filters': 'categories,genres,basic'
-                }
-                
-                details_response = requests.get(app_details_url, params=params, timeout=10)
-                
-                if details_response.status_code != 200:
-                    raise requests.RequestException(f"HTTP {details_response.status_code}")
-                
-                details_data = details_response.json()
-                app_id = str(game['appid'])
-                
-                if not details_data or not details_data.get(app_id, {}).get('success'):
-                    raise ValueError("Invalid game data")
-                
-                game_data = details_data[app_id]['data']
-                
-                # Process categories and genres
-                categories = [
-                    {'description': cat.get('description', '')}
-                    for cat in game_data.get('categories', [])
-                    if cat.get('description')
-                ]
+                details_response = _flight.do(
+                    ('appdetails', cache_key),
+                    get_transport().get, self.APP_DETAILS_URL, params=params, timeout=10, endpoint='appdetails'
+                )
+            except CircuitOpenError:
+                document = cache.get_stale('appdetails', cache_key)
+                if document is None:
+                    raise
+                return document
+            document = self._details_document(str(game['appid']), details_response)
+            cache.set('appdetails', cache_key, document)
+        return document
+
+    def fetch_store_document(self, game: Dict, max_retries: int = None) -> Optional[Dict]:
+        """
+        Fetches the store appdetails document of a game, retrying per retry_policy('appdetails').
+        
+        Waits between attempts block the calling thread; thread pools should
+        use request_store_document with scheduled retries instead.
+        
+        Args:
+            game: Basic game information dictionary
+            max_retries: Total number of attempts (default: the policy's)
+            
+        Returns:
+            The appdetails document if successful, None otherwise
+        """
+        policy = retry_policy('appdetails')
+        attempts = max_retries or policy.max_attempts
+        
+        for attempt in range(1, attempts + 1):
+            try:
+                return self.request_store_document(game)
+            except Exception as e:
+                if attempt == attempts or not policy.should_retry(attempt, e):
+                    print(f"\n⚠️ Failed to fetch game {game['appid']}: {str(e)}")
+                    return None
+                time.sleep(policy.delay(attempt))  # Jittered exponential backoff
                 
-                genres = [
-                    {'description': genre.get('description', '')}
-                    for genre in game_data.get('genres', [])
-                    if genre.get('description')
-                ]
+        return None
+
+    def fetch_tag_names(self, game: Dict, max_retries: int = None) -> List[str]:
+        """
+        Returns the SteamSpy tag names of a game, from the local catalog when available.
+        
+        Args:
+            game: Basic game information dictionary
+            max_retries: Total number of SteamSpy attempts (default: the policy's)
+        """
+        try:
+            catalog_entry = self.catalog.lookup(game['appid'])
+            if catalog_entry is not None:
+                return list(catalog_entry[0])
+            return list(fetch_steamspy_appdetails(game['appid'], max_retries).get('tags', {}))
+        except Exception:
+            return []
+
+    def request_tag_names(self, game: Dict) -> List[str]:
+        """Tag names from the catalog or a single SteamSpy attempt (raises on failure)."""
+        catalog_entry = self.catalog.lookup(game['appid'])
+        if catalog_entry is not None:
+            return list(catalog_entry[0])
+        return list(request_steamspy_appdetails(game['appid']).get('tags', {}))
+
+    async def fetch_game_details_async(self, game: Dict, max_retries: int = 3) -> Optional[GameInfo]:
+        """
+        Async counterpart of fetch_game_details; retries wait with asyncio.sleep.
+        
+        Args:
+            game: Basic game information dictionary
+            max_retries: Maximum number of retry attempts
+            
+        Returns:
+            GameInfo object if successful, None otherwise
+        """
+        cache = get_persistent_cache()
+        app_id = str(game['appid'])
+        params, cache_key = self._details_request(game)
+        
+        for attempt in range(max_retries):
+            try:
+                document = cache.get('appdetails', cache_key)
+                if document is None:
+                    try:
+                        details_response = await _async_flight.do(
+                            ('appdetails', cache_key),
+                            get_async_transport().get, self.APP_DETAILS_URL, params=params, timeout=10,
+                            endpoint='appdetails'
+                        )
+                    except CircuitOpenError:
+                        details_response = None
+                        document = cache.get_stale('appdetails', cache_key)
+                        if document is None:
+                            raise
+                    
+                    if details_response is not None:
+                        if details_response.status_code == 429:
+                            continue
+                        document = self._details_document(app_id, details_response)
+                        cache.set('appdetails', cache_key, document)
                 
-                # Get SteamSpy data
                 try:
-                    steamspy_data = self.get_steamspy_info(game['appid'])
-                    steamspy_tags = [
-                        {'description': tag}
-                        for tag in steamspy_data.get('tags', {}).keys()
-                    ]
-                    categories.extend(steamspy_tags)
-                except:
-                    pass
+                    catalog_entry = self.catalog.lookup(game['appid'])
+                    if catalog_entry is not None:
+                        tag_names = catalog_entry[0].keys()
+                    else:
+                        tag_names = (await self.get_steamspy_info_async(game['appid'])).get('tags', {}).keys()
+                except Exception:
+                    tag_names = ()
                 
-                return GameInfo(
-                    appid=game['appid'],
-                    name=game_data.get('name', f"Game {game['appid']}"),
-                    tags=categories,
-                    genres=genres
-                )
+                return self._build_game_info(game, document['data'], tag_names)
                 
             except Exception as e:
-                if attempt == max_retries - 1:
+                if attempt == max_retries - 1 or not retry_policy('appdetails').should_retry(attempt + 1, e):
                     print(f"\n⚠️ Failed to fetch game {game['appid']}: {str(e)}")
                     return None
-                time.sleep(2 * (attempt + 1))  # Exponential backoff
+                await asyncio.sleep(retry_policy('appdetails').delay(attempt + 1))  # Jittered exponential backoff
                 
         return None
 
-    def fetch_popular_games_parallel(self, limit: int = 100, max_workers: int = 10) -> None:
+    def fetch_most_played_ranks(self, limit: int = 100) -> List[Dict]:
         """
-        Fetches popular games using parallel processing for better performance.
+        Fetches the most played games ranking, using the on-disk cache when fresh.
         
         Args:
-            limit: Maximum number of games to fetch
-            max_workers: Maximum number of concurrent threads
+            limit: Maximum number of ranks to return
+            
+        Returns:
+            List of rank entries ('rank', 'appid', ...) from GetMostPlayedGames
         """
-        print("\n📊 Fetching popular Steam games with parallel processing...")
-        
-        try:
-            # Get initial popular games list
+        cache = get_persistent_cache()
+        ranks = cache.get('most_played', 'ranks')
+        if ranks is None:
             url = "https://api.steampowered.com/ISteamChartsService/GetMostPlayedGames/v1/"
             params = {'key': self.api_key}
             
-            response = requests.get(url, params=params, timeout=10)
+            response = get_transport().get(url, params=params, timeout=10)
             data = response.json()
-            
-            popular_games = data['response']['ranks'][:limit]
+            ranks = data['response']['ranks']
+            cache.set('most_played', 'ranks', ranks)
+        
+        return ranks[:limit]
+
+    def fetch_popular_games_parallel(self, limit: int = 100, max_workers: int = 10,
+                                     steamspy_workers: int = 2, queue_size: int = 100) -> None:
+        """
+        Fetches popular games through a staged pipeline: ranks → appdetails → SteamSpy → merge.
+        
+        Each host has its own stage, threads and bounded input queue, so the
+        store and SteamSpy run at their own rate limits without stalling each
+        other, and memory stays bounded regardless of the number of games.
+        
+        Args:
+            limit: Maximum number of games to fetch
+            max_workers: Number of threads of the appdetails stage
+            steamspy_workers: Number of threads of the SteamSpy stage
+            queue_size: Capacity of each stage's input queue
+        """
+        print("\n📊 Fetching popular Steam games with a staged pipeline...")
+        
+        try:
+            # Get initial popular games list
+            popular_games = self.fetch_most_played_ranks(limit)
             total_games = len(popular_games)
             
-            print(f"\n🔄 Collecting details for {total_games} popular games using {max_workers} threads...")
-            
-            # Thread-safe counters
-            processed = 0
-            successful = 0
-            failed = 0
-            lock = threading.Lock()
+            def report_failure(stage: Stage, item, error: Exception) -> None:
+                if isinstance(error, CircuitOpenError):
+                    return  # O disjuntor já avisou; o resumo lista os hosts degradados
+                game = item if stage.name == 'appdetails' else item[0]
+                print(f"\n⚠️ Failed to fetch game {game['appid']} ({stage.name}): {str(error)}")
             
-            def update_progress(success: bool):
-                nonlocal processed, successful, failed
-                with lock:
-                    processed += 1
-                    if success:
-                        successful += 1
-                    else:
-                        failed += 1
-                    progress = (processed / total_games) * 100
-                    print(f"\r⏳ Progress: {progress:.1f}% (Success: {successful}, Failed: {failed})", end="")
+            pipeline = Pipeline(
+                [
+                    Stage('appdetails', self._store_stage, workers=max_workers, queue_size=queue_size,
+                          retry=retry_policy('appdetails')),
+                    Stage('steamspy', self._steamspy_stage, workers=steamspy_workers, queue_size=queue_size,
+                          retry=retry_policy('steamspy'), fallback=self._steamspy_fallback)
+                ],
+                on_error=report_failure
+            )
+            print(f"\n🔄 Collecting details for {total_games} popular games "
+                  f"({max_workers} appdetails / {steamspy_workers} SteamSpy threads)...")
+            get_transport().ensure_pool_size(pipeline.total_workers)
             
-            # Process games in parallel
             self.popular_games = []
             start_time = time.time()
+            breakers = get_transport().breakers.checkpoint()
             
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                future_to_game = {
-                    executor.submit(self.fetch_game_details, game): game
-                    for game in popular_games
-                }
-                
-                for future in concurrent.futures.as_completed(future_to_game):
-                    try:
-                        game_info = future.result()
-                        if game_info:
-                            self.popular_games.append(game_info)
-                            update_progress(True)
-                        else:
-                            update_progress(False)
-                    except Exception as e:
-                        print(f"\n❌ Error processing game: {str(e)}")
-                        update_progress(False)
+            # Merge: the sink runs on the calling thread, so no lock is needed
+            for game_info in pipeline.run(popular_games, output_size=queue_size):
+                self.popular_games.append(game_info)
+                progress = (len(self.popular_games) / total_games) * 100 if total_games else 100
+                print(f"\r⏳ Progress: {progress:.1f}% (Success: {len(self.popular_games)})", end="")
+            
+            # Keep games in popularity order and index them for tag/genre queries
+            self.popular_games.sort(key=lambda x: x.rank or float('inf'))
+            self.index = MarketIndex.build(self.popular_games)
             
             execution_time = time.time() - start_time
+            successful = len(self.popular_games)
             
             print(f"\n\n✅ Process completed in {execution_time:.2f} seconds:")
             print(f"   ✓ {successful} games collected successfully")
-            print(f"   ✗ {failed} games failed")
+            print(f"   ✗ {total_games - successful} games failed")
+            for stats in pipeline.stats_summary():
+                print(f"   • {stats['name']}: {stats['throughput']:.2f} games/s, "
+                      f"{stats['utilization'] * 100:.0f}% busy, backlog up to {stats['max_backlog']}")
+            report_degraded_hosts(breakers)
             
         except Exception as e:
             print(f"\n❌ Fatal error fetching popular games: {str(e)}")
             raise
 
+    def _store_stage(self, game: Dict) -> Tuple[Dict, Dict]:
+        """Pipeline stage: one attempt at the store document (failures are rescheduled by the pipeline)."""
+        return game, self.request_store_document(game)
+
+    def _steamspy_stage(self, item: Tuple[Dict, Dict]) -> GameInfo:
+        """Pipeline stage: one attempt at the SteamSpy tags, then builds the GameInfo."""
+        game, document = item
+        return self._build_game_info(game, document['data'], self.request_tag_names(game))
+
+    def _steamspy_fallback(self, item: Tuple[Dict, Dict]) -> GameInfo:
+        """Keeps a game whose SteamSpy attempts ran out, with store categories and genres only."""
+        game, document = item
+        return self._build_game_info(game, document['data'], ())
+
+    async def fetch_popular_games_async(self, limit: int = 100, max_concurrency: int = 200) -> None:
+        """
+        Async counterpart of fetch_popular_games_parallel: every game is fetched on one event loop.
+        
+        Args:
+            limit: Maximum number of games to fetch
+            max_concurrency: Maximum number of games in flight
+        """
+        print("\n📊 Fetching popular Steam games asynchronously...")
+        
+        popular_games = self.fetch_most_played_ranks(limit)
+        total_games = len(popular_games)
+        print(f"\n🔄 Collecting details for {total_games} popular games, up to {max_concurrency} at a time...")
+        
+        semaphore = asyncio.Semaphore(max_concurrency)
+        successful = 0
+        failed = 0
+        self.popular_games = []
+        start_time = time.time()
+        breakers = get_transport().breakers.checkpoint()
+        
+        async def fetch(game: Dict) -> None:
+            nonlocal successful, failed
+            async with semaphore:
+                game_info = await self.fetch_game_details_async(game)
+            if game_info:
+                self.popular_games.append(game_info)
+                successful += 1
+            else:
+                failed += 1
+            progress = ((successful + failed) / total_games) * 100
+            print(f"\r⏳ Progress: {progress:.1f}% (Success: {successful}, Failed: {failed})", end="")
+        
+        await asyncio.gather(*(fetch(game) for game in popular_games))
+        
+        self.popular_games.sort(key=lambda x: x.rank or float('inf'))
+        self.index = MarketIndex.build(self.popular_games)
+        
+        execution_time = time.time() - start_time
+        print(f"\n\n✅ Process completed in {execution_time:.2f} seconds:")
+        print(f"   ✓ {successful} games collected successfully")
+        print(f"   ✗ {failed} games failed")
+        report_degraded_hosts(breakers)
+
+    def iter_suggestions(self, game_tags: List[str], popular_games_sample_size: int = 80,
+                         results_limit: int = 10, max_workers: int = 10) -> Iterator[RankingUpdate]:
+        """
+        Streams the partial tag ranking while popular game details are still being fetched.
+        
+        Each game is scored as soon as its details arrive, and only the current
+        top-k is kept, so callers can render results before the sweep finishes.
+        
+        Args:
+            game_tags: Target game tags for similarity matching
+            popular_games_sample_size: Number of popular games to analyze
+            results_limit: Size of the ranking
+            max_workers: Maximum number of concurrent threads
+            
+        Returns:
+            Iterator of RankingUpdate, one per fetched game
+        """
+        if not game_tags:
+            raise ValueError("Search criteria required: Please provide game tags")
+        
+        ranks = self.fetch_most_played_ranks(popular_games_sample_size)
+        get_transport().ensure_pool_size(max_workers)
+        
+        def fetch_and_score(game: Dict) -> GameInfo:
+            # One attempt per call: failed store requests are rescheduled instead of sleeping in the pool
+            document = self.request_store_document(game)
+            game_info = self._build_game_info(game, document['data'], self.fetch_tag_names(game, max_retries=1))
+            self._score_by_tags(game_info, game_tags)
+            return game_info
+        
+        return stream_top_k(
+            fetch_and_score,
+            ranks,
+            total=len(ranks),
+            k=results_limit,
+            key=lambda game: (game.score, -(game.rank or float('inf'))),
+            accept=lambda game: game.score > 0,
+            max_workers=max_workers,
+            retry=retry_policy('appdetails')
+        )
+
+    @staticmethod
+    def _score_by_tags(game: GameInfo, target_tags: List[str]) -> None:
+        """Preenche score e matching_tags do jogo com as tags alvo que ele possui."""
+        game_tags = {normalize_term(tag) for tag in term_descriptions(game.tags)}
+        game.matching_tags = [tag for tag in target_tags if normalize_term(tag) in game_tags]
+        game.score = len(game.matching_tags)
+
     def suggest_games(self, game_tags: List[str] = None, game_genre: str = None, 
                      popular_games_sample_size: int = 80, results_limit: int = 10,
-                     max_workers: int = 10) -> List[GameInfo]:
+                     max_workers: int = 10, asynchronous: bool = False,
+                     max_concurrency: int = 200) -> List[GameInfo]:
         """
         Finds similar games using parallel processing for faster results.
         
@@ -460,10 +1519,19 @@ class SteamMarketRecommender:
             popular_games_sample_size: Number of popular games to analyze
             results_limit: Maximum number of similar games to return
             max_workers: Maximum number of concurrent threads
+            asynchronous: Fetch on a single asyncio event loop instead of a thread pool.
+                Uses run_sync, which raises RuntimeError when called from a running event loop;
+                await suggest_games_async there instead
+            max_concurrency: Maximum number of games in flight when asynchronous
             
         Returns:
             List of similar games sorted by relevance
         """
+        if asynchronous:
+            return run_sync(self.suggest_games_async(
+                game_tags, game_genre, popular_games_sample_size, results_limit, max_concurrency
+            ))
+        
         print("\n🎮 Starting parallel similarity-based game search...")
         
         # Collect popular games data using parallel processing
@@ -472,6 +1540,35 @@ class SteamMarketRecommender:
             max_workers=max_workers
         )
         
+        return self._recommend_by_criteria(game_tags, game_genre, results_limit)
+
+    async def suggest_games_async(self, game_tags: List[str] = None, game_genre: str = None,
+                                  popular_games_sample_size: int = 80, results_limit: int = 10,
+                                  max_concurrency: int = 200) -> List[GameInfo]:
+        """
+        Async counterpart of suggest_games.
+        
+        Args:
+            game_tags: Target game tags for similarity matching (optional)
+            game_genre: Target game genre for similarity matching (optional)
+            popular_games_sample_size: Number of popular games to analyze
+            results_limit: Maximum number of similar games to return
+            max_concurrency: Maximum number of games in flight
+            
+        Returns:
+            List of similar games sorted by relevance
+        """
+        print("\n🎮 Starting async similarity-based game search...")
+        
+        await self.fetch_popular_games_async(
+            limit=popular_games_sample_size,
+            max_concurrency=max_concurrency
+        )
+        
+        return self._recommend_by_criteria(game_tags, game_genre, results_limit)
+
+    def _recommend_by_criteria(self, game_tags: List[str], game_genre: str, results_limit: int) -> List[GameInfo]:
+        """Ranks the already fetched popular games by tags or, failing that, by genre."""
         # Find games matching criteria
         if game_tags:
             return self.recommend_by_tags(
@@ -487,66 +1584,78 @@ class SteamMarketRecommender:
             
         raise ValueError("Search criteria required: Please provide either game tags or genre")
 
-    def recommend_by_tags(self, target_tags: List[str], max_recommendations: int = 10) -> List[GameInfo]:
-        """Recomenda jogos por tags com melhor tratamento."""
+    def snapshot_popular_games(self) -> CompactCatalog:
+        """Cria um snapshot compacto dos jogos populares carregados."""
+        return CompactCatalog(self.popular_games)
+
+    def load_snapshot(self, snapshot: CompactCatalog) -> None:
+        """
+        Carrega os jogos populares a partir de um snapshot compacto e reconstrói o índice.
+        
+        Args:
+            snapshot: Snapshot gerado por snapshot_popular_games
+        """
+        self.popular_games = sorted(
+            (GameInfo(**record.as_kwargs(snapshot.vocabulary)) for record in snapshot),
+            key=lambda x: x.rank or float('inf')
+        )
+        self.index = MarketIndex.build(self.popular_games)
+
+    def _get_index(self) -> MarketIndex:
+        """Retorna o índice de tags/gêneros, reconstruindo-o se os jogos mudaram."""
         if not self.popular_games:
             raise ValueError("Nenhum jogo popular carregado")
         
+        if self.index is None or len(self.index) != len(self.popular_games):
+            self.index = MarketIndex.build(self.popular_games)
+        return self.index
+
+    def query_games(self, all_tags: List[str] = (), any_tags: List[str] = (), not_tags: List[str] = (),
+                    all_genres: List[str] = (), any_genres: List[str] = (), not_genres: List[str] = (),
+                    max_results: int = None) -> List[GameInfo]:
+        """
+        Consulta booleana de jogos por tags e gêneros, ordenada por popularidade.
+        
+        Args:
+            all_tags: Tags obrigatórias (AND)
+            any_tags: Ao menos uma destas tags (OR)
+            not_tags: Tags proibidas (NOT)
+            all_genres: Gêneros obrigatórios (AND)
+            any_genres: Ao menos um destes gêneros (OR)
+            not_genres: Gêneros proibidos (NOT)
+            max_results: Número máximo de resultados
+            
+        Returns:
+            Lista de jogos que satisfazem a consulta
+        """
+        return self._get_index().query(
+            limit=max_results,
+            all_tags=all_tags, any_tags=any_tags, not_tags=not_tags,
+            all_genres=all_genres, any_genres=any_genres, not_genres=not_genres
+        )
+
+    def recommend_by_tags(self, target_tags: List[str], max_recommendations: int = 10) -> List[GameInfo]:
+        """Recomenda jogos por número de tags correspondentes, desempatando por popularidade."""
+        index = self._get_index()
+        
         print(f"\n🎯 Buscando jogos com tags: {', '.join(target_tags)}")
         
-        scored_games = []
-        for game in self.popular_games:
-            score = 0
-            matching_tags = []
-            
-            # Extrai todas as descrições de tags
-            game_tags = set()
-            for tag in game.tags or []:
-                if isinstance(tag, dict) and 'description' in tag:
-                    game_tags.add(tag['description'].lower())
-                elif isinstance(tag, str):
-                    game_tags.add(tag.lower())
-            
-            # Compara com as tags alvo
-            for tag in target_tags:
-                if tag.lower() in game_tags:
-                    score += 1
-                    matching_tags.append(tag)
-            
-            if score > 0:
-                game.score = score
-                game.matching_tags = matching_tags
-                scored_games.append(game)
-        
-        # Ordena e exibe resultados
-        scored_games.sort(key=lambda x: x.score, reverse=True)
-        recommendations = scored_games[:max_recommendations]
+        recommendations = []
+        for game, score, matching_tags in index.rank_by_tags(target_tags, limit=max_recommendations):
+            game.score = score
+            game.matching_tags = matching_tags
+            recommendations.append(game)
         
         self._print_recommendations(recommendations, "TAGS")
         return recommendations
 
     def recommend_by_genre(self, target_genre: str, max_recommendations: int = 10) -> List[GameInfo]:
-        """Recomenda jogos por gênero com melhor tratamento."""
-        if not self.popular_games:
-            raise ValueError("Nenhum jogo popular carregado")
+        """Recomenda jogos do gênero, ordenados por popularidade."""
+        index = self._get_index()
         
         print(f"\n🎯 Buscando jogos do gênero: {target_genre}")
         
-        genre_games = []
-        target_genre = target_genre.lower()
-        
-        for game in self.popular_games:
-            game_genres = set()
-            for genre in game.genres or []:
-                if isinstance(genre, dict) and 'description' in genre:
-                    game_genres.add(genre['description'].lower())
-                elif isinstance(genre, str):
-                    game_genres.add(genre.lower())
-            
-            if target_genre in game_genres:
-                genre_games.append(game)
-        
-        recommendations = genre_games[:max_recommendations]
+        recommendations = index.query(limit=max_recommendations, any_genres=[target_genre])
         self._print_recommendations(recommendations, f"GÊNERO {target_genre.upper()}")
         return recommendations
 
@@ -574,17 +1683,10 @@ class SteamMarketRecommender:
 
     @staticmethod
     def get_steamspy_info(appid: int) -> Dict:
-        """Obtém informações do SteamSpy com retry."""
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                url = f"https://steamspy.com/api.php?request=appdetails&appid={appid}"
-                response = requests.get(url, timeout=5)
-                if response.status_code == 200:
-                    return response.json()
-                time.sleep(1)
-            except:
-                if attempt < max_retries - 1:
-                    time.sleep(2)
-                continue
-        return {}
+        """Obtém informações do SteamSpy com retry, consultando antes o cache em disco."""
+        return fetch_steamspy_appdetails(appid)
+
+    @staticmethod
+    async def get_steamspy_info_async(appid: int) -> Dict:
+        """Versão assíncrona de get_steamspy_info."""
+        return await fetch_steamspy_appdetails_async(appid)
@@ -0,0 +1,175 @@
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from utils.vocabulary import Vocabulary
+
+def _iter_bits(bitmap: int) -> Iterator[int]:
+    """Itera as posições dos bits ligados, da menor para a maior."""
+    while bitmap:
+        low = bitmap & -bitmap
+        yield low.bit_length() - 1
+        bitmap ^= low
+
+def term_descriptions(values) -> List[str]:
+    """Extrai as descrições de uma lista de tags/gêneros (dicts ou strings)."""
+    descriptions = []
+    for value in values or []:
+        if isinstance(value, dict) and 'description' in value:
+            descriptions.append(value['description'])
+        elif isinstance(value, str):
+            descriptions.append(value)
+    return descriptions
+
+class MarketIndex:
+    """
+    Índice invertido de tags e gêneros sobre um conjunto de jogos.
+
+    Cada jogo recebe uma posição conforme sua popularidade (0 = mais popular) e
+    cada termo normalizado aponta para um bitmap (um `int` Python) com as
+    posições dos jogos que o possuem. Consultas AND/OR/NOT viram operações bit
+    a bit, e percorrer os bits do menor para o maior já devolve os resultados
+    ordenados por popularidade.
+
+    Attributes:
+        games (List): Jogos indexados, em ordem de popularidade
+        vocabulary (Vocabulary): Vocabulário compartilhado de tags e gêneros
+    """
+
+    def __init__(self, games: List, vocabulary: Vocabulary = None):
+        """
+        Constrói o índice.
+
+        Args:
+            games: Jogos (GameInfo) já ordenados por popularidade
+            vocabulary: Vocabulário de termos (opcional)
+        """
+        self.games = list(games)
+        self.vocabulary = vocabulary or Vocabulary()
+        self.tag_postings: Dict[int, int] = {}
+        self.genre_postings: Dict[int, int] = {}
+        self.all_docs = (1 << len(self.games)) - 1
+
+        for position, game in enumerate(self.games):
+            bit = 1 << position
+            for tag in term_descriptions(game.tags):
+                tag_id = self.vocabulary.intern(tag)
+                self.tag_postings[tag_id] = self.tag_postings.get(tag_id, 0) | bit
+            for genre in term_descriptions(game.genres):
+                genre_id = self.vocabulary.intern(genre)
+                self.genre_postings[genre_id] = self.genre_postings.get(genre_id, 0) | bit
+
+    @classmethod
+    def build(cls, games: Iterable, vocabulary: Vocabulary = None) -> 'MarketIndex':
+        """Constrói o índice ordenando os jogos pelo ranking de popularidade."""
+        return cls(sorted(games, key=lambda game: game.rank or float('inf')), vocabulary)
+
+    def __len__(self) -> int:
+        return len(self.games)
+
+    def _posting(self, postings: Dict[int, int], term: str) -> int:
+        """Retorna o bitmap de um termo (0 se desconhecido)."""
+        term_id = self.vocabulary.id_of(term)
+        return postings.get(term_id, 0) if term_id is not None else 0
+
+    def tag_bitmap(self, tag: str) -> int:
+        """Retorna o bitmap dos jogos com a tag."""
+        return self._posting(self.tag_postings, tag)
+
+    def genre_bitmap(self, genre: str) -> int:
+        """Retorna o bitmap dos jogos com o gênero."""
+        return self._posting(self.genre_postings, genre)
+
+    def match(self, all_tags: Iterable[str] = (), any_tags: Iterable[str] = (),
+              not_tags: Iterable[str] = (), all_genres: Iterable[str] = (),
+              any_genres: Iterable[str] = (), not_genres: Iterable[str] = ()) -> int:
+        """
+        Avalia uma consulta booleana e retorna o bitmap dos jogos que a satisfazem.
+
+        Args:
+            all_tags: Tags obrigatórias (AND)
+            any_tags: Ao menos uma destas tags (OR)
+            not_tags: Tags proibidas (NOT)
+            all_genres: Gêneros obrigatórios (AND)
+            any_genres: Ao menos um destes gêneros (OR)
+            not_genres: Gêneros proibidos (NOT)
+        """
+        result = self.all_docs
+
+        for postings, required, optional, excluded in (
+            (self.tag_postings, all_tags, any_tags, not_tags),
+            (self.genre_postings, all_genres, any_genres, not_genres),
+        ):
+            for term in required:
+                result &= self._posting(postings, term)
+            optional = list(optional)
+            if optional:
+                union = 0
+                for term in optional:
+                    union |= self._posting(postings, term)
+                result &= union
+            for term in excluded:
+                result &= ~self._posting(postings, term)
+
+        return result & self.all_docs
+
+    def query(self, limit: Optional[int] = None, **criteria) -> List:
+        """
+        Executa uma consulta booleana (ver `match`) e retorna os jogos por popularidade.
+
+        Args:
+            limit: Número máximo de resultados
+            **criteria: Critérios aceitos por `match`
+        """
+        results = []
+        for position in _iter_bits(self.match(**criteria)):
+            if limit is not None and len(results) >= limit:
+                break
+            results.append(self.games[position])
+        return results
+
+    def rank_by_tags(self, target_tags: List[str], limit: Optional[int] = None,
+                     within: Optional[int] = None) -> List[Tuple[object, int, List[str]]]:
+        """
+        Ordena os jogos pelo número de tags alvo que possuem e, no empate, pela popularidade.
+
+        As contagens são acumuladas em contadores bit-sliced (um bitmap por bit
+        da contagem), então o custo depende do número de tags, não de jogos.
+
+        Args:
+            target_tags: Tags buscadas
+            limit: Número máximo de resultados
+            within: Bitmap restringindo os jogos considerados (opcional)
+
+        Returns:
+            Lista de tuplas (jogo, pontuação, tags correspondentes)
+        """
+        postings = [(tag, self.tag_bitmap(tag)) for tag in target_tags]
+        if within is not None:
+            postings = [(tag, bitmap & within) for tag, bitmap in postings]
+
+        # Soma bit a bit: counters[i] guarda o i-ésimo bit da contagem de cada jogo
+        counters: List[int] = []
+        for _, bitmap in postings:
+            carry = bitmap
+            for i in range(len(counters)):
+                if not carry:
+                    break
+                counters[i], carry = counters[i] ^ carry, counters[i] & carry
+            if carry:
+                counters.append(carry)
+
+        results = []
+        for score in range(len(postings), 0, -1):
+            mask = self.all_docs
+            for i, counter in enumerate(counters):
+                mask &= counter if (score >> i) & 1 else ~counter
+            if score >> len(counters):
+                mask = 0
+
+            for position in _iter_bits(mask):
+                if limit is not None and len(results) >= limit:
+                    return results
+                bit = 1 << position
+                matching = [tag for tag, bitmap in postings if bitmap & bit]
+                results.append((self.games[position], score, matching))
+
+        return results
@@ -0,0 +1,272 @@
+import time
+import queue
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from utils.retry import RetryPolicy, get_retry_scheduler
+
+# Marca o fim da entrada de um estágio
+_DONE = object()
+
+@dataclass
+class StageStats:
+    """
+    Estatísticas de um estágio do pipeline.
+
+    Attributes:
+        name: Nome do estágio
+        workers: Número de threads do estágio
+        processed: Itens entregues ao próximo estágio
+        dropped: Itens descartados (função retornou None)
+        failed: Itens cuja função levantou exceção
+        retried: Tentativas que falharam e foram reagendadas
+        busy_seconds: Tempo somado das threads executando a função
+        max_backlog: Maior número de itens vistos na fila de entrada
+    """
+    name: str
+    workers: int
+    processed: int = 0
+    dropped: int = 0
+    failed: int = 0
+    retried: int = 0
+    busy_seconds: float = 0.0
+    max_backlog: int = 0
+    started_at: float = 0.0
+    finished_at: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def elapsed(self) -> float:
+        """Segundos entre o início do pipeline e a saída da última thread do estágio."""
+        end = self.finished_at or time.time()
+        return max(end - self.started_at, 1e-9) if self.started_at else 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Itens concluídos por segundo."""
+        elapsed = self.elapsed
+        return (self.processed + self.dropped + self.failed) / elapsed if elapsed else 0.0
+
+    @property
+    def utilization(self) -> float:
+        """Fração do tempo em que as threads do estágio estiveram ocupadas."""
+        elapsed = self.elapsed
+        return self.busy_seconds / (elapsed * self.workers) if elapsed else 0.0
+
+    def as_dict(self) -> Dict:
+        """Retorna as estatísticas em um dicionário."""
+        return {
+            'name': self.name,
+            'workers': self.workers,
+            'processed': self.processed,
+            'dropped': self.dropped,
+            'failed': self.failed,
+            'retried': self.retried,
+            'throughput': round(self.throughput, 2),
+            'utilization': round(self.utilization, 2),
+            'max_backlog': self.max_backlog
+        }
+
+@dataclass
+class Stage:
+    """
+    Estágio do pipeline: uma função aplicada por um grupo próprio de threads.
+
+    Attributes:
+        name: Nome do estágio (usado nas estatísticas)
+        func: Função aplicada a cada item; retornar None descarta o item
+        workers: Número de threads do estágio
+        queue_size: Capacidade da fila de entrada do estágio
+        retry: Política de novas tentativas; o item que falha volta à fila de
+            entrada após o atraso, sem que a thread durma
+        fallback: Produz a saída de um item cujas tentativas se esgotaram
+            (sem fallback, o item é descartado)
+    """
+    name: str
+    func: Callable[[Any], Any]
+    workers: int = 4
+    queue_size: int = 100
+    retry: Optional[RetryPolicy] = None
+    fallback: Optional[Callable[[Any], Any]] = None
+
+class Pipeline:
+    """
+    Pipeline produtor/consumidor em estágios, ligados por filas limitadas.
+
+    Cada estágio tem suas próprias threads, então um host lento (ou com limite
+    de taxa menor) não segura as threads de outro. As filas limitadas geram
+    contrapressão: quando um estágio atrasa, os anteriores bloqueiam em vez de
+    acumular itens, e a memória fica limitada qualquer que seja o total.
+    Novas tentativas são agendadas no RetryScheduler e voltam à fila do
+    estágio, então as threads nunca dormem esperando por elas.
+
+    Attributes:
+        stages (List[Stage]): Estágios, na ordem de execução
+        stats (Dict[str, StageStats]): Estatísticas por estágio da última execução
+    """
+
+    def __init__(self, stages: List[Stage], on_error: Callable[[Stage, Any, Exception], None] = None):
+        """
+        Args:
+            stages: Estágios, na ordem de execução
+            on_error: Chamado com (estágio, item, exceção) quando a função de um estágio falha
+        """
+        if not stages:
+            raise ValueError("O pipeline precisa de ao menos um estágio")
+        self.stages = stages
+        self.on_error = on_error
+        self.stats: Dict[str, StageStats] = {}
+
+    @property
+    def total_workers(self) -> int:
+        """Número total de threads usadas pelos estágios."""
+        return sum(stage.workers for stage in self.stages)
+
+    @staticmethod
+    def _put(target: queue.Queue, item: Any, stop: threading.Event) -> bool:
+        """Enfileira o item aguardando espaço; desiste se o pipeline for interrompido."""
+        while not stop.is_set():
+            try:
+                target.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def run(self, source: Iterable[Any], output_size: int = 100) -> Iterator[Any]:
+        """
+        Executa o pipeline, entregando as saídas do último estágio à medida que ficam prontas.
+
+        Interromper a iteração encerra as threads de todos os estágios.
+
+        Args:
+            source: Itens de entrada (pode ser um iterador preguiçoso)
+            output_size: Capacidade da fila de saída
+
+        Yields:
+            Saídas do último estágio, em ordem de conclusão
+        """
+        stop = threading.Event()
+        scheduler = get_retry_scheduler()
+        queues = [queue.Queue(maxsize=stage.queue_size) for stage in self.stages]
+        queues.append(queue.Queue(maxsize=output_size))
+        started_at = time.time()
+        self.stats = {stage.name: StageStats(stage.name, stage.workers, started_at=started_at) for stage in self.stages}
+
+        def feed() -> None:
+            try:
+                for item in source:
+                    if not self._put(queues[0], (item, 1), stop):
+                        return
+            finally:
+                self._put(queues[0], _DONE, stop)
+
+        def requeue(inbox: queue.Queue, entry: tuple, state: Dict) -> None:
+            # Roda na thread do agendador: nunca bloqueia, tenta de novo se a fila estiver cheia
+            if stop.is_set():
+                return
+            try:
+                inbox.put_nowait(entry)
+            except queue.Full:
+                scheduler.call_later(0.1, requeue, inbox, entry, state)
+                return
+            with state['lock']:
+                state['scheduled'] -= 1
+
+        def work(index: int, state: Dict) -> None:
+            stage, stats = self.stages[index], self.stats[self.stages[index].name]
+            inbox, outbox = queues[index], queues[index + 1]
+            while not stop.is_set():
+                try:
+                    entry = inbox.get(timeout=0.1)
+                except queue.Empty:
+                    # O estágio termina quando a entrada acabou e não há item em andamento ou reagendado
+                    with state['lock']:
+                        if state['upstream_done'] and not state['active'] and not state['scheduled'] \
+                                and inbox.empty():
+                            break
+                    continue
+                if entry is _DONE:
+                    with state['lock']:
+                        state['upstream_done'] = True
+                    continue
+
+                item, attempt = entry
+                with state['lock']:
+                    state['active'] += 1
+                with stats._lock:
+                    stats.max_backlog = max(stats.max_backlog, inbox.qsize() + 1)
+                begin = time.time()
+                try:
+                    result = stage.func(item)
+                    error = None
+                except Exception as e:
+                    result, error = None, e
+
+                retrying = error is not None and stage.retry is not None and stage.retry.should_retry(attempt, error)
+                if retrying:
+                    with state['lock']:
+                        state['scheduled'] += 1
+                    scheduler.call_later(stage.retry.delay(attempt), requeue, inbox, (item, attempt + 1), state)
+                elif error is not None and stage.fallback is not None:
+                    try:
+                        result, error = stage.fallback(item), None
+                    except Exception as e:
+                        error = e
+
+                with stats._lock:
+                    stats.busy_seconds += time.time() - begin
+                    if retrying:
+                        stats.retried += 1
+                    elif error is not None:
+                        stats.failed += 1
+                    elif result is None:
+                        stats.dropped += 1
+                    else:
+                        stats.processed += 1
+
+                if error is not None and not retrying:
+                    if self.on_error:
+                        self.on_error(stage, item, error)
+                elif result is not None and not retrying and not self._put(outbox, (result, 1), stop):
+                    return
+                with state['lock']:
+                    state['active'] -= 1
+
+            # A última thread do estágio avisa o próximo que não há mais itens
+            with state['lock']:
+                state['workers'] -= 1
+                last = state['workers'] == 0
+            if last:
+                with stats._lock:
+                    stats.finished_at = time.time()
+                self._put(outbox, _DONE, stop)
+
+        threads = [threading.Thread(target=feed, daemon=True)]
+        for index, stage in enumerate(self.stages):
+            state = {
+                'lock': threading.Lock(), 'workers': stage.workers, 'active': 0,
+                'scheduled': 0, 'upstream_done': False
+            }
+            threads.extend(
+                threading.Thread(target=work, args=(index, state), daemon=True)
+                for _ in range(stage.workers)
+            )
+        for thread in threads:
+            thread.start()
+
+        try:
+            while True:
+                entry = queues[-1].get()
+                if entry is _DONE:
+                    break
+                yield entry[0]
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+
+    def stats_summary(self) -> List[Dict]:
+        """Retorna as estatísticas da última execução, um dicionário por estágio."""
+        return [self.stats[stage.name].as_dict() for stage in self.stages if stage.name in self.stats]
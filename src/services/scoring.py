@@ -0,0 +1,167 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from utils.vocabulary import Vocabulary
+
+class TagMatrix:
+    """
+    Matriz esparsa jogo × tag no formato CSR.
+
+    Cada linha é um jogo; as colunas são IDs de tag internados no vocabulário e
+    os valores são os pesos normalizados (0–100) das tags no jogo.
+
+    Attributes:
+        appids (np.ndarray): ID Steam de cada linha
+        indptr (np.ndarray): Início de cada linha em `indices`/`data`
+        indices (np.ndarray): IDs das tags
+        data (np.ndarray): Pesos normalizados das tags
+        vocabulary (Vocabulary): Vocabulário de tags
+    """
+
+    def __init__(self, appids: np.ndarray, indptr: np.ndarray, indices: np.ndarray,
+                 data: np.ndarray, vocabulary: Vocabulary):
+        self.appids = appids
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.vocabulary = vocabulary
+
+    @classmethod
+    def from_tags(cls, games: Iterable[Tuple[int, Dict[str, float]]], vocabulary: Vocabulary) -> 'TagMatrix':
+        """
+        Codifica as tags de vários jogos, normalizando os pesos de cada um para 100.
+
+        Args:
+            games: Pares (appid, {tag: peso}) como retornados pelo SteamSpy
+            vocabulary: Vocabulário onde as tags serão internadas
+        """
+        appids: List[int] = []
+        indptr: List[int] = [0]
+        indices: List[int] = []
+        data: List[float] = []
+
+        for appid, tags in games:
+            appids.append(int(appid))
+            weights = [float(weight) for weight in tags.values()]
+            total = sum(weights)
+            for tag, weight in zip(tags, weights):
+                indices.append(vocabulary.intern(tag))
+                data.append(weight / total * 100 if total > 0 else 0.0)
+            indptr.append(len(indices))
+
+        return cls(
+            np.asarray(appids, dtype=np.int64),
+            np.asarray(indptr, dtype=np.int64),
+            np.asarray(indices, dtype=np.int32),
+            np.asarray(data, dtype=np.float32),
+            vocabulary
+        )
+
+    def __len__(self) -> int:
+        return len(self.appids)
+
+    def row_ids(self) -> np.ndarray:
+        """Retorna, para cada entrada não nula, o índice da linha a que pertence."""
+        return np.repeat(np.arange(len(self), dtype=np.int64), np.diff(self.indptr))
+
+class ScoringEngine:
+    """
+    Motor de pontuação vetorizado para recomendações por tags.
+
+    Reproduz a pontuação de `SteamGameRecommender.process_game` (soma dos pesos
+    do perfil para as tags do jogo) para todos os candidatos de uma vez, com
+    uma única passada sobre a matriz esparsa. Como o vocabulário normaliza
+    caixa e espaços, tags que diferem só nisso (ex.: "Sci-fi" e "Sci-Fi")
+    contam como a mesma tag, com os pesos somados.
+
+    Attributes:
+        vocabulary (Vocabulary): Vocabulário de tags compartilhado entre perfil e catálogo
+    """
+
+    def __init__(self, vocabulary: Vocabulary = None):
+        self.vocabulary = vocabulary or Vocabulary()
+
+    def encode_profile(self, profile: Dict[str, float]) -> np.ndarray:
+        """Codifica o perfil (tag -> peso) como vetor denso indexado pelo ID da tag."""
+        for tag in profile:
+            self.vocabulary.intern(tag)
+        vector = np.zeros(len(self.vocabulary), dtype=np.float64)
+        for tag, weight in profile.items():
+            vector[self.vocabulary.id_of(tag)] += weight
+        return vector
+
+    def score(self, matrix: TagMatrix, profile: np.ndarray,
+              top_tags: Optional[int] = None) -> Tuple[np.ndarray, 'MatchingTags']:
+        """
+        Pontua todos os jogos da matriz contra o perfil.
+
+        Args:
+            matrix: Matriz jogo × tag
+            profile: Vetor do perfil gerado por `encode_profile`
+            top_tags: Número de tags correspondentes a manter por jogo (padrão: todas,
+                como em process_game)
+
+        Returns:
+            Tupla (pontuações por linha, tags correspondentes de todas as linhas)
+        """
+        if len(profile) < len(self.vocabulary):
+            profile = np.pad(profile, (0, len(self.vocabulary) - len(profile)))
+
+        rows = matrix.row_ids()
+        contributions = profile[matrix.indices]
+        scores = np.bincount(rows, weights=contributions, minlength=len(matrix))
+
+        # Ordena as entradas positivas por linha e, dentro da linha, pela contribuição decrescente
+        positive = np.flatnonzero(contributions > 0)
+        order = positive[np.lexsort((-contributions[positive], rows[positive]))]
+        sorted_rows = rows[order]
+        positions = np.arange(len(order))
+        is_first = np.ones(len(order), dtype=bool)
+        is_first[1:] = sorted_rows[1:] != sorted_rows[:-1]
+        group_start = np.maximum.accumulate(np.where(is_first, positions, 0))
+        selected = order if top_tags is None else order[positions - group_start < top_tags]
+
+        matches = MatchingTags(
+            rows[selected],
+            matrix.indices[selected],
+            contributions[selected],
+            matrix.data[selected],
+            self.vocabulary
+        )
+        return scores, matches
+
+    def top_k(self, scores: np.ndarray, k: int) -> np.ndarray:
+        """Retorna os índices das k maiores pontuações positivas, em ordem decrescente."""
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        return candidates[np.argsort(-scores[candidates], kind='stable')]
+
+class MatchingTags:
+    """
+    Tags correspondentes ao perfil, agrupadas por linha da matriz.
+
+    As entradas ficam em arrays ordenados por linha; `get` localiza as de uma
+    linha por busca binária, então só os jogos exibidos são convertidos em dicts.
+    """
+
+    def __init__(self, rows: np.ndarray, tag_ids: np.ndarray, scores: np.ndarray,
+                 weights: np.ndarray, vocabulary: Vocabulary):
+        self.rows = rows
+        self.tag_ids = tag_ids
+        self.scores = scores
+        self.weights = weights
+        self.vocabulary = vocabulary
+
+    def get(self, row: int) -> List[Dict]:
+        """Retorna as tags correspondentes da linha no formato de `GameInfo.matching_tags`."""
+        start, end = np.searchsorted(self.rows, [row, row + 1])
+        return [
+            {
+                'tag': self.vocabulary.term(int(self.tag_ids[i])),
+                'score': float(self.scores[i]),
+                'weight': round(float(self.weights[i]), 2)
+            }
+            for i in range(start, end)
+        ]
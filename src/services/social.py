@@ -0,0 +1,308 @@
+import os
+import sys
+import time
+import sqlite3
+import threading
+import concurrent.futures
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+from utils.cache import CACHE_DIR
+from utils.http import get_transport
+
+FRIEND_LIST_URL = "https://api.steampowered.com/ISteamUser/GetFriendList/v1/"
+
+DEFAULT_GRAPH_PATH = os.path.join(CACHE_DIR, "friends.sqlite3")
+
+# Estados de um perfil no grafo
+PENDING = 0
+CRAWLED = 1
+PRIVATE = 2
+
+class FriendGraphStore:
+    """
+    Grafo de amizades persistido em SQLite.
+
+    Cada perfil é um nó com a profundidade em que foi descoberto e seu estado
+    (pendente, visitado ou privado). As arestas ficam em listas de adjacência
+    compactas: um BLOB por perfil com os Steam IDs dos amigos como inteiros
+    de 64 bits, em vez de uma linha por aresta.
+
+    Attributes:
+        path (str): Caminho do arquivo SQLite
+    """
+
+    def __init__(self, path: str = None):
+        """
+        Args:
+            path: Caminho do arquivo SQLite (padrão: STEAMATCH_GRAPH_PATH ou ~/.cache/steamatch)
+        """
+        self.path = path or os.environ.get("STEAMATCH_GRAPH_PATH", DEFAULT_GRAPH_PATH)
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS nodes (
+                steamid INTEGER PRIMARY KEY,
+                depth INTEGER NOT NULL,
+                status INTEGER NOT NULL,
+                crawled_at REAL
+            );
+            CREATE INDEX IF NOT EXISTS idx_nodes_pending ON nodes (status, depth);
+            CREATE TABLE IF NOT EXISTS adjacency (
+                steamid INTEGER PRIMARY KEY,
+                friends BLOB NOT NULL
+            );
+            """
+        )
+        self._conn.commit()
+
+    def add_nodes(self, steamids: List[int], depth: int) -> int:
+        """
+        Registra perfis recém-descobertos como pendentes (perfis já conhecidos são mantidos).
+
+        Returns:
+            int: Número de perfis novos
+        """
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO nodes (steamid, depth, status) VALUES (?, ?, ?)",
+                ((int(steamid), depth, PENDING) for steamid in steamids)
+            )
+            return self._conn.total_changes - before
+
+    def mark_crawled(self, steamid: int, friends: Optional[List[int]]) -> None:
+        """
+        Grava a lista de amigos de um perfil visitado.
+
+        Args:
+            steamid: Steam ID do perfil
+            friends: Steam IDs dos amigos, ou None se o perfil é privado
+        """
+        with self._lock:
+            if friends is None:
+                self._conn.execute(
+                    "UPDATE nodes SET status = ?, crawled_at = ? WHERE steamid = ?",
+                    (PRIVATE, time.time(), int(steamid))
+                )
+                return
+            self._conn.execute(
+                "INSERT OR REPLACE INTO adjacency (steamid, friends) VALUES (?, ?)",
+                (int(steamid), array('Q', sorted(friends)).tobytes())
+            )
+            self._conn.execute(
+                "UPDATE nodes SET status = ?, crawled_at = ? WHERE steamid = ?",
+                (CRAWLED, time.time(), int(steamid))
+            )
+
+    def checkpoint(self) -> None:
+        """Confirma em disco tudo o que foi gravado desde o último checkpoint."""
+        with self._lock:
+            self._conn.commit()
+
+    def pending(self, max_depth: int) -> List[Tuple[int, int]]:
+        """Retorna os perfis pendentes até a profundidade dada, como (steamid, profundidade)."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT steamid, depth FROM nodes WHERE status = ? AND depth <= ? ORDER BY depth, steamid",
+                (PENDING, max_depth)
+            ).fetchall()
+
+    def crawled(self, max_depth: int) -> List[Tuple[int, int]]:
+        """Retorna os perfis já visitados abaixo da profundidade dada, como (steamid, profundidade)."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT steamid, depth FROM nodes WHERE status = ? AND depth < ? ORDER BY depth, steamid",
+                (CRAWLED, max_depth)
+            ).fetchall()
+
+    def node_count(self) -> int:
+        """Retorna o número de perfis conhecidos."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM nodes").fetchone()[0]
+
+    def friends(self, steamid: int) -> array:
+        """Retorna os amigos de um perfil visitado (array vazio se desconhecido ou privado)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT friends FROM adjacency WHERE steamid = ?", (int(steamid),)
+            ).fetchone()
+        friends = array('Q')
+        if row:
+            friends.frombytes(row[0])
+        return friends
+
+    def friends_of_friends(self, steamid: int, limit: int = 20) -> List[Tuple[int, int]]:
+        """
+        Sugere perfis a dois passos de distância, ordenados pelo número de amigos em comum.
+
+        Usa apenas o grafo local, sem nenhuma requisição.
+
+        Returns:
+            Lista de tuplas (steamid, amigos em comum)
+        """
+        direct = self.friends(steamid)
+        known = set(direct)
+        known.add(int(steamid))
+
+        mutual: Dict[int, int] = {}
+        for friend in direct:
+            for candidate in self.friends(friend):
+                if candidate not in known:
+                    mutual[candidate] = mutual.get(candidate, 0) + 1
+        return sorted(mutual.items(), key=lambda item: (-item[1], item[0]))[:limit]
+
+    def stats(self) -> Dict:
+        """Retorna o número de perfis por estado e de arestas armazenadas."""
+        with self._lock:
+            counts = dict(self._conn.execute("SELECT status, COUNT(*) FROM nodes GROUP BY status").fetchall())
+            edges = self._conn.execute("SELECT COALESCE(SUM(LENGTH(friends)), 0) FROM adjacency").fetchone()[0]
+        return {
+            'path': self.path,
+            'pending': counts.get(PENDING, 0),
+            'crawled': counts.get(CRAWLED, 0),
+            'private': counts.get(PRIVATE, 0),
+            'edges': edges // array('Q').itemsize
+        }
+
+    def close(self) -> None:
+        """Confirma as gravações pendentes e fecha a conexão."""
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
+
+class FriendGraphCrawler:
+    """
+    Explora o grafo de amizades em largura, com concorrência limitada.
+
+    Cada nível é expandido em paralelo com GetFriendList (sem enriquecer os
+    amigos com resumos de perfil). A fronteira vive no próprio FriendGraphStore,
+    então uma exploração interrompida continua de onde parou.
+
+    Attributes:
+        store (FriendGraphStore): Grafo local
+        max_workers (int): Número máximo de requisições simultâneas
+        checkpoint_every (int): Perfis visitados entre gravações em disco
+    """
+
+    def __init__(self, store: FriendGraphStore = None, api_key: str = None,
+                 max_workers: int = 8, checkpoint_every: int = 100):
+        self.api_key = api_key or os.environ.get("STEAM_API_KEY")
+        if not self.api_key:
+            raise ValueError("STEAM_API_KEY não encontrada nas variáveis de ambiente")
+        self.store = store or FriendGraphStore()
+        self.max_workers = max_workers
+        self.checkpoint_every = checkpoint_every
+
+    def fetch_friends(self, steamid: int) -> Optional[List[int]]:
+        """
+        Busca os Steam IDs dos amigos de um perfil.
+
+        Returns:
+            Lista de Steam IDs, ou None se a lista de amigos é privada
+        """
+        response = get_transport().get(
+            FRIEND_LIST_URL,
+            params={'key': self.api_key, 'steamid': str(steamid), 'relationship': 'friend'},
+            timeout=10
+        )
+        if response.status_code in (401, 403):
+            return None
+        if response.status_code != 200:
+            raise ValueError(f"API retornou status {response.status_code}")
+        friends = response.json().get('friendslist', {}).get('friends', [])
+        return [int(friend['steamid']) for friend in friends]
+
+    def crawl(self, root: int, max_depth: int = 2, max_nodes: int = 10000) -> Dict:
+        """
+        Expande o grafo a partir de um perfil até a profundidade e o número de perfis dados.
+
+        Args:
+            root: Steam ID inicial
+            max_depth: Distância máxima, em amizades, a partir do perfil inicial
+            max_nodes: Número máximo de perfis no grafo
+
+        Returns:
+            Dict: Estatísticas do grafo ao final
+        """
+        self.store.add_nodes([int(root)], depth=0)
+        self.store.checkpoint()
+        get_transport().ensure_pool_size(self.max_workers)
+
+        known = self.store.node_count()
+        visited = 0
+
+        # Uma exploração anterior mais rasa (ou limitada) pode ter deixado amigos sem enfileirar
+        for steamid, depth in self.store.crawled(max_depth):
+            if known >= max_nodes:
+                break
+            known += self.store.add_nodes(self.store.friends(steamid)[:max_nodes - known], depth + 1)
+        # Perfis que falharam continuam pendentes no grafo para a próxima execução
+        failed = set()
+        print(f"\n🕸️ Explorando amizades a partir de {root} (profundidade {max_depth}, até {max_nodes} perfis)...")
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while True:
+                frontier = [node for node in self.store.pending(max_depth) if node[0] not in failed]
+                if not frontier:
+                    break
+                depth = frontier[0][1]
+                level = [steamid for steamid, node_depth in frontier if node_depth == depth]
+
+                futures = {executor.submit(self.fetch_friends, steamid): steamid for steamid in level}
+                for future in concurrent.futures.as_completed(futures):
+                    steamid = futures[future]
+                    try:
+                        friends = future.result()
+                    except Exception as e:
+                        print(f"\n⚠️ Aviso: Erro ao buscar amigos de {steamid}: {str(e)}")
+                        failed.add(steamid)
+                        continue
+
+                    self.store.mark_crawled(steamid, friends)
+                    if friends and depth < max_depth and known < max_nodes:
+                        known += self.store.add_nodes(friends[:max_nodes - known], depth + 1)
+
+                    visited += 1
+                    if visited % self.checkpoint_every == 0:
+                        self.store.checkpoint()
+                    print(f"\r⏳ Nível {depth}: {visited} perfis visitados, {known} conhecidos", end="")
+
+                self.store.checkpoint()
+
+        print()
+        stats = self.store.stats()
+        print(f"✅ Grafo com {stats['crawled']} perfis visitados e {stats['edges']} arestas")
+        return stats
+
+def main(argv: List[str]) -> None:
+    """
+    Interface de linha de comando do grafo de amizades.
+
+    Uso:
+        python -m services.social crawl STEAMID [--depth N] [--max-nodes N]
+        python -m services.social stats
+    """
+    command = argv[0] if argv else 'stats'
+
+    if command == 'crawl' and len(argv) > 1:
+        depth = int(argv[argv.index('--depth') + 1]) if '--depth' in argv else 2
+        max_nodes = int(argv[argv.index('--max-nodes') + 1]) if '--max-nodes' in argv else 10000
+        FriendGraphCrawler().crawl(int(argv[1]), max_depth=depth, max_nodes=max_nodes)
+    elif command == 'stats':
+        stats = FriendGraphStore().stats()
+        print(f"🕸️ Grafo: {stats['path']}")
+        print(f"   • {stats['crawled']} visitados, {stats['pending']} pendentes, {stats['private']} privados")
+        print(f"   • {stats['edges']} arestas")
+    else:
+        print(f"❌ Comando desconhecido: {command}")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,163 @@
+import heapq
+import asyncio
+import itertools
+import concurrent.futures
+from dataclasses import dataclass
+from typing import AsyncIterator, Awaitable, Callable, Generic, Iterable, Iterator, List, Optional, TypeVar
+
+from utils.circuit_breaker import CircuitOpenError
+from utils.retry import RetryPolicy, retry_as_completed
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+@dataclass
+class RankingUpdate(Generic[T]):
+    """
+    Estado parcial de um ranking em construção.
+
+    Attributes:
+        ranking: Top-k atual, do melhor para o pior
+        processed: Itens já processados
+        total: Total de itens a processar
+        changed: Indica se o top-k mudou desde a atualização anterior
+    """
+    ranking: List[T]
+    processed: int
+    total: int
+    changed: bool = True
+
+    @property
+    def done(self) -> bool:
+        """Indica se todos os itens já foram processados."""
+        return self.processed >= self.total
+
+class TopK(Generic[T]):
+    """
+    Mantém os k melhores itens vistos até agora em um min-heap limitado.
+
+    Em caso de empate, o item que chegou primeiro fica à frente, como em uma
+    ordenação estável.
+    """
+
+    def __init__(self, k: int, key: Callable[[T], float]):
+        self.k = k
+        self.key = key
+        self._heap: list = []
+        self._counter = itertools.count()
+
+    def push(self, item: T) -> bool:
+        """
+        Oferece um item ao ranking.
+
+        Returns:
+            bool: True se o item entrou no top-k
+        """
+        if self.k <= 0:
+            return False
+        entry = (self.key(item), -next(self._counter), item)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+            return True
+        if entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+            return True
+        return False
+
+    def ranking(self) -> List[T]:
+        """Retorna o top-k atual, do melhor para o pior."""
+        return [entry[2] for entry in sorted(self._heap, key=lambda entry: entry[:2], reverse=True)]
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+def stream_top_k(func: Callable[[T], Optional[R]], items: Iterable[T], total: int, k: int,
+                 key: Callable[[R], float], accept: Callable[[R], bool] = None,
+                 max_workers: int = 10, retry: RetryPolicy = None) -> Iterator[RankingUpdate[R]]:
+    """
+    Processa itens em paralelo e emite o top-k parcial a cada resultado concluído.
+
+    No máximo `2 * max_workers` itens ficam em andamento ao mesmo tempo, e só
+    o top-k dos resultados é mantido, então a memória não cresce com o total.
+    Com `retry`, itens que falham são reagendados (sem ocupar threads do pool)
+    e só contam como processados após a última tentativa.
+
+    Args:
+        func: Função aplicada a cada item (exceções contam como item processado;
+            CircuitOpenError conta sem mensagem, pois o host degradado é informado à parte)
+        items: Itens de entrada (pode ser um iterador preguiçoso)
+        total: Número total de itens, para o progresso
+        k: Tamanho do ranking
+        key: Pontuação de um resultado (maior é melhor)
+        accept: Filtro de resultados elegíveis ao ranking (opcional)
+        max_workers: Número máximo de threads
+        retry: Política de novas tentativas (opcional)
+
+    Yields:
+        RankingUpdate após cada item concluído
+    """
+    top = TopK(k, key)
+    processed = 0
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for _, future in retry_as_completed(executor, func, items, retry, max_in_flight=max_workers * 2):
+            processed += 1
+            changed = False
+            try:
+                result = future.result()
+                if result is not None and (accept is None or accept(result)):
+                    changed = top.push(result)
+            except CircuitOpenError:
+                # Host degradado: informado uma vez no fim da execução (report_degraded_hosts)
+                pass
+            except Exception as e:
+                print(f"\n❌ Erro: {str(e)}")
+            yield RankingUpdate(top.ranking(), processed, total, changed)
+
+async def astream_top_k(func: Callable[[T], Awaitable[Optional[R]]], items: Iterable[T], total: int, k: int,
+                        key: Callable[[R], float], accept: Callable[[R], bool] = None,
+                        max_concurrency: int = 100) -> AsyncIterator[RankingUpdate[R]]:
+    """
+    Versão assíncrona de stream_top_k: processa itens com corrotinas em uma única thread.
+
+    No máximo `max_concurrency` itens ficam em andamento ao mesmo tempo.
+
+    Args:
+        func: Função assíncrona aplicada a cada item (exceções contam como item processado,
+            como em stream_top_k)
+        items: Itens de entrada (pode ser um iterador preguiçoso)
+        total: Número total de itens, para o progresso
+        k: Tamanho do ranking
+        key: Pontuação de um resultado (maior é melhor)
+        accept: Filtro de resultados elegíveis ao ranking (opcional)
+        max_concurrency: Número máximo de itens em andamento
+
+    Yields:
+        RankingUpdate após cada item concluído
+    """
+    top = TopK(k, key)
+    processed = 0
+    pending = iter(items)
+    in_flight = {asyncio.ensure_future(func(item)) for item in itertools.islice(pending, max_concurrency)}
+
+    try:
+        while in_flight:
+            done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for item in itertools.islice(pending, len(done)):
+                in_flight.add(asyncio.ensure_future(func(item)))
+
+            for task in done:
+                processed += 1
+                changed = False
+                try:
+                    result = task.result()
+                    if result is not None and (accept is None or accept(result)):
+                        changed = top.push(result)
+                except CircuitOpenError:
+                    pass
+                except Exception as e:
+                    print(f"\n❌ Erro: {str(e)}")
+                yield RankingUpdate(top.ranking(), processed, total, changed)
+    finally:
+        for task in in_flight:
+            task.cancel()
@@ -0,0 +1,387 @@
+import os
+import sys
+import json
+import time
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from utils.cache import CACHE_DIR
+from utils.http import get_transport
+
+STEAMSPY_API_URL = "https://steamspy.com/api.php"
+
+# O SteamSpy permite apenas uma requisição 'all' por minuto
+ALL_PAGE_INTERVAL = 60
+
+STEAMSPY_GENRES = [
+    "Action", "Adventure", "Casual", "Early Access", "Free to Play", "Indie",
+    "Massively Multiplayer", "Racing", "RPG", "Simulation", "Sports", "Strategy"
+]
+
+DEFAULT_TAGS = [
+    "Action", "Adventure", "Casual", "Indie", "RPG", "Strategy", "Simulation",
+    "Sports", "Racing", "Singleplayer", "Multiplayer", "Co-op", "Online Co-Op",
+    "PvP", "Open World", "Sandbox", "Survival", "Horror", "Survival Horror",
+    "Shooter", "FPS", "Third-Person Shooter", "Fantasy", "Sci-fi", "Anime",
+    "Story Rich", "Atmospheric", "Puzzle", "Platformer", "2D", "3D", "Pixel Graphics",
+    "Roguelike", "Roguelite", "Souls-like", "Metroidvania", "Hack and Slash",
+    "Action RPG", "JRPG", "Turn-Based", "Turn-Based Strategy", "RTS", "Tactical",
+    "Building", "Crafting", "Management", "City Builder", "Base Building",
+    "Card Game", "Deckbuilding", "Visual Novel", "Cute", "Funny", "Comedy",
+    "Exploration", "Stealth", "Military", "Zombies", "Space", "Post-apocalyptic",
+    "Battle Royale", "MOBA", "MMORPG", "Competitive", "Team-Based", "Fighting",
+    "Free to Play", "Early Access", "Massively Multiplayer", "VR", "Female Protagonist",
+    "Great Soundtrack", "Difficult", "Relaxing", "Retro", "Dark Fantasy", "Medieval"
+]
+
+DEFAULT_CATALOG_PATH = os.path.join(CACHE_DIR, "catalog.sqlite3")
+
+# Idade máxima (em segundos) das tags de um app antes de buscá-las de novo
+DEFAULT_DETAILS_MAX_AGE = 30 * 24 * 60 * 60
+
+def steamspy_terms(document: Dict) -> Tuple[Dict, Dict]:
+    """Extrai tags e gêneros de um appdetails do SteamSpy (listas viram dicionários)."""
+    tags = document.get('tags', {})
+    if isinstance(tags, list):
+        tags = {tag: 1 for tag in tags}
+
+    genres = document.get('genres', {})
+    if isinstance(genres, list):
+        genres = {genre: 1 for genre in genres}
+
+    return tags, genres
+
+class TagCatalog:
+    """
+    Catálogo local app -> tags/gêneros do SteamSpy.
+
+    As listagens em massa (`request=all`, `request=tag`, `request=genre`)
+    descobrem os apps populares e a que tags e gêneros pertencem, mas não
+    trazem os votos por tag. Por isso as consultas só são atendidas para apps
+    cujo appdetails completo foi gravado (por `ingest_details` ou pelos
+    recomendadores, a cada appdetails obtido do SteamSpy), com o mapa de tags
+    e votos idêntico ao da API. Entradas mais antigas que `details_max_age`
+    contam como ausentes e são buscadas de novo.
+
+    Attributes:
+        path (str): Caminho do arquivo SQLite
+        details_max_age (float): Idade máxima, em segundos, das tags de um app
+        hits (int): Consultas atendidas pelo catálogo
+        misses (int): Consultas de apps ausentes (ou desatualizados) no catálogo
+    """
+
+    def __init__(self, path: str = None, details_max_age: float = DEFAULT_DETAILS_MAX_AGE):
+        """
+        Inicializa o catálogo, criando as tabelas se necessário.
+
+        Args:
+            path: Caminho do arquivo SQLite (padrão: STEAMATCH_CATALOG_PATH ou ~/.cache/steamatch)
+            details_max_age: Idade máxima, em segundos, das tags de um app
+        """
+        self.path = path or os.environ.get("STEAMATCH_CATALOG_PATH", DEFAULT_CATALOG_PATH)
+        self.details_max_age = details_max_age
+        self.hits = 0
+        self.misses = 0
+        self._index: Optional[Dict[int, Tuple[Dict, Dict, float]]] = None
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS apps (
+                appid INTEGER PRIMARY KEY,
+                name TEXT,
+                positive INTEGER,
+                negative INTEGER,
+                owners TEXT,
+                ccu INTEGER
+            );
+            CREATE TABLE IF NOT EXISTS app_terms (
+                appid INTEGER NOT NULL,
+                kind TEXT NOT NULL,
+                term TEXT NOT NULL,
+                PRIMARY KEY (appid, kind, term)
+            );
+            CREATE TABLE IF NOT EXISTS app_details (
+                appid INTEGER PRIMARY KEY,
+                tags TEXT NOT NULL,
+                genres TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+            """
+        )
+        self._conn.commit()
+
+    # Ingestão
+
+    @staticmethod
+    def _fetch(params: Dict) -> Dict:
+        """Executa uma consulta em massa no SteamSpy."""
+        response = get_transport().get(STEAMSPY_API_URL, params=params, timeout=60)
+        if response.status_code != 200:
+            raise ValueError(f"SteamSpy retornou status {response.status_code}")
+        data = response.json()
+        return data if isinstance(data, dict) else {}
+
+    def _store_listing(self, listing: Dict, kind: str = None, term: str = None) -> int:
+        """Grava os apps de uma listagem e, se informado, associa o termo a cada um."""
+        apps = [
+            (
+                int(appid),
+                app.get('name'),
+                app.get('positive'),
+                app.get('negative'),
+                app.get('owners'),
+                app.get('ccu')
+            )
+            for appid, app in listing.items()
+            if str(appid).isdigit() and isinstance(app, dict)
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO apps (appid, name, positive, negative, owners, ccu) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                apps
+            )
+            if kind:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO app_terms (appid, kind, term) VALUES (?, ?, ?)",
+                    [(app[0], kind, term) for app in apps]
+                )
+            self._conn.commit()
+        return len(apps)
+
+    def store_details(self, appid: int, document: Dict) -> None:
+        """Grava as tags (com votos) e os gêneros do appdetails do SteamSpy de um app."""
+        tags, genres = steamspy_terms(document)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO app_details (appid, tags, genres, fetched_at) VALUES (?, ?, ?, ?)",
+                (int(appid), json.dumps(tags), json.dumps(genres), now)
+            )
+            self._conn.commit()
+            if self._index is not None:
+                self._index[int(appid)] = (tags, genres, now)
+
+    def ingest_details(self, limit: int = 100) -> Dict:
+        """
+        Grava o appdetails completo dos apps mais populares ainda sem tags (ou desatualizados).
+
+        Os apps vêm das listagens em massa (ver `ingest`), ordenados por
+        avaliações positivas. Cada app custa uma requisição ao SteamSpy, no
+        ritmo do limitador de taxa.
+
+        Args:
+            limit: Número máximo de apps a buscar
+
+        Returns:
+            Dict contendo o número de requisições feitas e de apps gravados
+        """
+        with self._lock:
+            appids = [row[0] for row in self._conn.execute(
+                "SELECT apps.appid FROM apps LEFT JOIN app_details ON app_details.appid = apps.appid "
+                "WHERE app_details.appid IS NULL OR app_details.fetched_at < ? "
+                "ORDER BY apps.positive DESC LIMIT ?",
+                (time.time() - self.details_max_age, limit)
+            ).fetchall()]
+
+        print(f"\n📦 Buscando as tags completas de {len(appids)} apps...")
+        stored = 0
+        for idx, appid in enumerate(appids, 1):
+            try:
+                document = self._fetch({'request': 'appdetails', 'appid': appid})
+                if 'appid' in document:
+                    self.store_details(appid, document)
+                    stored += 1
+                print(f"\r⏳ App {idx}/{len(appids)}: {document.get('name', appid)}" + " " * 20, end="")
+            except Exception as e:
+                print(f"\n⚠️ Erro ao buscar app {appid}: {str(e)}")
+
+        print(f"\n✅ Tags completas gravadas para {stored} apps")
+        return {'requests': len(appids), 'stored': stored}
+
+    def ingest(self, tags: Iterable[str] = None, genres: Iterable[str] = None, pages: int = 1) -> Dict:
+        """
+        Constrói (ou atualiza) o catálogo a partir dos endpoints em massa do SteamSpy.
+
+        Args:
+            tags: Tags a ingerir (padrão: DEFAULT_TAGS)
+            genres: Gêneros a ingerir (padrão: STEAMSPY_GENRES)
+            pages: Número de páginas `request=all` a ingerir (1000 apps cada)
+
+        Returns:
+            Dict contendo o número de requisições feitas e de apps catalogados
+        """
+        tags = list(tags or DEFAULT_TAGS)
+        genres = list(genres or STEAMSPY_GENRES)
+        requests_made = 0
+        start_time = time.time()
+
+        print(f"\n📦 Construindo catálogo de tags ({len(tags)} tags, {len(genres)} gêneros, {pages} páginas)...")
+
+        for page in range(pages):
+            if page > 0:
+                time.sleep(ALL_PAGE_INTERVAL)
+            try:
+                listing = self._fetch({'request': 'all', 'page': page})
+                requests_made += 1
+                if not listing:
+                    break
+                self._store_listing(listing)
+                print(f"\r⏳ Página {page + 1}/{pages}: {len(listing)} apps", end="")
+            except Exception as e:
+                print(f"\n⚠️ Erro ao buscar página {page}: {str(e)}")
+                break
+
+        for kind, terms, request in (('tag', tags, 'tag'), ('genre', genres, 'genre')):
+            for idx, term in enumerate(terms, 1):
+                try:
+                    listing = self._fetch({'request': request, request: term})
+                    requests_made += 1
+                    count = self._store_listing(listing, kind=kind, term=term)
+                    print(f"\r⏳ {kind} {idx}/{len(terms)}: {term} ({count} apps)" + " " * 20, end="")
+                except Exception as e:
+                    print(f"\n⚠️ Erro ao buscar {kind} {term}: {str(e)}")
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('ingested_at', ?)",
+                (str(time.time()),)
+            )
+            self._conn.commit()
+
+        stats = {**self.stats(), 'requests': requests_made, 'seconds': round(time.time() - start_time, 2)}
+        print(f"\n✅ Catálogo construído: {stats['apps']} apps em {stats['requests']} requisições")
+        return stats
+
+    # Consulta
+
+    def _load_index(self) -> Dict[int, Tuple[Dict, Dict, float]]:
+        """Carrega o índice app -> (tags, gêneros, horário da busca) em memória."""
+        with self._lock:
+            if self._index is None:
+                rows = self._conn.execute("SELECT appid, tags, genres, fetched_at FROM app_details").fetchall()
+                self._index = {
+                    appid: (json.loads(tags), json.loads(genres), fetched_at)
+                    for appid, tags, genres, fetched_at in rows
+                }
+            return self._index
+
+    def lookup(self, appid: int) -> Optional[Tuple[Dict, Dict]]:
+        """
+        Consulta as tags e gêneros de um app.
+
+        Returns:
+            Tupla (tags, gêneros) igual à de get_game_info_steamspy, ou None se
+            o app não tiver o appdetails gravado ou ele for mais antigo que `details_max_age`
+        """
+        entry = self._load_index().get(int(appid))
+        if entry is None or time.time() - entry[2] > self.details_max_age:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return dict(entry[0]), dict(entry[1])
+
+    def lookup_many(self, appids: Iterable[int]) -> Dict[int, Tuple[Dict, Dict]]:
+        """Consulta vários apps; os ausentes do catálogo são omitidos."""
+        results = {}
+        for appid in appids:
+            entry = self.lookup(appid)
+            if entry is not None:
+                results[int(appid)] = entry
+        return results
+
+    def popularity(self, appid: int) -> int:
+        """Retorna o número de avaliações positivas do app (0 se desconhecido)."""
+        with self._lock:
+            row = self._conn.execute("SELECT positive FROM apps WHERE appid = ?", (int(appid),)).fetchone()
+        return (row[0] or 0) if row else 0
+
+    def ingested_at(self) -> Optional[float]:
+        """Retorna o timestamp da última ingestão, se houver."""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'ingested_at'").fetchone()
+        return float(row[0]) if row else None
+
+    def is_stale(self, max_age: float = 24 * 60 * 60) -> bool:
+        """Indica se o catálogo nunca foi ingerido ou é mais antigo que `max_age` segundos."""
+        ingested_at = self.ingested_at()
+        return ingested_at is None or time.time() - ingested_at > max_age
+
+    def stats(self) -> Dict:
+        """Retorna estatísticas do catálogo."""
+        with self._lock:
+            apps = self._conn.execute("SELECT COUNT(*) FROM apps").fetchone()[0]
+            detailed = self._conn.execute(
+                "SELECT COUNT(*) FROM app_details WHERE fetched_at >= ?", (time.time() - self.details_max_age,)
+            ).fetchone()[0]
+            terms = dict(self._conn.execute(
+                "SELECT kind, COUNT(DISTINCT term) FROM app_terms GROUP BY kind"
+            ).fetchall())
+        return {
+            'path': self.path,
+            'apps': apps,
+            'detailed': detailed,
+            'tags': terms.get('tag', 0),
+            'genres': terms.get('genre', 0),
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+    def close(self) -> None:
+        """Fecha a conexão com o banco."""
+        with self._lock:
+            self._conn.close()
+
+_tag_catalog: Optional[TagCatalog] = None
+_tag_catalog_lock = threading.Lock()
+
+def get_tag_catalog() -> TagCatalog:
+    """Retorna o catálogo de tags compartilhado pelo processo."""
+    global _tag_catalog
+    with _tag_catalog_lock:
+        if _tag_catalog is None:
+            _tag_catalog = TagCatalog()
+        return _tag_catalog
+
+def main(argv: List[str]) -> None:
+    """
+    Interface de linha de comando do catálogo.
+
+    Uso:
+        python -m services.tag_catalog ingest [--pages N] [--force]
+        python -m services.tag_catalog details [--limit N]
+        python -m services.tag_catalog stats
+    """
+    catalog = get_tag_catalog()
+    command = argv[0] if argv else 'stats'
+
+    if command == 'ingest':
+        if not catalog.is_stale() and '--force' not in argv:
+            print("✅ Catálogo atualizado nas últimas 24 horas (use --force para ingerir de novo)")
+            return
+        pages = int(argv[argv.index('--pages') + 1]) if '--pages' in argv else 1
+        catalog.ingest(pages=pages)
+    elif command == 'details':
+        limit = int(argv[argv.index('--limit') + 1]) if '--limit' in argv else 100
+        catalog.ingest_details(limit=limit)
+    elif command == 'stats':
+        stats = catalog.stats()
+        print(f"📦 Catálogo: {stats['path']}")
+        print(f"   • {stats['apps']} apps, {stats['tags']} tags, {stats['genres']} gêneros")
+        print(f"   • {stats['detailed']} apps com tags completas")
+    else:
+        print(f"❌ Comando desconhecido: {command}")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,122 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Optional, Tuple
+
+from utils.cache import CACHE_DIR
+
+DEFAULT_SNAPSHOT_PATH = os.path.join(CACHE_DIR, "users.sqlite3")
+
+@dataclass
+class UserSnapshot:
+    """
+    Estado persistido de um usuário entre execuções do recomendador.
+
+    Attributes:
+        steam_id: Steam ID do usuário
+        library: appid -> (nome, horas jogadas)
+        profile: Peso de cada tag no perfil
+        profile_weights: appid -> peso com que cada jogo do perfil contribuiu
+        profile_size: Número de jogos considerados no perfil
+        candidate_filter: Filtro de candidatos (como dicionário) usado na reconstrução
+        game_tags: appid -> (tags, gêneros) dos jogos consultados com sucesso
+        scores: appid -> pontuação dos candidatos
+        updated_at: Timestamp da última atualização
+        built_at: Timestamp da última reconstrução completa
+    """
+    steam_id: str
+    library: Dict[int, Tuple[str, float]] = field(default_factory=dict)
+    profile: Dict[str, float] = field(default_factory=dict)
+    profile_weights: Dict[int, float] = field(default_factory=dict)
+    profile_size: int = 15
+    candidate_filter: Optional[Dict] = None
+    game_tags: Dict[int, Tuple[Dict, Dict]] = field(default_factory=dict)
+    scores: Dict[int, float] = field(default_factory=dict)
+    updated_at: float = 0
+    built_at: float = 0
+
+    def to_json(self) -> str:
+        """Serializa o snapshot em JSON."""
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def from_json(cls, raw: str) -> 'UserSnapshot':
+        """Reconstrói o snapshot a partir do JSON, restaurando as chaves inteiras."""
+        data = json.loads(raw)
+        for key in ('library', 'profile_weights', 'game_tags', 'scores'):
+            data[key] = {int(appid): value for appid, value in data[key].items()}
+        data['library'] = {appid: tuple(value) for appid, value in data['library'].items()}
+        data['game_tags'] = {appid: tuple(value) for appid, value in data['game_tags'].items()}
+        return cls(**data)
+
+class UserSnapshotStore:
+    """
+    Armazenamento SQLite dos snapshots de usuários.
+
+    Attributes:
+        path (str): Caminho do arquivo SQLite
+    """
+
+    def __init__(self, path: str = None):
+        """
+        Args:
+            path: Caminho do arquivo SQLite (padrão: STEAMATCH_SNAPSHOT_PATH ou ~/.cache/steamatch)
+        """
+        self.path = path or os.environ.get("STEAMATCH_SNAPSHOT_PATH", DEFAULT_SNAPSHOT_PATH)
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS snapshots (
+                steam_id TEXT PRIMARY KEY,
+                data TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def load(self, steam_id: str) -> Optional[UserSnapshot]:
+        """Carrega o snapshot do usuário, se existir."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM snapshots WHERE steam_id = ?", (str(steam_id),)
+            ).fetchone()
+        return UserSnapshot.from_json(row[0]) if row else None
+
+    def save(self, snapshot: UserSnapshot) -> None:
+        """Grava (ou substitui) o snapshot do usuário."""
+        snapshot.updated_at = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO snapshots (steam_id, data, updated_at) VALUES (?, ?, ?)",
+                (str(snapshot.steam_id), snapshot.to_json(), snapshot.updated_at)
+            )
+            self._conn.commit()
+
+    def delete(self, steam_id: str) -> bool:
+        """Remove o snapshot do usuário; retorna True se havia um."""
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM snapshots WHERE steam_id = ?", (str(steam_id),))
+            self._conn.commit()
+        return cursor.rowcount > 0
+
+    def list_users(self) -> List[Tuple[str, float]]:
+        """Lista os usuários com snapshot e a data da última atualização."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT steam_id, updated_at FROM snapshots ORDER BY updated_at DESC"
+            ).fetchall()
+
+    def close(self) -> None:
+        """Fecha a conexão com o banco."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,71 @@
+import pytest
+
+import models.game as game_module
+import services.app_index as app_index
+from services.app_index import MIN_RESOLVE_SCORE, AppNameIndex
+
+APPS = [
+    {'appid': 620, 'name': 'Portal 2'},
+    {'appid': 400, 'name': 'Portal'},
+    {'appid': 323170, 'name': 'Portal 2 - The Final Hours'},
+    {'appid': 292030, 'name': 'The Witcher® 3: Wild Hunt'},
+    {'appid': 1091500, 'name': 'Cyberpunk 2077'},
+]
+
+class StubResponse:
+    status_code = 200
+
+    def __init__(self, payload):
+        self._payload = payload
+
+    def json(self):
+        return self._payload
+
+class StubTransport:
+    def get(self, url, params=None, timeout=None, **kwargs):
+        return StubResponse({'applist': {'apps': APPS}})
+
+@pytest.fixture
+def index(tmp_path, monkeypatch):
+    monkeypatch.setattr(app_index, 'get_transport', lambda: StubTransport())
+    index = AppNameIndex(str(tmp_path / 'apps.sqlite3'))
+    index.ingest()
+    yield index
+    index.close()
+
+def test_exact_name_resolves_ignoring_case_and_symbols(index):
+    assert index.resolve('portal') == 400
+    assert index.resolve('the witcher 3 wild hunt') == 292030
+
+    # O nome idêntico vem antes da DLC que começa com a consulta, que também resolveria
+    exact, prefix = index.search('Portal 2', limit=2)
+    assert exact == (620, 'Portal 2', 1.0)
+    assert prefix[0] == 323170 and MIN_RESOLVE_SCORE <= prefix[2] < 1.0
+
+def test_typo_is_found_by_search_below_the_resolve_threshold(index):
+    [(appid, name, score)] = index.search('Cyberpnk 2077', limit=1)
+
+    assert (appid, name) == (1091500, 'Cyberpunk 2077')
+    assert 0 < score < MIN_RESOLVE_SCORE
+    assert index.resolve('Cyberpnk 2077') is None
+
+def test_unresolved_name_falls_back_to_remote_search(index, monkeypatch):
+    searches = []
+
+    class StubApps:
+        def search_games(self, name):
+            searches.append(name)
+            return {'apps': [{'id': [1091500], 'name': 'Cyberpunk 2077'}]}
+
+    class StubService:
+        class steam:
+            apps = StubApps()
+
+    monkeypatch.setattr(game_module, 'get_app_index', lambda: index)
+    monkeypatch.setattr(game_module, 'get_steam_service', lambda: StubService())
+
+    assert game_module.SteamGame.search_game_id('Portal 2') == '620'
+    assert searches == []
+
+    assert game_module.SteamGame.search_game_id('Cyberpnk 2077') == '1091500'
+    assert searches == ['Cyberpnk 2077']
@@ -0,0 +1,208 @@
+import asyncio
+
+import pytest
+
+import services.games_recommender as games_recommender
+from services.streaming import astream_top_k
+from services.tag_catalog import TagCatalog
+from utils.cache import PersistentCache
+from utils.circuit_breaker import CircuitOpenError
+from utils.singleflight import AsyncSingleFlight
+
+class StubResponse:
+    """Resposta mínima com a interface usada pelos recomendadores."""
+
+    def __init__(self, payload, status_code: int = 200):
+        self._payload = payload
+        self.status_code = status_code
+
+    def json(self):
+        return self._payload
+
+class StubTransport:
+    """Transporte assíncrono falso: responde após `delay` e mede as requisições simultâneas."""
+
+    def __init__(self, payloads, delay: float = 0.01):
+        self.payloads = payloads
+        self.delay = delay
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def get(self, url, params=None, timeout=None, endpoint=None):
+        self.calls.append(url)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            payload = self.payloads(url)
+            if isinstance(payload, Exception):
+                raise payload
+            return StubResponse(payload)
+        finally:
+            self.in_flight -= 1
+
+def test_single_flight_shares_one_call_between_concurrent_callers():
+    flight = AsyncSingleFlight()
+    transport = StubTransport(lambda url: {'url': url})
+
+    async def run():
+        return await asyncio.gather(*(flight.do('key', transport.get, 'app/10') for _ in range(5)))
+
+    responses = asyncio.run(run())
+    assert len(transport.calls) == 1
+    assert all(response is responses[0] for response in responses)
+    assert flight.stats() == {'executed': 1, 'shared': 4, 'in_flight': 0}
+
+def test_single_flight_shares_the_exception_and_releases_the_key():
+    flight = AsyncSingleFlight()
+    transport = StubTransport(lambda url: ValueError('upstream down'))
+
+    async def run():
+        return await asyncio.gather(*(flight.do('key', transport.get, 'app/10') for _ in range(3)),
+                                    return_exceptions=True)
+
+    errors = asyncio.run(run())
+    assert len(transport.calls) == 1
+    assert all(isinstance(error, ValueError) for error in errors)
+
+    transport.payloads = lambda url: {'ok': True}
+    assert asyncio.run(flight.do('key', transport.get, 'app/10')).json() == {'ok': True}
+    assert len(transport.calls) == 2
+
+def test_single_flight_keeps_running_when_the_leader_is_cancelled():
+    flight = AsyncSingleFlight()
+    transport = StubTransport(lambda url: {'ok': True}, delay=0.05)
+
+    async def run():
+        leader = asyncio.ensure_future(flight.do('key', transport.get, 'app/10'))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flight.do('key', transport.get, 'app/10'))
+        await asyncio.sleep(0)
+        leader.cancel()
+        return await follower
+
+    assert asyncio.run(run()).json() == {'ok': True}
+    assert len(transport.calls) == 1
+
+def test_astream_top_k_ranks_every_item_within_the_concurrency_limit():
+    transport = StubTransport(lambda url: {'score': int(url.rsplit('/', 1)[1])})
+
+    async def score(appid: int):
+        response = await transport.get(f"app/{appid}")
+        return response.json()
+
+    async def run():
+        return [update async for update in astream_top_k(
+            score, range(20), total=20, k=3, key=lambda result: result['score'], max_concurrency=4
+        )]
+
+    updates = asyncio.run(run())
+    assert [update.processed for update in updates] == list(range(1, 21))
+    assert updates[-1].done
+    assert [result['score'] for result in updates[-1].ranking] == [19, 18, 17]
+    assert transport.max_in_flight <= 4
+
+def test_astream_top_k_counts_failures_and_applies_accept():
+    def payloads(url):
+        appid = int(url.rsplit('/', 1)[1])
+        return ValueError('falhou') if appid % 2 else {'score': appid}
+
+    transport = StubTransport(payloads)
+
+    async def score(appid: int):
+        return (await transport.get(f"app/{appid}")).json()
+
+    async def run():
+        return [update async for update in astream_top_k(
+            score, range(10), total=10, k=10, key=lambda result: result['score'],
+            accept=lambda result: result['score'] > 2
+        )]
+
+    updates = asyncio.run(run())
+    assert updates[-1].processed == 10
+    assert [result['score'] for result in updates[-1].ranking] == [8, 6, 4]
+
+def test_astream_top_k_counts_open_circuits_without_reporting_them(capsys):
+    def payloads(url):
+        appid = int(url.rsplit('/', 1)[1])
+        return CircuitOpenError('steamspy.com', 30) if appid < 3 else {'score': appid}
+
+    transport = StubTransport(payloads)
+
+    async def score(appid: int):
+        return (await transport.get(f"app/{appid}")).json()
+
+    async def run():
+        return [update async for update in astream_top_k(
+            score, range(5), total=5, k=5, key=lambda result: result['score']
+        )]
+
+    updates = asyncio.run(run())
+    assert updates[-1].processed == 5
+    assert [result['score'] for result in updates[-1].ranking] == [4, 3]
+    assert 'Erro' not in capsys.readouterr().out
+
+def test_astream_top_k_cancels_pending_items_when_the_consumer_stops():
+    transport = StubTransport(lambda url: {'score': 1}, delay=0.05)
+    started = []
+
+    async def score(appid: int):
+        started.append(appid)
+        return (await transport.get(f"app/{appid}")).json()
+
+    async def run():
+        updates = astream_top_k(score, range(100), total=100, k=1, key=lambda result: result['score'],
+                                max_concurrency=5)
+        first = await updates.__anext__()
+        await updates.aclose()
+        await asyncio.sleep(0.1)
+        return first
+
+    assert asyncio.run(run()).processed == 1
+    assert len(started) < 100
+    assert transport.in_flight == 0
+
+@pytest.fixture
+def steamspy_stub(tmp_path, monkeypatch):
+    """Redireciona cache, catálogo e transporte assíncrono do SteamSpy para versões locais."""
+    cache = PersistentCache(str(tmp_path / 'cache.sqlite3'))
+    catalog = TagCatalog(str(tmp_path / 'tags.sqlite3'))
+    transport = StubTransport(lambda url: {'appid': 10, 'tags': {'RPG': 5}, 'genre': 'RPG'})
+    monkeypatch.setattr(games_recommender, 'get_persistent_cache', lambda: cache)
+    monkeypatch.setattr(games_recommender, 'get_tag_catalog', lambda: catalog)
+    monkeypatch.setattr(games_recommender, 'get_async_transport', lambda: transport)
+    monkeypatch.setattr(games_recommender, '_async_flight', AsyncSingleFlight())
+    yield transport
+    cache.close()
+
+def test_concurrent_steamspy_fetches_share_one_request_and_the_cache(steamspy_stub):
+    async def run():
+        return await asyncio.gather(
+            *(games_recommender.fetch_steamspy_appdetails_async(10) for _ in range(5))
+        )
+
+    documents = asyncio.run(run())
+    assert len(steamspy_stub.calls) == 1
+    assert all(document['tags'] == {'RPG': 5} for document in documents)
+
+    asyncio.run(games_recommender.fetch_steamspy_appdetails_async(10))
+    assert len(steamspy_stub.calls) == 1
+
+def test_async_profile_never_falls_back_to_the_sync_transport(steamspy_stub, tmp_path, monkeypatch):
+    def sync_fetch(*args, **kwargs):
+        raise AssertionError('busca síncrona dentro do loop de eventos')
+
+    steamspy_stub.payloads = lambda url: ValueError('timeout') if 'appid=20' in url else {'appid': 10, 'tags': {'RPG': 5}}
+    monkeypatch.setattr(games_recommender, 'fetch_steamspy_appdetails', sync_fetch)
+    recommender = games_recommender.SteamGameRecommender('1', catalog=TagCatalog(str(tmp_path / 'own.sqlite3')))
+
+    async def fetch_library():
+        recommender.user_games = [games_recommender.GameInfo(10, 'Ok', 5.0),
+                                  games_recommender.GameInfo(20, 'Falha', 3.0)]
+
+    recommender.fetch_user_library_async = fetch_library
+    assert asyncio.run(recommender.suggest_games_async(top_played_games_limit=2)) == []
+
+    assert [game.appid for game in recommender.profile_games] == [10, 20]
+    assert set(recommender.user_profile) == {'RPG'}
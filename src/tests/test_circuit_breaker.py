@@ -0,0 +1,110 @@
+import asyncio
+import threading
+
+import pytest
+
+from utils.async_http import AsyncTransport
+from utils.cache import PersistentCache
+from utils.circuit_breaker import CLOSED, HALF_OPEN, CircuitBreaker, CircuitBreakerRegistry, CircuitOpenError
+from utils.hedging import LatencyTracker
+from utils.rate_limit import RateLimiter
+from utils.singleflight import SingleFlight
+from utils.utils import SteamService
+
+def open_breaker(breaker: CircuitBreaker) -> None:
+    """Abre o circuito registrando `min_requests` falhas seguidas."""
+    for _ in range(breaker.min_requests):
+        breaker.before_request()
+        breaker.record_failure()
+    assert breaker.state != CLOSED
+
+def test_released_probe_lets_the_next_request_probe():
+    breaker = CircuitBreaker('store.steampowered.com', min_requests=2, reset_timeout=0)
+    open_breaker(breaker)
+
+    assert breaker.before_request() is True
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+    breaker.release_probe()
+    assert breaker.state == HALF_OPEN
+    assert breaker.before_request() is True
+    breaker.record_success()
+    assert breaker.state == CLOSED
+
+class HangingSession:
+    """Sessão aiohttp falsa cuja resposta nunca chega."""
+
+    def get(self, *args, **kwargs):
+        return self
+
+    async def __aenter__(self):
+        await asyncio.Event().wait()
+
+    async def __aexit__(self, *exc):
+        return False
+
+def test_cancelled_async_probe_releases_the_breaker():
+    breakers = CircuitBreakerRegistry()
+    breakers.configure('steamspy.com', 0.5, 2, 0)
+    open_breaker(breakers.breaker('steamspy.com'))
+    transport = AsyncTransport(rate_limiter=RateLimiter(), breakers=breakers, latency=LatencyTracker(),
+                               hedge_policies={})
+    transport.session = HangingSession
+
+    async def run():
+        probe = asyncio.ensure_future(transport.get('https://steamspy.com/api.php', endpoint='steamspy'))
+        await asyncio.sleep(0.01)
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+
+    asyncio.run(run())
+    assert breakers.breaker('steamspy.com').before_request() is True
+
+def test_degraded_since_a_checkpoint_ignores_earlier_runs():
+    breakers = CircuitBreakerRegistry()
+    breakers.configure('steamspy.com', 0.5, 2, 60)
+    open_breaker(breakers.breaker('steamspy.com'))
+    with pytest.raises(CircuitOpenError):
+        breakers.breaker('steamspy.com').before_request()
+
+    # Uma execução anterior degradou o host, que depois se recuperou
+    breaker = breakers.breaker('steamspy.com')
+    breaker.state = HALF_OPEN
+    breaker.record_success()
+    checkpoint = breakers.checkpoint()
+
+    assert 'steamspy.com' in breakers.degraded()
+    assert breakers.degraded(checkpoint) == {}
+
+class OpenCircuitTransport:
+    """Transporte falso com o circuito da loja aberto."""
+
+    def get(self, *args, **kwargs):
+        raise CircuitOpenError('store.steampowered.com', 30)
+
+@pytest.fixture
+def offline_service(tmp_path):
+    service = SteamService.__new__(SteamService)
+    service.cache = PersistentCache(str(tmp_path / 'cache.sqlite3'), ttls={'appdetails': -1})
+    service.transport = OpenCircuitTransport()
+    service._app_documents = {}
+    service._app_documents_lock = threading.Lock()
+    service.app_cache_hits = service.app_cache_misses = 0
+    service._flight = SingleFlight()
+    yield service
+    service.cache.close()
+
+def test_open_store_circuit_serves_the_stale_document(offline_service):
+    offline_service.cache.set('appdetails', '10', {
+        'success': True, 'data': {'name': 'Half-Life', 'genres': []}, 'filters': ['basic', 'genres']
+    })
+
+    assert offline_service.cache.get('appdetails', '10') is None
+    assert offline_service._get_app_data(10, 'basic')['name'] == 'Half-Life'
+    assert offline_service._app_documents == {}
+
+def test_open_store_circuit_without_a_copy_raises(offline_service):
+    with pytest.raises(CircuitOpenError):
+        offline_service._get_app_data(20, 'basic')
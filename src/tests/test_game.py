@@ -0,0 +1,35 @@
+import pytest
+
+from models.game import SteamGame
+from utils.utils import SteamAPIError
+
+class StubService:
+    """SteamService falso: cada acessor devolve (ou levanta) o valor de `results`."""
+
+    def __init__(self, **results):
+        self.results = results
+
+    def __getattr__(self, name):
+        def loader(appid):
+            result = self.results.get(name, {})
+            if isinstance(result, Exception):
+                raise result
+            return result
+        return loader
+
+def test_hydrate_leaves_a_failed_projection_on_demand(capsys):
+    service = StubService(get_game_full_details={'name': 'Portal'},
+                          get_game_achievements=SteamAPIError("sem conquistas", 404))
+    game = SteamGame('20', steam_utils=service).hydrate()
+
+    assert game.basic_info == {}
+    assert 'achievements indisponível para o jogo 20' in capsys.readouterr().out
+
+    service.results['get_game_achievements'] = {'total': 3}
+    assert game.achievements == {'total': 3}
+
+def test_hydrate_propagates_unexpected_errors():
+    service = StubService(get_game_full_details={'name': 'Portal'}, get_game_media=KeyError('screenshots'))
+
+    with pytest.raises(KeyError):
+        SteamGame('20', steam_utils=service, verbose=False).hydrate()
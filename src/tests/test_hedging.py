@@ -0,0 +1,204 @@
+import time
+import asyncio
+import threading
+
+import pytest
+
+import services.games_recommender as games_recommender
+from services.tag_catalog import TagCatalog
+from utils.async_http import AsyncTransport
+from utils.cache import MemoryCache, PersistentCache
+from utils.circuit_breaker import CircuitBreakerRegistry
+from utils.hedging import DEFAULT_HEDGE_POLICIES, HedgePolicy, LatencyTracker
+from utils.http import TransportRegistry
+from utils.rate_limit import RateLimiter
+from utils.utils import SteamService
+
+HOST = 'example.test'
+URL = f'https://{HOST}/api'
+POLICY = HedgePolicy(percentile=0.95, min_samples=5, min_delay=0.02)
+
+class StubResponse:
+    def __init__(self, body: str, status_code: int = 200):
+        self.body = body
+        self.status_code = status_code
+        self.headers = {}
+
+class StubSession:
+    """Sessão falsa: a n-ésima chamada espera delays[n] e devolve (ou levanta) results[n]."""
+
+    def __init__(self, *calls):
+        self.calls = list(calls)
+        self.started = 0
+        self._lock = threading.Lock()
+
+    def get(self, url, params=None, timeout=None, **kwargs):
+        with self._lock:
+            delay, result = self.calls[self.started]
+            self.started += 1
+        time.sleep(delay)
+        if isinstance(result, Exception):
+            raise result
+        return StubResponse(result)
+
+@pytest.fixture
+def make_transport():
+    transports = []
+
+    def make(session: StubSession, budget=None) -> TransportRegistry:
+        transport = TransportRegistry(
+            rate_limiter=RateLimiter({HOST: budget} if budget else {}),
+            breakers=CircuitBreakerRegistry(),
+            hedge_policies={'api': POLICY}
+        )
+        transport.session = lambda host: session
+        # Latência recente de 10 ms: a cópia sai assim que a requisição passa de min_delay
+        for _ in range(POLICY.min_samples):
+            transport.latency.record('api', 0.01)
+        transports.append(transport)
+        return transport
+
+    yield make
+    for transport in transports:
+        transport.close()
+
+def hedge_stats(transport: TransportRegistry) -> tuple:
+    stats = transport.latency.stats()['api']
+    return stats['hedged'], stats['hedge_wins'], stats['hedges_skipped']
+
+def test_slow_request_fires_a_hedge_that_wins(make_transport):
+    session = StubSession((0.5, 'primary'), (0.0, 'hedge'))
+    transport = make_transport(session)
+
+    response = transport.get(URL, endpoint='api')
+
+    assert response.body == 'hedge'
+    assert session.started == 2
+    assert hedge_stats(transport) == (1, 1, 0)
+
+def test_primary_wins_when_it_answers_before_the_hedge(make_transport):
+    session = StubSession((0.1, 'primary'), (0.5, 'hedge'))
+    transport = make_transport(session)
+
+    assert transport.get(URL, endpoint='api').body == 'primary'
+    assert hedge_stats(transport) == (1, 0, 0)
+
+def test_failed_hedge_falls_back_to_the_primary(make_transport):
+    session = StubSession((0.1, 'primary'), (0.0, ConnectionError('reset')))
+    transport = make_transport(session)
+
+    assert transport.get(URL, endpoint='api').body == 'primary'
+    assert hedge_stats(transport) == (1, 0, 0)
+
+def test_hedge_is_skipped_without_rate_limit_budget(make_transport):
+    # Um único token, consumido pela requisição original, e reposição lenta
+    session = StubSession((0.1, 'primary'), (0.0, 'hedge'))
+    transport = make_transport(session, budget=(0.01, 1))
+
+    assert transport.get(URL, endpoint='api').body == 'primary'
+    assert session.started == 1
+    assert hedge_stats(transport) == (0, 0, 1)
+
+def test_fast_request_is_not_hedged(make_transport):
+    session = StubSession((0.0, 'primary'), (0.0, 'hedge'))
+    transport = make_transport(session)
+
+    assert transport.get(URL, endpoint='api').body == 'primary'
+    assert session.started == 1
+    assert hedge_stats(transport) == (0, 0, 0)
+
+class JsonResponse:
+    def __init__(self, payload):
+        self.status_code = 200
+        self._payload = payload
+
+    def json(self):
+        return self._payload
+
+class RecordingTransport:
+    """Transporte falso que registra o endpoint de cada chamada e responde um appdetails válido."""
+
+    def __init__(self):
+        self.endpoints = []
+
+    def get(self, url, params=None, timeout=None, endpoint=None, **kwargs):
+        self.endpoints.append(endpoint)
+        appid = str(params['appids'])
+        return JsonResponse({appid: {'success': True, 'data': {'name': 'Portal', 'type': 'game'}}})
+
+def test_hedging_is_off_unless_configured():
+    assert DEFAULT_HEDGE_POLICIES == {}
+    transport = TransportRegistry()
+    assert transport.hedge_policies == {}
+
+    transport.configure_hedging('steamspy', POLICY)
+    assert transport.hedge_policies == {'steamspy': POLICY}
+    transport.close()
+
+def test_store_and_recommender_appdetails_are_measured_separately(tmp_path, monkeypatch):
+    monkeypatch.setenv('STEAM_API_KEY', 'test-key')
+    cache = PersistentCache(str(tmp_path / 'cache.sqlite3'))
+    transport = RecordingTransport()
+    monkeypatch.setattr(games_recommender, 'get_persistent_cache', lambda: cache)
+    monkeypatch.setattr(games_recommender, 'get_transport', lambda: transport)
+
+    service = SteamService(cache=cache, memory=MemoryCache())
+    service.transport = transport
+    service.get_game_info(10)
+    games_recommender.SteamMarketRecommender(catalog=TagCatalog(str(tmp_path / 'tags.sqlite3'))).request_store_document({'appid': 20})
+
+    assert transport.endpoints == ['store_appdetails', 'appdetails']
+    cache.close()
+
+class StubRaw:
+    def __init__(self, body: bytes):
+        self.url = URL
+        self.status = 200
+        self.headers = {}
+        self._body = body
+
+    async def read(self) -> bytes:
+        return self._body
+
+class StubAsyncSession:
+    """Sessão aiohttp falsa: a n-ésima chamada espera delays[n]; registra as canceladas."""
+
+    def __init__(self, *calls):
+        self.calls = list(calls)
+        self.started = 0
+        self.cancelled = 0
+
+    def get(self, url, **kwargs):
+        delay, body = self.calls[self.started]
+        self.started += 1
+        session = self
+
+        class Request:
+            async def __aenter__(self):
+                try:
+                    await asyncio.sleep(delay)
+                except asyncio.CancelledError:
+                    session.cancelled += 1
+                    raise
+                return StubRaw(body)
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return Request()
+
+def test_async_hedge_wins_and_the_slow_copy_is_cancelled():
+    latency = LatencyTracker()
+    for _ in range(POLICY.min_samples):
+        latency.record('api', 0.01)
+    transport = AsyncTransport(rate_limiter=RateLimiter({}), breakers=CircuitBreakerRegistry(),
+                               latency=latency, hedge_policies={'api': POLICY})
+    session = StubAsyncSession((0.5, b'primary'), (0.0, b'hedge'))
+    transport.session = lambda: session
+
+    response = asyncio.run(transport.get(URL, endpoint='api'))
+
+    assert response.content == b'hedge'
+    assert session.cancelled == 1
+    stats = latency.stats()['api']
+    assert (stats['hedged'], stats['hedge_wins']) == (1, 1)
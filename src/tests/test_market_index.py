@@ -0,0 +1,94 @@
+import random
+
+from services.games_recommender import GameInfo
+from services.market_index import MarketIndex, term_descriptions
+from utils.vocabulary import normalize_term
+
+TAGS = ['RPG', 'Open World', 'Puzzle', 'Indie', 'Co-op', 'Sci-fi', 'Horror', 'Racing']
+GENRES = ['Action', 'Adventure', 'Strategy', 'Simulation']
+
+def make_catalog(size: int = 40, seed: int = 7):
+    """Catálogo pseudoaleatório: tags como dicts ou strings e caixa variando entre os jogos."""
+    rng = random.Random(seed)
+    games = []
+    for rank in range(1, size + 1):
+        tags = rng.sample(TAGS, rng.randint(0, 5))
+        tags = [tag.upper() if rng.random() < 0.2 else tag for tag in tags]
+        genres = [{'description': genre} for genre in rng.sample(GENRES, rng.randint(0, 2))]
+        games.append(GameInfo(rank, f"Jogo {rank}", tags=tags, genres=genres, rank=rank))
+    rng.shuffle(games)
+    return games
+
+def terms(values) -> set:
+    return {normalize_term(value) for value in term_descriptions(values)}
+
+def brute_query(games, all_tags=(), any_tags=(), not_tags=(), all_genres=(), any_genres=(), not_genres=()):
+    """A mesma consulta de MarketIndex.match, jogo a jogo com conjuntos, em ordem de popularidade."""
+    results = []
+    for game in sorted(games, key=lambda game: game.rank):
+        tags, genres = terms(game.tags), terms(game.genres)
+        if not all(normalize_term(tag) in tags for tag in all_tags):
+            continue
+        if any_tags and not any(normalize_term(tag) in tags for tag in any_tags):
+            continue
+        if any(normalize_term(tag) in tags for tag in not_tags):
+            continue
+        if not all(normalize_term(genre) in genres for genre in all_genres):
+            continue
+        if any_genres and not any(normalize_term(genre) in genres for genre in any_genres):
+            continue
+        if any(normalize_term(genre) in genres for genre in not_genres):
+            continue
+        results.append(game)
+    return results
+
+def brute_rank(games, target_tags, allowed=None):
+    """Ranking por número de tags alvo (e popularidade no empate), contando jogo a jogo."""
+    ranked = []
+    for game in games:
+        if allowed is not None and game not in allowed:
+            continue
+        tags = terms(game.tags)
+        matching = [tag for tag in target_tags if normalize_term(tag) in tags]
+        if matching:
+            ranked.append((game, len(matching), matching))
+    return sorted(ranked, key=lambda entry: (-entry[1], entry[0].rank))
+
+def test_boolean_queries_match_brute_force():
+    games = make_catalog()
+    index = MarketIndex.build(games)
+    rng = random.Random(11)
+
+    for _ in range(200):
+        criteria = {
+            'all_tags': rng.sample(TAGS, rng.randint(0, 2)),
+            'any_tags': rng.sample(TAGS, rng.randint(0, 3)),
+            'not_tags': rng.sample(TAGS, rng.randint(0, 1)),
+            'all_genres': rng.sample(GENRES, rng.randint(0, 1)),
+            'any_genres': rng.sample(GENRES, rng.randint(0, 2)),
+            'not_genres': rng.sample(GENRES, rng.randint(0, 1)),
+        }
+        assert index.query(**criteria) == brute_query(games, **criteria)
+
+    assert index.query(any_tags=['Unknown']) == []
+    assert index.query(not_tags=['Unknown']) == brute_query(games)
+    assert index.query(limit=3, all_tags=['rpg']) == brute_query(games, all_tags=['RPG'])[:3]
+
+def test_rank_by_tags_matches_brute_force_counts():
+    games = make_catalog()
+    index = MarketIndex.build(games)
+    rng = random.Random(13)
+
+    for size in range(1, len(TAGS) + 1):
+        target = rng.sample(TAGS, size)
+        assert index.rank_by_tags(target) == brute_rank(games, target)
+        assert index.rank_by_tags(target, limit=5) == brute_rank(games, target)[:5]
+
+def test_rank_by_tags_within_a_query_bitmap():
+    games = make_catalog()
+    index = MarketIndex.build(games)
+    within = index.match(any_genres=['Action', 'Strategy'], not_tags=['Horror'])
+    allowed = brute_query(games, any_genres=['Action', 'Strategy'], not_tags=['Horror'])
+
+    target = ['RPG', 'Open World', 'Co-op']
+    assert index.rank_by_tags(target, within=within) == brute_rank(games, target, allowed)
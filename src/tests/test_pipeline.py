@@ -0,0 +1,84 @@
+import threading
+
+import pytest
+
+from services.pipeline import Pipeline, Stage
+from utils.retry import RetryPolicy, get_retry_scheduler
+
+def fast_retry(max_attempts: int) -> RetryPolicy:
+    """Política sem jitter e com atrasos curtos, para os testes não dependerem do relógio."""
+    return RetryPolicy(max_attempts=max_attempts, base_delay=0.01, multiplier=1.0, jitter=False)
+
+def test_run_delivers_every_item_through_all_stages():
+    pipeline = Pipeline([
+        Stage('double', lambda item: item * 2, workers=3, queue_size=2),
+        Stage('odd_only', lambda item: item if item % 4 else None, workers=2, queue_size=2),
+    ])
+
+    results = list(pipeline.run(range(50), output_size=2))
+
+    assert sorted(results) == [item * 2 for item in range(50) if (item * 2) % 4]
+    stats = {entry['name']: entry for entry in pipeline.stats_summary()}
+    assert stats['double']['processed'] == 50
+    assert stats['odd_only']['processed'] == 25
+    assert stats['odd_only']['dropped'] == 25
+
+def test_breaking_out_of_run_stops_every_thread():
+    consumed = []
+    pipeline = Pipeline([Stage('identity', lambda item: item, workers=4, queue_size=2)])
+    get_retry_scheduler()  # a thread do agendador é compartilhada e sobrevive ao pipeline
+    before = threading.active_count()
+
+    for item in pipeline.run(iter(range(10_000)), output_size=2):
+        consumed.append(item)
+        if len(consumed) == 3:
+            break
+
+    assert len(consumed) == 3
+    assert threading.active_count() <= before
+    assert pipeline.stats['identity'].processed < 10_000
+
+def test_a_raising_stage_reports_the_item_and_keeps_going():
+    errors = []
+
+    def parse(item):
+        if item == 3:
+            raise ValueError('item inválido')
+        return item
+
+    pipeline = Pipeline(
+        [Stage('parse', parse, workers=2)],
+        on_error=lambda stage, item, error: errors.append((stage.name, item, str(error)))
+    )
+
+    assert sorted(pipeline.run(range(6))) == [0, 1, 2, 4, 5]
+    assert errors == [('parse', 3, 'item inválido')]
+    assert pipeline.stats['parse'].failed == 1
+
+def test_retry_then_fallback_when_attempts_run_out():
+    attempts = {}
+    lock = threading.Lock()
+
+    def flaky(item):
+        with lock:
+            attempts[item] = attempts.get(item, 0) + 1
+            count = attempts[item]
+        # Item 0 nunca responde; item 1 responde na segunda tentativa
+        if item == 0 or count == 1:
+            raise ConnectionError('timeout')
+        return ('ok', item)
+
+    pipeline = Pipeline([
+        Stage('fetch', flaky, workers=2, retry=fast_retry(3), fallback=lambda item: ('fallback', item))
+    ])
+
+    assert sorted(pipeline.run([0, 1])) == [('fallback', 0), ('ok', 1)]
+    assert attempts == {0: 3, 1: 2}
+    stats = pipeline.stats['fetch']
+    assert stats.retried == 3
+    assert stats.processed == 2
+    assert stats.failed == 0
+
+def test_pipeline_requires_a_stage():
+    with pytest.raises(ValueError):
+        Pipeline([])
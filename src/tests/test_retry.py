@@ -0,0 +1,155 @@
+import threading
+import concurrent.futures
+
+import pytest
+
+from utils.circuit_breaker import CircuitOpenError
+from utils.retry import RetryPolicy, RetryScheduler, retry_as_completed
+
+class FakeScheduler:
+    """
+    Agendador falso: guarda os callbacks em vez de esperar o atraso.
+
+    Com `immediate`, o callback roda na própria chamada de call_later; caso
+    contrário, só quando o teste chama fire_all.
+    """
+
+    def __init__(self, immediate: bool = False):
+        self.immediate = immediate
+        self.delays = []
+        self._pending = []
+
+    def call_later(self, delay, callback, *args):
+        self.delays.append(delay)
+        if self.immediate:
+            callback(*args)
+        else:
+            self._pending.append((callback, args))
+
+    def fire_all(self):
+        pending, self._pending = self._pending, []
+        for callback, args in pending:
+            callback(*args)
+
+class InlineExecutor(concurrent.futures.Executor):
+    """Executa cada tentativa na hora, registrando a ordem dos envios."""
+
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, func, *args, **kwargs):
+        self.submitted.append(args[0])
+        future = concurrent.futures.Future()
+        try:
+            future.set_result(func(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+def policy(max_attempts: int = 3, **kwargs) -> RetryPolicy:
+    return RetryPolicy(max_attempts=max_attempts, base_delay=1.0, multiplier=2.0, jitter=False, **kwargs)
+
+def test_waiting_retries_count_against_max_in_flight():
+    attempts = {}
+
+    def func(item):
+        attempts[item] = attempts.get(item, 0) + 1
+        if item == 'a' and attempts[item] == 1:
+            raise ConnectionError('timeout')
+        return item.upper()
+
+    executor, scheduler = InlineExecutor(), FakeScheduler()
+    results = retry_as_completed(executor, func, ['a', 'b', 'c', 'd'], policy(), max_in_flight=2,
+                                 scheduler=scheduler)
+
+    assert next(results)[0] == 'b'
+    assert executor.submitted == ['a', 'b']
+
+    # 'a' aguarda a nova tentativa e ocupa uma das duas vagas: só um item novo entra por vez
+    assert next(results)[0] == 'c'
+    assert executor.submitted == ['a', 'b', 'c']
+    assert scheduler.delays == [1.0]
+    assert next(results)[0] == 'd'
+    assert executor.submitted == ['a', 'b', 'c', 'd']
+
+    scheduler.fire_all()
+    item, future = next(results)
+    assert (item, future.result()) == ('a', 'A')
+    assert executor.submitted == ['a', 'b', 'c', 'd', 'a']
+    with pytest.raises(StopIteration):
+        next(results)
+
+def test_exhausted_attempts_yield_the_last_error_with_growing_delays():
+    executor, scheduler = InlineExecutor(), FakeScheduler(immediate=True)
+
+    def func(item):
+        raise ConnectionError(f'falha {item}')
+
+    [(item, future)] = list(retry_as_completed(executor, func, ['x'], policy(max_attempts=3),
+                                               scheduler=scheduler))
+
+    assert item == 'x'
+    assert isinstance(future.exception(), ConnectionError)
+    assert executor.submitted == ['x', 'x', 'x']
+    assert scheduler.delays == [1.0, 2.0]
+
+def test_give_up_on_errors_are_not_retried():
+    executor, scheduler = InlineExecutor(), FakeScheduler(immediate=True)
+
+    def func(item):
+        raise CircuitOpenError('steamspy.com', 30)
+
+    [(_, future)] = list(retry_as_completed(executor, func, [1], policy(), scheduler=scheduler))
+
+    assert isinstance(future.exception(), CircuitOpenError)
+    assert executor.submitted == [1]
+    assert scheduler.delays == []
+
+def test_errors_outside_retry_on_are_not_retried():
+    executor, scheduler = InlineExecutor(), FakeScheduler(immediate=True)
+
+    def func(item):
+        raise KeyError(item)
+
+    results = list(retry_as_completed(executor, func, [1, 2], policy(retry_on=(ConnectionError,)),
+                                      scheduler=scheduler))
+
+    assert sorted(item for item, _ in results) == [1, 2]
+    assert scheduler.delays == []
+
+def test_without_policy_failures_are_yielded_once():
+    executor, scheduler = InlineExecutor(), FakeScheduler(immediate=True)
+
+    def func(item):
+        raise ConnectionError('timeout')
+
+    results = list(retry_as_completed(executor, func, range(3), scheduler=scheduler))
+
+    assert len(results) == 3
+    assert executor.submitted == [0, 1, 2]
+    assert scheduler.delays == []
+
+def test_policy_delay_is_capped_and_jitter_stays_in_range():
+    capped = RetryPolicy(base_delay=10.0, multiplier=10.0, max_delay=30.0, jitter=False)
+    assert [capped.delay(attempt) for attempt in (1, 2, 3)] == [10.0, 30.0, 30.0]
+
+    jittered = RetryPolicy(base_delay=4.0, jitter=True)
+    assert all(2.0 <= jittered.delay(1) <= 4.0 for _ in range(100))
+
+def test_scheduler_fires_callbacks_in_due_order():
+    scheduler = RetryScheduler()
+    fired = []
+    done = threading.Event()
+
+    def record(name):
+        fired.append(name)
+        if len(fired) == 3:
+            done.set()
+
+    scheduler.call_later(0.06, record, 'late')
+    scheduler.call_later(0.0, record, 'now')
+    scheduler.call_later(0.03, record, 'soon')
+
+    assert done.wait(2)
+    assert fired == ['now', 'soon', 'late']
+    assert scheduler.stats() == {'scheduled': 3, 'fired': 3, 'pending': 0}
@@ -0,0 +1,60 @@
+import pytest
+
+from services.games_recommender import GameInfo, SteamGameRecommender
+from services.scoring import ScoringEngine, TagMatrix
+from services.tag_catalog import TagCatalog
+
+PROFILE = {'RPG': 12.0, 'Open World': 8.5, 'Sci-fi': 4.0, 'Puzzle': 1.5}
+
+# Tags no formato do SteamSpy (votos por tag), todas com a mesma caixa do perfil
+LIBRARY = {
+    10: {'RPG': 900, 'Open World': 600, 'Action': 300},
+    20: {'Puzzle': 500, 'Platformer': 400},
+    30: {'Sci-fi': 200, 'RPG': 100, 'Puzzle': 50},
+    40: {'Racing': 700, 'Sports': 100},
+    50: {'Open World': 300, 'Sci-fi': 300},
+}
+
+@pytest.fixture
+def recommender(tmp_path):
+    recommender = SteamGameRecommender('1', catalog=TagCatalog(str(tmp_path / 'tags.sqlite3')))
+    recommender.user_profile = dict(PROFILE)
+    recommender._tag_memo = {appid: (tags, {}) for appid, tags in LIBRARY.items()}
+    return recommender
+
+def library_games():
+    return [GameInfo(appid, f"Jogo {appid}") for appid in LIBRARY]
+
+def test_vectorized_scores_match_process_game(recommender):
+    per_game = [recommender.process_game(game) for game in library_games()]
+    expected = sorted((game for game in per_game if game.score > 0), key=lambda game: game.score, reverse=True)
+
+    game_tags = {appid: (tags, {}) for appid, tags in LIBRARY.items()}
+    vectorized = recommender.score_games(library_games(), game_tags, max_recommendations=len(LIBRARY))
+
+    assert [game.appid for game in vectorized] == [game.appid for game in expected]
+    assert [game.score for game in vectorized] == pytest.approx([game.score for game in expected])
+    for fast, slow in zip(vectorized, expected):
+        assert fast.matching_tags == [
+            {**match, 'score': pytest.approx(match['score']), 'weight': pytest.approx(match['weight'], abs=0.01)}
+            for match in slow.matching_tags
+        ]
+
+def test_engine_scores_every_row_like_process_game(recommender):
+    engine = ScoringEngine()
+    matrix = TagMatrix.from_tags(LIBRARY.items(), engine.vocabulary)
+    scores, _ = engine.score(matrix, engine.encode_profile(PROFILE))
+
+    per_game = {game.appid: recommender.process_game(game).score for game in library_games()}
+    assert dict(zip(matrix.appids.tolist(), scores.tolist())) == pytest.approx(per_game)
+
+def test_case_folding_is_the_one_known_difference(recommender):
+    # process_game compara as tags literalmente; o vocabulário do motor ignora caixa e espaços
+    game = GameInfo(60, 'Jogo 60')
+    recommender._tag_memo[60] = ({'Sci-Fi': 10, ' open  world ': 10}, {})
+    assert recommender.process_game(game).score == 0
+
+    engine = ScoringEngine()
+    matrix = TagMatrix.from_tags([(60, {'Sci-Fi': 10, ' open  world ': 10})], engine.vocabulary)
+    scores, _ = engine.score(matrix, engine.encode_profile(PROFILE))
+    assert scores[0] == pytest.approx(PROFILE['Sci-fi'] + PROFILE['Open World'])
@@ -0,0 +1,137 @@
+import threading
+
+import pytest
+
+from utils.cache import MemoryCache, PersistentCache
+from utils.utils import SteamAPIError, SteamService
+
+class StubResponse:
+    def __init__(self, payload, status_code: int = 200):
+        self._payload = payload
+        self.status_code = status_code
+
+    def json(self):
+        return self._payload
+
+class StubTransport:
+    """Transporte falso: `routes` mapeia o início da URL para uma função (params) -> payload."""
+
+    def __init__(self, routes):
+        self.routes = routes
+        self.calls = []
+
+    def get(self, url, params=None, timeout=None, endpoint=None, **kwargs):
+        self.calls.append((url, dict(params or {}), endpoint))
+        for prefix, handler in self.routes.items():
+            if url.startswith(prefix):
+                return StubResponse(handler(params or {}))
+        raise AssertionError(f"URL inesperada: {url}")
+
+    def ensure_pool_size(self, pool_size):
+        pass
+
+def store_route(apps):
+    """Responde appdetails com os jogos de `apps` (appid -> data); os demais voltam sem sucesso."""
+    def handler(params):
+        appid = params['appids']
+        data = apps.get(appid)
+        return {appid: {'success': True, 'data': dict(data)} if data is not None else {'success': False}}
+    return {SteamService.APP_DETAILS_URL: handler}
+
+@pytest.fixture
+def make_service(tmp_path, monkeypatch):
+    monkeypatch.setenv('STEAM_API_KEY', 'test-key')
+    caches = []
+
+    def make(routes, memory: MemoryCache = None) -> SteamService:
+        cache = PersistentCache(str(tmp_path / f'cache{len(caches)}.sqlite3'))
+        caches.append(cache)
+        service = SteamService(cache=cache, memory=memory or MemoryCache())
+        service.transport = StubTransport(routes)
+        return service
+
+    yield make
+    for cache in caches:
+        cache.close()
+
+def test_unknown_app_raises_and_is_not_kept(make_service):
+    service = make_service(store_route({}))
+
+    with pytest.raises(SteamAPIError):
+        service.get_game_info(999)
+    with pytest.raises(SteamAPIError):
+        service.get_game_info(999)
+
+    assert service.get_app_cache_stats()['size'] == 0
+    assert len(service.transport.calls) == 2
+
+def test_invalidate_app_clears_the_injected_memory_cache(make_service):
+    apps = {'10': {'name': 'Half-Life', 'type': 'game'}}
+    memory = MemoryCache()
+    service = make_service(store_route(apps), memory=memory)
+
+    assert service.get_game_info(10)['name'] == 'Half-Life'
+    assert memory.stats()['namespaces'] == {'game_info': 1}
+
+    apps['10'] = {'name': 'Half-Life: Source', 'type': 'game'}
+    assert service.get_game_info(10)['name'] == 'Half-Life'
+
+    service.invalidate_app(10)
+    assert service.get_game_info(10)['name'] == 'Half-Life: Source'
+
+def test_concurrent_game_info_misses_share_one_request(make_service):
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow_store(params):
+        started.set()
+        release.wait(2)
+        return {params['appids']: {'success': True, 'data': {'name': 'Portal'}}}
+
+    service = make_service({SteamService.APP_DETAILS_URL: slow_store})
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(service.get_game_info(20))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    started.wait(2)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert [info['name'] for info in results] == ['Portal'] * 4
+    assert len(service.transport.calls) == 1
+
+def web_api_route(method, payload):
+    """Responde um método da Web API (ex.: 'ISteamUser/GetFriendList/v1/') com `payload(params)`."""
+    return {f"{SteamService.WEB_API_URL}/{method}": payload}
+
+def test_user_calls_go_through_the_transport_with_the_key(make_service):
+    players = {'1': {'steamid': '1', 'personaname': 'Gordon'}, '2': {'steamid': '2', 'personaname': 'Alyx'}}
+    service = make_service({
+        **web_api_route('ISteamUser/GetFriendList/v1/', lambda params: {'friendslist': {'friends': [
+            {'steamid': '2', 'relationship': 'friend', 'friend_since': 100}
+        ]}}),
+        **web_api_route('ISteamUser/GetPlayerSummaries/v2/', lambda params: {'response': {'players': [
+            players[steamid] for steamid in params['steamids'].split(',') if steamid in players
+        ]}}),
+        **web_api_route('ISteamUser/ResolveVanityURL/v1/', lambda params: {'response': {'success': 1, 'steamid': '1'}}),
+    })
+
+    assert service.get_steamid('gordon') == '1'
+    assert service.get_username('1') == 'Gordon'
+    assert service.get_friends_list('1') == {'friends': [
+        {'steamid': '2', 'personaname': 'Alyx', 'relationship': 'friend', 'friend_since': 100}
+    ]}
+    assert all(params['key'] == 'test-key' for _, params, _ in service.transport.calls)
+
+    # O perfil buscado pela lista de amigos atende get_user_details sem nova requisição
+    calls = len(service.transport.calls)
+    assert service.get_user_details('2') == {'player': players['2']}
+    assert len(service.transport.calls) == calls
+
+def test_private_library_raises(make_service):
+    service = make_service(web_api_route('IPlayerService/GetOwnedGames/v1/', lambda params: {'response': {}}))
+
+    with pytest.raises(SteamAPIError) as error:
+        service._fetch_library('1')
+    assert error.value.status_code == 403
@@ -0,0 +1,141 @@
+import pytest
+
+from services.games_recommender import CandidateFilter, GameInfo, SteamGameRecommender
+from services.tag_catalog import TagCatalog
+from services.user_snapshot import UserSnapshotStore
+from utils.circuit_breaker import CircuitOpenError
+
+# Jogos do perfil (com horas jogadas) e candidatos ainda não jogados
+LIBRARY = {
+    1: ('Skyrim', 50.0),
+    2: ('Portal', 10.0),
+    10: ('Fallout', 0.0),
+    11: ('The Witness', 0.0),
+    12: ('Forza', 0.0),
+    13: ('Divinity', 0.0),
+}
+
+TAGS = {
+    1: {'RPG': 900, 'Open World': 600},
+    2: {'Puzzle': 800},
+    10: {'RPG': 500, 'Open World': 500},
+    11: {'Puzzle': 700},
+    12: {'Racing': 900},
+    13: {'RPG': 300, 'Puzzle': 300},
+    14: {'RPG': 100, 'Open World': 100, 'Puzzle': 100},
+}
+
+class StubRecommender(SteamGameRecommender):
+    """Recomendador com biblioteca e tags locais; appids fora de `tags` falham como um circuito aberto."""
+
+    def __init__(self, library, tags, catalog):
+        super().__init__('1', catalog=catalog)
+        self.library = library
+        self.tags = tags
+        self.lookups = []
+        self.full_rebuilds = 0
+
+    def fetch_user_library(self):
+        self.user_games = [GameInfo(appid, name, hours) for appid, (name, hours) in self.library.items()]
+
+    def request_game_tags(self, appid):
+        entry = self._tag_memo.get(appid)
+        if entry is not None:
+            return entry
+        self.lookups.append(appid)
+        if appid not in self.tags:
+            raise CircuitOpenError('steamspy.com', 30)
+        entry = (dict(self.tags[appid]), {})
+        self._tag_memo[appid] = entry
+        return entry
+
+    def get_game_tags(self, appid):
+        try:
+            return self.request_game_tags(appid)
+        except CircuitOpenError:
+            return {}, {}
+
+    def suggest_games(self, *args, **kwargs):
+        self.full_rebuilds += 1
+        return super().suggest_games(*args, **kwargs)
+
+@pytest.fixture
+def make_recommender(tmp_path):
+    store = UserSnapshotStore(str(tmp_path / 'users.sqlite3'))
+    catalog = TagCatalog(str(tmp_path / 'tags.sqlite3'))
+
+    def make(library=None, tags=None) -> StubRecommender:
+        return StubRecommender(dict(library or LIBRARY), dict(tags or TAGS), catalog)
+
+    make.store = store
+    yield make
+    store.close()
+
+def ranking(games):
+    return [(game.appid, pytest.approx(game.score)) for game in games]
+
+def full_ranking(make_recommender, library, tags=None):
+    """Ranking de uma reconstrução completa, sem snapshot, para comparar com a atualização incremental."""
+    return ranking(make_recommender(library, tags).suggest_games(top_played_games_limit=2))
+
+def test_playtime_delta_updates_the_profile_without_new_lookups(make_recommender):
+    make_recommender().refresh_suggestions(top_played_games_limit=2, store=make_recommender.store)
+
+    library = {**LIBRARY, 2: ('Portal', 90.0)}
+    recommender = make_recommender(library)
+    recommendations = recommender.refresh_suggestions(top_played_games_limit=2, store=make_recommender.store)
+
+    assert recommender.full_rebuilds == 0
+    assert recommender.lookups == []
+    # Puzzle passa de 2 para 10 no perfil: The Witness e Divinity sobem sem nova busca de tags
+    assert [game.appid for game in recommendations] == [13, 10, 11]
+    assert ranking(recommendations) == full_ranking(make_recommender, library)
+
+def test_new_purchase_is_the_only_lookup(make_recommender):
+    make_recommender().refresh_suggestions(top_played_games_limit=2, store=make_recommender.store)
+
+    library = {**LIBRARY, 14: ('Myst', 0.0)}
+    recommender = make_recommender(library)
+    recommendations = recommender.refresh_suggestions(top_played_games_limit=2, store=make_recommender.store)
+
+    assert recommender.full_rebuilds == 0
+    assert recommender.lookups == [14]
+    assert recommendations[0].appid == 14
+    assert ranking(recommendations) == full_ranking(make_recommender, library)
+
+def test_filter_change_forces_a_full_rebuild(make_recommender):
+    make_recommender().refresh_suggestions(top_played_games_limit=2, store=make_recommender.store)
+
+    recommender = make_recommender()
+    recommender.refresh_suggestions(top_played_games_limit=2, store=make_recommender.store,
+                                    candidate_filter=CandidateFilter(exclude_profile_games=False))
+    assert recommender.full_rebuilds == 1
+
+    recommender = make_recommender()
+    recommender.refresh_suggestions(top_played_games_limit=2, store=make_recommender.store,
+                                    candidate_filter=CandidateFilter(exclude_profile_games=False))
+    assert recommender.full_rebuilds == 0
+
+def test_profile_size_change_forces_a_full_rebuild(make_recommender):
+    make_recommender().refresh_suggestions(top_played_games_limit=2, store=make_recommender.store)
+
+    recommender = make_recommender()
+    recommender.refresh_suggestions(top_played_games_limit=1, store=make_recommender.store)
+
+    assert recommender.full_rebuilds == 1
+    assert make_recommender.store.load('1').profile_size == 1
+
+def test_failed_lookup_is_retried_on_the_next_refresh(make_recommender):
+    offline = {appid: tags for appid, tags in TAGS.items() if appid != 13}
+    first = make_recommender(tags=offline)
+    first.refresh_suggestions(top_played_games_limit=2, store=make_recommender.store)
+    assert 13 in first.lookups
+    assert 13 not in make_recommender.store.load('1').scores
+
+    recommender = make_recommender()
+    recommendations = recommender.refresh_suggestions(top_played_games_limit=2, store=make_recommender.store)
+
+    assert recommender.full_rebuilds == 0
+    assert recommender.lookups == [13]
+    assert 13 in [game.appid for game in recommendations]
+    assert 13 in make_recommender.store.load('1').scores
@@ -0,0 +1,227 @@
+import json
+import time
+import asyncio
+from typing import Any, Awaitable, Dict, Optional, TypeVar
+from urllib.parse import urlparse
+
+import aiohttp
+
+from utils.http import get_transport
+from utils.rate_limit import RateLimiter
+from utils.circuit_breaker import CircuitBreakerRegistry, is_failure
+from utils.hedging import HedgePolicy, LatencyTracker
+
+T = TypeVar('T')
+
+class AsyncResponse:
+    """
+    Resposta HTTP já lida por completo, com a interface de requests.Response usada no projeto.
+
+    Attributes:
+        url (str): URL final da requisição
+        status_code (int): Status HTTP
+        headers (Dict[str, str]): Cabeçalhos da resposta
+        content (bytes): Corpo da resposta
+    """
+
+    __slots__ = ('url', 'status_code', 'headers', 'content')
+
+    def __init__(self, url: str, status_code: int, headers: Dict[str, str], content: bytes):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    @property
+    def text(self) -> str:
+        """Corpo da resposta decodificado como texto."""
+        return self.content.decode('utf-8', errors='replace')
+
+    def json(self) -> Any:
+        """Decodifica o corpo da resposta como JSON."""
+        return json.loads(self.content)
+
+class AsyncTransport:
+    """
+    Transporte HTTP assíncrono (aiohttp) para milhares de requisições simultâneas em uma única thread.
+
+    Usa os mesmos buckets e disjuntores por host do transporte síncrono, então
+    chamadas síncronas e assíncronas dividem o mesmo orçamento e o mesmo
+    estado de saúde de cada host; a espera pelo limite
+    de taxa é feita com `asyncio.sleep`, sem bloquear o event loop. Cada
+    event loop tem sua própria sessão, com keep-alive e pool de conexões.
+    As latências e as políticas de hedging também são as do transporte
+    síncrono; aqui a cópia perdedora é cancelada.
+
+    Attributes:
+        rate_limiter (RateLimiter): Limitador de taxa por host
+        breakers (CircuitBreakerRegistry): Disjuntores por host
+        latency (LatencyTracker): Latências recentes por endpoint
+        hedge_policies (Dict[str, HedgePolicy]): Políticas de hedging por endpoint
+        max_connections (int): Número máximo de conexões abertas por sessão
+        max_throttle_retries (int): Tentativas extras após respostas 429
+    """
+
+    def __init__(self, rate_limiter: RateLimiter = None, max_connections: int = 1000,
+                 max_throttle_retries: int = 3, breakers: CircuitBreakerRegistry = None,
+                 latency: LatencyTracker = None, hedge_policies: Dict[str, HedgePolicy] = None):
+        """
+        Args:
+            rate_limiter: Limitador de taxa (padrão: o do transporte síncrono compartilhado)
+            max_connections: Número máximo de conexões abertas por sessão
+            max_throttle_retries: Tentativas extras após respostas 429
+            breakers: Disjuntores por host (padrão: os do transporte síncrono compartilhado)
+            latency: Medições de latência (padrão: as do transporte síncrono compartilhado)
+            hedge_policies: Políticas de hedging (padrão: as do transporte síncrono compartilhado)
+        """
+        self.rate_limiter = rate_limiter or get_transport().rate_limiter
+        self.breakers = breakers or get_transport().breakers
+        self.latency = latency or get_transport().latency
+        self.hedge_policies = get_transport().hedge_policies if hedge_policies is None else hedge_policies
+        self.max_connections = max_connections
+        self.max_throttle_retries = max_throttle_retries
+        self._sessions: Dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+
+    def session(self) -> aiohttp.ClientSession:
+        """Retorna a sessão do event loop em execução, criando-a na primeira utilização."""
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_connections, ttl_dns_cache=300)
+            session = self._sessions[loop] = aiohttp.ClientSession(connector=connector)
+        return session
+
+    @staticmethod
+    def _encode_params(params: Optional[Dict]) -> Optional[Dict[str, str]]:
+        """Converte os parâmetros em texto, como o requests faz (aiohttp não aceita bool)."""
+        if params is None:
+            return None
+        return {key: str(value) for key, value in params.items() if value is not None}
+
+    async def get(self, url: str, params: Dict = None, timeout: float = 10, endpoint: str = None,
+                  **kwargs) -> AsyncResponse:
+        """
+        Executa um GET assíncrono, respeitando o limite de taxa do host.
+
+        Args:
+            url: URL da requisição
+            params: Parâmetros da query string
+            timeout: Timeout da requisição em segundos
+            endpoint: Nome do endpoint para a latência e o hedging (ex.: 'appdetails';
+                padrão: host e caminho da URL)
+
+        Returns:
+            AsyncResponse: Última resposta recebida (pode ser 429 se as
+            tentativas extras se esgotarem)
+
+        Raises:
+            CircuitOpenError: Se o circuito do host está aberto (sem acessar a rede)
+        """
+        parsed = urlparse(url)
+        host = parsed.hostname
+        endpoint = endpoint or f"{host}{parsed.path}"
+        policy = self.hedge_policies.get(endpoint)
+        request = (url, self._encode_params(params), aiohttp.ClientTimeout(total=timeout), kwargs)
+
+        for _ in range(self.max_throttle_retries + 1):
+            wait = self.rate_limiter.reserve(host)
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+            threshold = policy and self.latency.percentile(endpoint, policy.percentile, policy.min_samples)
+            if threshold:
+                response = await self._hedged(host, endpoint, request, max(threshold, policy.min_delay))
+            else:
+                response = await self._attempt(host, endpoint, request)
+            if response.status_code != 429:
+                break
+        return response
+
+    async def _attempt(self, host: str, endpoint: str, request: tuple) -> AsyncResponse:
+        """Uma requisição (com o token do limitador já tomado), registrada no disjuntor e na latência."""
+        url, params, client_timeout, kwargs = request
+        breaker = self.breakers.breaker(host)
+        probe = breaker.before_request()
+        start = time.monotonic()
+        try:
+            async with self.session().get(url, params=params, timeout=client_timeout, **kwargs) as raw:
+                response = AsyncResponse(str(raw.url), raw.status, dict(raw.headers), await raw.read())
+        except Exception:
+            breaker.record_failure()
+            raise
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                # Cópia perdedora: o tempo até o cancelamento é um limite inferior da latência
+                self.latency.record(endpoint, time.monotonic() - start)
+            # Cancelada sem resultado: não prende a sondagem do circuito meio aberto
+            if probe:
+                breaker.release_probe()
+            raise
+        if is_failure(response.status_code):
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+            if response.status_code != 429:
+                self.latency.record(endpoint, time.monotonic() - start)
+        self.rate_limiter.record(host, response.status_code, response.headers.get('Retry-After'))
+        return response
+
+    async def _hedged(self, host: str, endpoint: str, request: tuple, threshold: float) -> AsyncResponse:
+        """Executa a requisição e dispara uma cópia se ela passar de `threshold`; a perdedora é cancelada."""
+        primary = asyncio.ensure_future(self._attempt(host, endpoint, request))
+        tasks = [primary]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=threshold)
+            if done:
+                return primary.result()
+
+            if self.breakers.is_open(host) or not self.rate_limiter.try_acquire(host):
+                self.latency.record_hedge_skipped(endpoint)
+                return await primary
+
+            hedge = asyncio.ensure_future(self._attempt(host, endpoint, request))
+            tasks.append(hedge)
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        self.latency.record_hedge(endpoint, won=task is hedge)
+                        return task.result()
+            self.latency.record_hedge(endpoint, won=False)
+            return primary.result()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def close(self) -> None:
+        """Fecha a sessão do event loop em execução."""
+        session = self._sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None:
+            await session.close()
+
+_async_transport: Optional[AsyncTransport] = None
+
+def get_async_transport() -> AsyncTransport:
+    """Retorna o transporte assíncrono compartilhado pelo processo."""
+    global _async_transport
+    if _async_transport is None:
+        _async_transport = AsyncTransport()
+    return _async_transport
+
+def run_sync(coro: Awaitable[T]) -> T:
+    """
+    Executa uma corrotina a partir de código síncrono.
+
+    Cria um event loop para a chamada e fecha a sessão HTTP dele ao final.
+    Não pode ser usada de dentro de um event loop em execução; nesse caso,
+    use `await` diretamente.
+    """
+    async def runner() -> T:
+        try:
+            return await coro
+        finally:
+            await get_async_transport().close()
+
+    return asyncio.run(runner())
@@ -0,0 +1,416 @@
+import os
+import sys
+import json
+import time
+import sqlite3
+import functools
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+CACHE_DIR = os.environ.get("STEAMATCH_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "steamatch"))
+DEFAULT_CACHE_PATH = os.path.join(CACHE_DIR, "cache.sqlite3")
+
+# TTL padrão (em segundos) por endpoint
+DEFAULT_TTLS = {
+    'appdetails': 12 * 60 * 60,
+    'steamspy': 12 * 60 * 60,
+    'most_played': 60 * 60,
+}
+
+# TTL padrão (em segundos) por namespace do cache em memória
+DEFAULT_MEMORY_TTLS = {
+    'user': 10 * 60,
+    'game_info': 12 * 60 * 60,
+}
+
+class PersistentCache:
+    """
+    Cache persistente em disco (SQLite) para respostas das APIs.
+
+    As entradas são agrupadas por namespace (um por endpoint), cada um com seu
+    próprio TTL. Quando o número de entradas passa de `max_entries`, as menos
+    acessadas recentemente são removidas. Leituras não escrevem no banco: os
+    horários de acesso ficam em memória e são gravados junto da próxima escrita.
+
+    Attributes:
+        path (str): Caminho do arquivo SQLite
+        ttls (Dict[str, int]): TTL em segundos por namespace
+        max_entries (int): Número máximo de entradas mantidas em disco
+        hits (int): Leituras atendidas pelo cache
+        misses (int): Leituras não encontradas ou expiradas
+    """
+
+    EVICTION_INTERVAL = 100
+
+    def __init__(self, path: str = None, ttls: Dict[str, int] = None, max_entries: int = 50000):
+        """
+        Inicializa o cache, criando o arquivo e a tabela se necessário.
+
+        Args:
+            path: Caminho do arquivo SQLite (padrão: STEAMATCH_CACHE_PATH ou ~/.cache/steamatch)
+            ttls: TTLs por namespace, sobrescrevendo os padrões
+            max_entries: Número máximo de entradas em disco
+        """
+        self.path = path or os.environ.get("STEAMATCH_CACHE_PATH", DEFAULT_CACHE_PATH)
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._accessed: Dict[Tuple[str, str], float] = {}
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                PRIMARY KEY (namespace, key)
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries (accessed_at)")
+        self._conn.commit()
+
+    def get(self, namespace: str, key: Any) -> Optional[Any]:
+        """
+        Obtém um valor do cache.
+
+        Returns:
+            O valor armazenado, ou None se ausente ou expirado
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM entries WHERE namespace = ? AND key = ?",
+                (namespace, str(key))
+            ).fetchone()
+
+            if row is None or now - row[1] > self.ttls.get(namespace, 0):
+                self.misses += 1
+                return None
+
+            self._accessed[(namespace, str(key))] = now
+            self.hits += 1
+            return json.loads(row[0])
+
+    def get_stale(self, namespace: str, key: Any) -> Optional[Any]:
+        """
+        Obtém um valor do cache ignorando o TTL.
+
+        Usado em modo degradado, quando o upstream está fora do ar e um dado
+        antigo é melhor que nenhum.
+
+        Returns:
+            O valor armazenado, ou None se ausente
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM entries WHERE namespace = ? AND key = ?", (namespace, str(key))
+            ).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def set(self, namespace: str, key: Any, value: Any) -> None:
+        """Armazena um valor serializável em JSON no cache."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (namespace, key, value, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (namespace, str(key), json.dumps(value), now, now)
+            )
+            self._flush_accessed()
+            self._writes += 1
+            if self._writes % self.EVICTION_INTERVAL == 0:
+                self._evict()
+            self._conn.commit()
+
+    def delete(self, namespace: str, key: Any) -> bool:
+        """Remove uma entrada do cache; retorna True se ela existia."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM entries WHERE namespace = ? AND key = ?", (namespace, str(key))
+            )
+            self._conn.commit()
+        return cursor.rowcount > 0
+
+    def _flush_accessed(self) -> None:
+        """Grava os horários de acesso acumulados pelas leituras (chamado com o lock, antes de um commit)."""
+        if self._accessed:
+            self._conn.executemany(
+                "UPDATE entries SET accessed_at = ? WHERE namespace = ? AND key = ? AND accessed_at < ?",
+                [(at, ns, key, at) for (ns, key), at in self._accessed.items()]
+            )
+            self._accessed.clear()
+
+    def _evict(self) -> None:
+        """Remove as entradas menos acessadas além do limite de tamanho."""
+        count = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM entries WHERE rowid IN "
+                "(SELECT rowid FROM entries ORDER BY accessed_at ASC LIMIT ?)",
+                (excess,)
+            )
+
+    def purge(self, namespace: str = None, expired_only: bool = False) -> int:
+        """
+        Remove entradas do cache.
+
+        Args:
+            namespace: Limita a remoção a um namespace (opcional)
+            expired_only: Remove apenas as entradas com TTL vencido
+
+        Returns:
+            int: Número de entradas removidas
+        """
+        now = time.time()
+        namespaces = [namespace] if namespace else self._namespaces()
+        removed = 0
+
+        with self._lock:
+            for ns in namespaces:
+                if expired_only:
+                    cursor = self._conn.execute(
+                        "DELETE FROM entries WHERE namespace = ? AND created_at < ?",
+                        (ns, now - self.ttls.get(ns, 0))
+                    )
+                else:
+                    cursor = self._conn.execute("DELETE FROM entries WHERE namespace = ?", (ns,))
+                removed += cursor.rowcount
+            self._conn.commit()
+        return removed
+
+    def _namespaces(self) -> list:
+        """Lista os namespaces presentes no cache."""
+        with self._lock:
+            rows = self._conn.execute("SELECT DISTINCT namespace FROM entries").fetchall()
+        return [row[0] for row in rows]
+
+    def stats(self) -> Dict:
+        """
+        Retorna estatísticas do cache.
+
+        Returns:
+            Dict contendo caminho, tamanho em disco, acertos, falhas e
+            contagem de entradas (total e expiradas) por namespace
+        """
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT namespace, COUNT(*), MIN(created_at) FROM entries GROUP BY namespace"
+            ).fetchall()
+            namespaces = {}
+            for ns, count, _ in rows:
+                expired = self._conn.execute(
+                    "SELECT COUNT(*) FROM entries WHERE namespace = ? AND created_at < ?",
+                    (ns, now - self.ttls.get(ns, 0))
+                ).fetchone()[0]
+                namespaces[ns] = {'entries': count, 'expired': expired, 'ttl': self.ttls.get(ns, 0)}
+
+        return {
+            'path': self.path,
+            'size_bytes': os.path.getsize(self.path) if os.path.exists(self.path) else 0,
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'namespaces': namespaces
+        }
+
+    def close(self) -> None:
+        """Fecha a conexão com o banco, gravando antes os horários de acesso pendentes."""
+        with self._lock:
+            self._flush_accessed()
+            self._conn.commit()
+            self._conn.close()
+
+_persistent_cache: Optional[PersistentCache] = None
+_persistent_cache_lock = threading.Lock()
+
+def get_persistent_cache() -> PersistentCache:
+    """Retorna a instância de cache persistente compartilhada pelo processo."""
+    global _persistent_cache
+    with _persistent_cache_lock:
+        if _persistent_cache is None:
+            _persistent_cache = PersistentCache()
+        return _persistent_cache
+
+class MemoryCache:
+    """
+    Cache em memória compartilhado pelo processo, com TTL por namespace e limite de tamanho.
+
+    As chaves são (namespace, id), então o mesmo perfil ou jogo é reaproveitado
+    por qualquer instância de serviço. Entradas vencidas são descartadas na
+    leitura e, acima de `max_entries`, as menos usadas recentemente saem primeiro.
+
+    Attributes:
+        ttls (Dict[str, int]): TTL em segundos por namespace
+        max_entries (int): Número máximo de entradas mantidas
+        hits (int): Leituras atendidas pelo cache
+        misses (int): Leituras não encontradas ou expiradas
+        evictions (int): Entradas removidas por falta de espaço
+    """
+
+    def __init__(self, ttls: Dict[str, int] = None, max_entries: int = 5000):
+        """
+        Args:
+            ttls: TTLs por namespace, sobrescrevendo os padrões
+            max_entries: Número máximo de entradas em memória
+        """
+        self.ttls = {**DEFAULT_MEMORY_TTLS, **(ttls or {})}
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: 'OrderedDict[tuple, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, namespace: str, key: Any) -> Optional[Any]:
+        """
+        Obtém um valor do cache.
+
+        Returns:
+            O valor armazenado, ou None se ausente ou expirado
+        """
+        entry_key = (namespace, str(key))
+        with self._lock:
+            entry = self._entries.get(entry_key)
+            if entry is None or entry[1] < time.time():
+                if entry is not None:
+                    del self._entries[entry_key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(entry_key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, namespace: str, key: Any, value: Any) -> None:
+        """Armazena um valor, com o TTL do namespace."""
+        entry_key = (namespace, str(key))
+        expires_at = time.time() + self.ttls.get(namespace, 0)
+        with self._lock:
+            self._entries[entry_key] = (value, expires_at)
+            self._entries.move_to_end(entry_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, namespace: str, key: Any = None) -> int:
+        """
+        Remove uma entrada ou, sem `key`, todo o namespace.
+
+        Returns:
+            int: Número de entradas removidas
+        """
+        with self._lock:
+            if key is not None:
+                return 1 if self._entries.pop((namespace, str(key)), None) is not None else 0
+            keys = [entry_key for entry_key in self._entries if entry_key[0] == namespace]
+            for entry_key in keys:
+                del self._entries[entry_key]
+            return len(keys)
+
+    def clear(self) -> None:
+        """Descarta todas as entradas e zera os contadores."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict:
+        """
+        Retorna estatísticas do cache.
+
+        Returns:
+            Dict contendo acertos, falhas, remoções por espaço e número de
+            entradas por namespace
+        """
+        with self._lock:
+            namespaces: Dict[str, int] = {}
+            for namespace, _ in self._entries:
+                namespaces[namespace] = namespaces.get(namespace, 0) + 1
+            return {
+                'max_entries': self.max_entries,
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'namespaces': namespaces
+            }
+
+_memory_cache: Optional[MemoryCache] = None
+_memory_cache_lock = threading.Lock()
+
+def get_memory_cache() -> MemoryCache:
+    """Retorna o cache em memória compartilhado pelo processo."""
+    global _memory_cache
+    with _memory_cache_lock:
+        if _memory_cache is None:
+            _memory_cache = MemoryCache()
+        return _memory_cache
+
+def memory_cached(namespace: str) -> Callable:
+    """
+    Decorator de métodos que guarda o resultado no cache em memória da instância.
+
+    A chave é o primeiro argumento após `self` (ex.: Steam ID ou appid), sem
+    incluir a instância. O cache usado é `self.memory` (o compartilhado pelo
+    processo, se a instância não tiver um), então serviços com o cache padrão
+    dividem as mesmas entradas e invalidações na instância valem para o
+    decorator. Se a instância tiver um `_flight` (SingleFlight), faltas
+    simultâneas da mesma chave executam o método uma única vez.
+
+    Args:
+        namespace: Namespace das entradas (define o TTL)
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, key, *args, **kwargs):
+            cache = getattr(self, 'memory', None) or get_memory_cache()
+            value = cache.get(namespace, key)
+            if value is None:
+                def load():
+                    result = func(self, key, *args, **kwargs)
+                    cache.set(namespace, key, result)
+                    return result
+                flight = getattr(self, '_flight', None)
+                value = flight.do((namespace, str(key)), load) if flight is not None else load()
+            return value
+        return wrapper
+    return decorator
+
+def main(argv: list) -> None:
+    """
+    Interface de linha de comando para inspecionar ou limpar o cache.
+
+    Uso:
+        python -m utils.cache stats
+        python -m utils.cache purge [namespace] [--expired]
+    """
+    cache = get_persistent_cache()
+    command = argv[0] if argv else 'stats'
+
+    if command == 'stats':
+        stats = cache.stats()
+        print(f"📦 Cache: {stats['path']} ({stats['size_bytes'] / 1024:.1f} KB)")
+        for ns, info in stats['namespaces'].items():
+            print(f"   • {ns}: {info['entries']} entradas ({info['expired']} expiradas, TTL {info['ttl']}s)")
+    elif command == 'purge':
+        args = [arg for arg in argv[1:] if not arg.startswith('--')]
+        removed = cache.purge(args[0] if args else None, expired_only='--expired' in argv)
+        print(f"🧹 {removed} entradas removidas do cache")
+    else:
+        print(f"❌ Comando desconhecido: {command}")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,205 @@
+import time
+import threading
+from collections import deque
+from typing import Dict, Optional, Tuple
+
+import requests
+
+# Estados do circuito
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+# Configuração padrão por host: (limite da taxa de erro, mínimo de requisições na janela, segundos aberto)
+DEFAULT_BREAKER_SETTINGS: Dict[str, Tuple[float, int, float]] = {
+    'steamspy.com': (0.5, 5, 30.0),
+    'store.steampowered.com': (0.5, 10, 30.0),
+    'api.steampowered.com': (0.5, 10, 30.0),
+}
+
+class CircuitOpenError(requests.RequestException):
+    """Requisição recusada sem acessar a rede porque o circuito do host está aberto."""
+
+    def __init__(self, host: str, retry_in: float):
+        self.host = host
+        self.retry_in = retry_in
+        super().__init__(f"Circuito aberto para {host} (nova sondagem em {retry_in:.0f}s)")
+
+class CircuitBreaker:
+    """
+    Disjuntor de um host upstream.
+
+    Fechado, deixa tudo passar e acompanha o resultado das últimas
+    requisições. Quando a taxa de erro da janela passa do limite, abre: as
+    requisições falham na hora, sem esperar timeouts. Depois de
+    `reset_timeout` segundos fica meio aberto e deixa passar uma sondagem;
+    se ela der certo o circuito fecha, senão volta a abrir.
+
+    Erros são exceções de rede (timeout, conexão) e respostas 5xx; qualquer
+    outra resposta (inclusive 429, tratado pelo limitador de taxa) mostra que
+    o host está de pé e conta como sucesso.
+
+    Attributes:
+        host (str): Host protegido
+        state (str): 'closed', 'open' ou 'half_open'
+        failure_threshold (float): Taxa de erro que abre o circuito
+        min_requests (int): Requisições mínimas na janela antes de avaliar a taxa
+        reset_timeout (float): Segundos em aberto antes da sondagem
+    """
+
+    def __init__(self, host: str, failure_threshold: float = 0.5, min_requests: int = 10,
+                 reset_timeout: float = 30.0, window: int = 20):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.min_requests = min_requests
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self._outcomes: deque = deque(maxlen=window)
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+        self.rejected = 0
+        self.trips = 0
+
+    def before_request(self) -> bool:
+        """
+        Autoriza uma requisição ao host.
+
+        Returns:
+            bool: True se a requisição é a sondagem do circuito meio aberto
+
+        Raises:
+            CircuitOpenError: Se o circuito está aberto (ou meio aberto com uma sondagem em andamento)
+        """
+        with self._lock:
+            if self.state == CLOSED:
+                return False
+            remaining = self._opened_at + self.reset_timeout - time.monotonic()
+            if self.state == OPEN and remaining <= 0:
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            self.rejected += 1
+            raise CircuitOpenError(self.host, max(remaining, 0.0))
+
+    def release_probe(self) -> None:
+        """
+        Libera a sondagem sem registrar resultado (requisição cancelada ou interrompida).
+
+        O circuito continua meio aberto e a próxima requisição faz a sondagem.
+        """
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._probing = False
+
+    def record_success(self) -> None:
+        """Registra uma resposta bem-sucedida; fecha o circuito se era a sondagem."""
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self.state = CLOSED
+                self._probing = False
+                self._outcomes.clear()
+                print(f"\n✅ Circuito fechado para {self.host}: host respondendo novamente")
+            self._outcomes.append(True)
+
+    def record_failure(self) -> None:
+        """Registra um erro; abre o circuito se a taxa passou do limite ou se a sondagem falhou."""
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._open()
+                print(f"\n🔌 Sondagem de {self.host} falhou: circuito aberto por mais {self.reset_timeout:.0f}s")
+                return
+            self._outcomes.append(False)
+            failures = self._outcomes.count(False)
+            if (self.state == CLOSED and len(self._outcomes) >= self.min_requests
+                    and failures / len(self._outcomes) >= self.failure_threshold):
+                self._open()
+                print(f"\n🔌 Circuito aberto para {self.host} ({failures}/{len(self._outcomes)} erros): "
+                      f"falhando rápido por {self.reset_timeout:.0f}s")
+
+    def _open(self) -> None:
+        """Abre o circuito (chamado com o lock adquirido)."""
+        self.state = OPEN
+        self._opened_at = time.monotonic()
+        self._probing = False
+        self.trips += 1
+
+    def stats(self) -> Dict:
+        """Retorna o estado do circuito e seus contadores."""
+        with self._lock:
+            failures = self._outcomes.count(False)
+            return {
+                'state': self.state,
+                'error_rate': round(failures / len(self._outcomes), 2) if self._outcomes else 0.0,
+                'window': len(self._outcomes),
+                'trips': self.trips,
+                'rejected': self.rejected
+            }
+
+class CircuitBreakerRegistry:
+    """
+    Disjuntores por host, compartilhados pelos transportes síncrono e assíncrono.
+
+    Hosts sem configuração própria usam os valores padrão de CircuitBreaker.
+    """
+
+    def __init__(self, settings: Dict[str, Tuple[float, int, float]] = None):
+        """
+        Args:
+            settings: Mapeamento host -> (limite da taxa de erro, mínimo de requisições, segundos aberto)
+        """
+        self._settings = {**DEFAULT_BREAKER_SETTINGS, **(settings or {})}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        """Retorna o disjuntor do host, criando-o na primeira utilização."""
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                settings = self._settings.get(host)
+                breaker = CircuitBreaker(host, *settings) if settings else CircuitBreaker(host)
+                self._breakers[host] = breaker
+            return breaker
+
+    def configure(self, host: str, failure_threshold: float, min_requests: int, reset_timeout: float) -> None:
+        """Define (ou substitui) a configuração do disjuntor de um host."""
+        with self._lock:
+            self._settings[host] = (failure_threshold, min_requests, reset_timeout)
+            self._breakers[host] = CircuitBreaker(host, failure_threshold, min_requests, reset_timeout)
+
+    def is_open(self, host: str) -> bool:
+        """Indica se o circuito do host está aberto (sem consumir a sondagem)."""
+        return self.breaker(host).state != CLOSED
+
+    def stats(self) -> Dict[str, Dict]:
+        """Retorna o estado de todos os disjuntores."""
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {host: breaker.stats() for host, breaker in breakers.items()}
+
+    def checkpoint(self) -> Dict[str, Tuple[int, int]]:
+        """Retorna (aberturas, recusas) de cada host, para medir uma execução com degraded(since=...)."""
+        return {host: (stats['trips'], stats['rejected']) for host, stats in self.stats().items()}
+
+    def degraded(self, since: Dict[str, Tuple[int, int]] = None) -> Dict[str, Dict]:
+        """
+        Retorna o estado dos hosts que abriram o circuito ou recusaram requisições.
+
+        Args:
+            since: Checkpoint do início da execução; aberturas e recusas passam a
+                contar só a partir dele (padrão: desde a criação dos disjuntores)
+        """
+        degraded = {}
+        for host, stats in self.stats().items():
+            trips, rejected = (since or {}).get(host, (0, 0))
+            stats = {**stats, 'trips': stats['trips'] - trips, 'rejected': stats['rejected'] - rejected}
+            if stats['state'] != CLOSED or stats['trips'] or stats['rejected']:
+                degraded[host] = stats
+        return degraded
+
+def is_failure(status_code: Optional[int]) -> bool:
+    """Indica se o resultado conta como erro para o disjuntor (sem resposta ou 5xx)."""
+    return status_code is None or status_code >= 500
@@ -0,0 +1,117 @@
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+@dataclass
+class HedgePolicy:
+    """
+    Política de requisições duplicadas (hedging) de um endpoint.
+
+    Quando uma requisição passa do percentil `percentile` da latência recente
+    do endpoint, uma cópia é disparada (se o limitador de taxa tiver um token
+    livre na hora) e vale a primeira resposta. Enquanto não houver
+    `min_samples` medições, nada é duplicado.
+
+    Attributes:
+        percentile: Percentil da latência que dispara a cópia (0 a 1)
+        min_samples: Medições mínimas antes de duplicar
+        min_delay: Espera mínima, em segundos, antes de duplicar
+    """
+    percentile: float = 0.95
+    min_samples: int = 20
+    min_delay: float = 0.05
+
+# Nenhum endpoint é duplicado por padrão: cada cópia gasta cota do host, então
+# o hedging é ligado por endpoint com configure_hedging. Os nomes medidos são
+# 'appdetails' (documento enxuto dos recomendadores: categories,genres,basic),
+# 'store_appdetails' (documento de SteamService, com todos os filtros) e 'steamspy'.
+DEFAULT_HEDGE_POLICIES: Dict[str, HedgePolicy] = {}
+
+def _percentile(samples: List[float], q: float) -> float:
+    """Percentil `q` (0 a 1) de uma lista ordenada e não vazia."""
+    return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+class _EndpointLatency:
+    """Janela de latências recentes e contadores de hedging de um endpoint."""
+
+    __slots__ = ('samples', 'hedged', 'hedge_wins', 'hedges_skipped')
+
+    def __init__(self, window: int):
+        self.samples: deque = deque(maxlen=window)
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.hedges_skipped = 0
+
+class LatencyTracker:
+    """
+    Latências recentes por endpoint, compartilhadas pelos transportes síncrono e assíncrono.
+
+    Guarda as últimas `window` medições de cada endpoint, então o limite de
+    hedging acompanha mudanças de comportamento do upstream.
+    """
+
+    def __init__(self, window: int = 200):
+        self.window = window
+        self._endpoints: Dict[str, _EndpointLatency] = {}
+        self._lock = threading.Lock()
+
+    def _endpoint(self, endpoint: str) -> _EndpointLatency:
+        """Retorna a janela do endpoint, criando-a na primeira utilização (chamado com o lock)."""
+        entry = self._endpoints.get(endpoint)
+        if entry is None:
+            entry = self._endpoints[endpoint] = _EndpointLatency(self.window)
+        return entry
+
+    def record(self, endpoint: str, seconds: float) -> None:
+        """Registra a latência de uma requisição."""
+        with self._lock:
+            self._endpoint(endpoint).samples.append(seconds)
+
+    def percentile(self, endpoint: str, q: float, min_samples: int = 1) -> Optional[float]:
+        """
+        Retorna o percentil `q` (0 a 1) das latências recentes do endpoint.
+
+        Returns:
+            float: Latência em segundos, ou None se houver menos de `min_samples` medições
+        """
+        with self._lock:
+            entry = self._endpoints.get(endpoint)
+            if entry is None or len(entry.samples) < max(min_samples, 1):
+                return None
+            samples = sorted(entry.samples)
+        return _percentile(samples, q)
+
+    def record_hedge(self, endpoint: str, won: bool) -> None:
+        """Registra uma cópia disparada e se ela respondeu primeiro."""
+        with self._lock:
+            entry = self._endpoint(endpoint)
+            entry.hedged += 1
+            if won:
+                entry.hedge_wins += 1
+
+    def record_hedge_skipped(self, endpoint: str) -> None:
+        """Registra uma cópia não disparada por falta de orçamento (limite de taxa ou circuito)."""
+        with self._lock:
+            self._endpoint(endpoint).hedges_skipped += 1
+
+    def stats(self) -> Dict[str, Dict]:
+        """Retorna p50/p95/p99 e os contadores de hedging de cada endpoint."""
+        with self._lock:
+            endpoints = {
+                name: (sorted(entry.samples), entry.hedged, entry.hedge_wins, entry.hedges_skipped)
+                for name, entry in self._endpoints.items()
+            }
+        return {
+            name: {
+                'samples': len(samples),
+                **{
+                    label: round(_percentile(samples, q), 3) if samples else None
+                    for label, q in (('p50', 0.5), ('p95', 0.95), ('p99', 0.99))
+                },
+                'hedged': hedged,
+                'hedge_wins': wins,
+                'hedges_skipped': skipped
+            }
+            for name, (samples, hedged, wins, skipped) in endpoints.items()
+        }
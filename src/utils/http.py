@@ -0,0 +1,229 @@
+import os
+import time
+import threading
+import concurrent.futures
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from steam_web_api import Steam
+from utils.rate_limit import RateLimiter
+from utils.circuit_breaker import CircuitBreakerRegistry, is_failure
+from utils.hedging import DEFAULT_HEDGE_POLICIES, HedgePolicy, LatencyTracker
+
+STEAM_API_HOST = "api.steampowered.com"
+STEAM_STORE_HOST = "store.steampowered.com"
+STEAMSPY_HOST = "steamspy.com"
+
+KNOWN_HOSTS = (STEAM_API_HOST, STEAM_STORE_HOST, STEAMSPY_HOST)
+
+class TransportRegistry:
+    """
+    Registro de transporte HTTP compartilhado pelo processo.
+
+    Mantém uma `requests.Session` com keep-alive por host, com pool de conexões
+    dimensionado para o número de threads em uso, e um único cliente `Steam`.
+    Toda requisição passa pelo disjuntor e pelo limitador de taxa do host;
+    respostas 429 são repetidas após o tempo indicado em `Retry-After`.
+
+    A latência de cada endpoint é medida; nos endpoints com política de
+    hedging, uma requisição que passa do percentil configurado ganha uma cópia
+    (se houver orçamento livre no limitador) e vale a primeira resposta.
+
+    Attributes:
+        pool_size (int): Número máximo de conexões mantidas por host
+        rate_limiter (RateLimiter): Limitador de taxa por host
+        breakers (CircuitBreakerRegistry): Disjuntores por host
+        latency (LatencyTracker): Latências recentes por endpoint
+        hedge_policies (Dict[str, HedgePolicy]): Políticas de hedging por endpoint
+        max_throttle_retries (int): Tentativas extras após respostas 429
+    """
+
+    def __init__(self, pool_size: int = 20, rate_limiter: RateLimiter = None, max_throttle_retries: int = 3,
+                 breakers: CircuitBreakerRegistry = None, hedge_policies: Dict[str, HedgePolicy] = None):
+        """
+        Inicializa o registro.
+
+        Args:
+            pool_size: Tamanho inicial do pool de conexões por host
+            rate_limiter: Limitador de taxa (padrão: orçamentos de DEFAULT_BUDGETS)
+            max_throttle_retries: Tentativas extras após respostas 429
+            breakers: Disjuntores por host (padrão: configuração de DEFAULT_BREAKER_SETTINGS)
+            hedge_policies: Políticas de hedging por endpoint (padrão: DEFAULT_HEDGE_POLICIES)
+        """
+        self.pool_size = pool_size
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.breakers = breakers or CircuitBreakerRegistry()
+        self.latency = LatencyTracker()
+        self.hedge_policies: Dict[str, HedgePolicy] = dict(
+            DEFAULT_HEDGE_POLICIES if hedge_policies is None else hedge_policies
+        )
+        self.max_throttle_retries = max_throttle_retries
+        self._sessions: Dict[str, requests.Session] = {}
+        self._hedge_executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._steam: Optional[Steam] = None
+        self._lock = threading.Lock()
+
+    def _create_session(self) -> requests.Session:
+        """Cria uma sessão com pool de conexões do tamanho configurado (com folga para as cópias de hedging)."""
+        session = requests.Session()
+        pool_maxsize = self.pool_size * 2 if self.hedge_policies else self.pool_size
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def session(self, host: str) -> requests.Session:
+        """Retorna a sessão do host, criando-a na primeira utilização."""
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = self._create_session()
+                self._sessions[host] = session
+            return session
+
+    def ensure_pool_size(self, pool_size: int) -> None:
+        """
+        Garante que os pools comportem ao menos `pool_size` conexões simultâneas.
+
+        Sessões existentes com pool menor são recriadas; as antigas continuam
+        válidas para requisições em andamento.
+
+        Args:
+            pool_size: Número de threads que usarão o transporte
+        """
+        with self._lock:
+            if pool_size <= self.pool_size:
+                return
+            self.pool_size = pool_size
+            self._sessions = {host: self._create_session() for host in self._sessions}
+            if self._hedge_executor is not None:
+                # As requisições em andamento no executor antigo terminam normalmente
+                self._hedge_executor.shutdown(wait=False)
+                self._hedge_executor = None
+
+    def configure_hedging(self, endpoint: str, policy: Optional[HedgePolicy]) -> None:
+        """Define a política de hedging de um endpoint (None desativa)."""
+        if policy is None:
+            self.hedge_policies.pop(endpoint, None)
+        else:
+            self.hedge_policies[endpoint] = policy
+
+    def hedge_executor(self) -> concurrent.futures.ThreadPoolExecutor:
+        """Retorna o pool que executa as requisições com hedging (original e cópia)."""
+        with self._lock:
+            if self._hedge_executor is None:
+                self._hedge_executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.pool_size * 2, thread_name_prefix="hedge"
+                )
+            return self._hedge_executor
+
+    def get(self, url: str, params: Dict = None, timeout: float = 10, endpoint: str = None,
+            **kwargs) -> requests.Response:
+        """
+        Executa um GET usando a sessão do host da URL, respeitando o limite de taxa.
+
+        Args:
+            url: URL da requisição
+            params: Parâmetros da query string
+            timeout: Timeout da requisição em segundos
+            endpoint: Nome do endpoint para a latência e o hedging (ex.: 'appdetails';
+                padrão: host e caminho da URL)
+
+        Returns:
+            requests.Response: Última resposta recebida (pode ser 429 se as
+            tentativas extras se esgotarem)
+
+        Raises:
+            CircuitOpenError: Se o circuito do host está aberto (sem acessar a rede)
+        """
+        parsed = urlparse(url)
+        host = parsed.hostname
+        endpoint = endpoint or f"{host}{parsed.path}"
+        policy = self.hedge_policies.get(endpoint)
+        request = (url, params, timeout, kwargs)
+
+        for _ in range(self.max_throttle_retries + 1):
+            self.rate_limiter.acquire(host)
+            threshold = policy and self.latency.percentile(endpoint, policy.percentile, policy.min_samples)
+            if threshold:
+                response = self._hedged(host, endpoint, request, max(threshold, policy.min_delay))
+            else:
+                response = self._attempt(host, endpoint, request)
+            if response.status_code != 429:
+                break
+        return response
+
+    def _attempt(self, host: str, endpoint: str, request: tuple) -> requests.Response:
+        """Uma requisição (com o token do limitador já tomado), registrada no disjuntor e na latência."""
+        url, params, timeout, kwargs = request
+        breaker = self.breakers.breaker(host)
+        probe = breaker.before_request()
+        start = time.monotonic()
+        try:
+            response = self.session(host).get(url, params=params, timeout=timeout, **kwargs)
+        except Exception:
+            breaker.record_failure()
+            raise
+        except BaseException:
+            # Interrompida sem resultado: não prende a sondagem do circuito meio aberto
+            if probe:
+                breaker.release_probe()
+            raise
+        if is_failure(response.status_code):
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+            if response.status_code != 429:
+                self.latency.record(endpoint, time.monotonic() - start)
+        self.rate_limiter.record(host, response.status_code, response.headers.get('Retry-After'))
+        return response
+
+    def _hedged(self, host: str, endpoint: str, request: tuple, threshold: float) -> requests.Response:
+        """
+        Executa a requisição no pool de hedging e dispara uma cópia se ela passar de `threshold`.
+
+        A primeira resposta vale; a outra termina em segundo plano (requests
+        não permite cancelar) e só alimenta as medições de latência.
+        """
+        executor = self.hedge_executor()
+        primary = executor.submit(self._attempt, host, endpoint, request)
+        done, _ = concurrent.futures.wait([primary], timeout=threshold)
+        if done:
+            return primary.result()
+
+        if self.breakers.is_open(host) or not self.rate_limiter.try_acquire(host):
+            self.latency.record_hedge_skipped(endpoint)
+            return primary.result()
+
+        hedge = executor.submit(self._attempt, host, endpoint, request)
+        for future in concurrent.futures.as_completed([primary, hedge]):
+            if future.exception() is None:
+                self.latency.record_hedge(endpoint, won=future is hedge)
+                return future.result()
+        self.latency.record_hedge(endpoint, won=False)
+        return primary.result()
+
+    def steam_client(self, api_key: str = None) -> Steam:
+        """Retorna o cliente Steam compartilhado, criando-o na primeira utilização."""
+        with self._lock:
+            if self._steam is None:
+                self._steam = Steam(api_key or os.environ.get("STEAM_API_KEY"))
+            return self._steam
+
+    def close(self) -> None:
+        """Fecha todas as sessões abertas."""
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+            if self._hedge_executor is not None:
+                self._hedge_executor.shutdown(wait=False)
+                self._hedge_executor = None
+
+_transport = TransportRegistry()
+
+def get_transport() -> TransportRegistry:
+    """Retorna o registro de transporte compartilhado pelo processo."""
+    return _transport
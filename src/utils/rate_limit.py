@@ -0,0 +1,214 @@
+import time
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+
+# Orçamento padrão por host: (requisições por segundo, rajada máxima)
+DEFAULT_BUDGETS: Dict[str, Tuple[float, int]] = {
+    'api.steampowered.com': (10.0, 20),
+    'store.steampowered.com': (200 / 300, 10),
+    'steamspy.com': (1.0, 1),
+}
+
+class TokenBucket:
+    """
+    Token bucket com ajuste adaptativo (AIMD) da taxa.
+
+    Cada 429 reduz a taxa pela metade e bloqueia o host pelo tempo indicado
+    em `Retry-After`; cada sucesso recupera a taxa aos poucos até o valor base.
+
+    Attributes:
+        base_rate (float): Taxa nominal em requisições por segundo
+        rate (float): Taxa atual, ajustada conforme o upstream responde
+        capacity (int): Número máximo de requisições em rajada
+    """
+
+    def __init__(self, rate: float, capacity: int, min_rate: float = None):
+        self.base_rate = rate
+        self.rate = rate
+        self.min_rate = min_rate or rate / 16
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self._last_refill = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+        self.requests = 0
+        self.throttled = 0
+        self.total_wait = 0.0
+
+    def _refill(self, now: float) -> None:
+        """Repõe os tokens proporcionalmente ao tempo decorrido."""
+        elapsed = now - self._last_refill
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self._last_refill = now
+
+    def acquire(self) -> float:
+        """
+        Reserva um token, bloqueando a thread até que ele esteja disponível.
+
+        Returns:
+            float: Tempo de espera em segundos
+        """
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def reserve(self) -> float:
+        """
+        Reserva um token sem bloquear.
+
+        O chamador deve aguardar o tempo retornado antes de fazer a requisição
+        (com `time.sleep` ou `asyncio.sleep`).
+
+        Returns:
+            float: Tempo de espera em segundos
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            wait = max(wait, self._blocked_until - now)
+            self.requests += 1
+            self.total_wait += wait
+        return wait
+
+    def try_acquire(self) -> bool:
+        """
+        Toma um token apenas se houver um livre agora, sem contrair espera.
+
+        Usado para requisições opcionais (como cópias de hedging), que não
+        devem atrasar as demais nem estourar o orçamento.
+
+        Returns:
+            bool: True se o token foi tomado
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if self.tokens < 1 or now < self._blocked_until:
+                return False
+            self.tokens -= 1
+            self.requests += 1
+            return True
+
+    def on_success(self) -> None:
+        """Recupera a taxa de forma aditiva após uma resposta bem-sucedida."""
+        with self._lock:
+            if self.rate < self.base_rate:
+                self.rate = min(self.base_rate, self.rate + self.base_rate * 0.05)
+
+    def on_throttle(self, retry_after: Optional[float] = None) -> None:
+        """
+        Registra um 429: reduz a taxa pela metade e bloqueia o host.
+
+        Args:
+            retry_after: Segundos indicados pelo upstream (padrão: 1 / taxa atual)
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.rate = max(self.min_rate, self.rate / 2)
+            delay = retry_after if retry_after is not None else 1 / self.rate
+            self._blocked_until = max(self._blocked_until, now + delay)
+            self.tokens = min(self.tokens, 0.0)
+            self.throttled += 1
+
+    def stats(self) -> Dict:
+        """Retorna as estatísticas do bucket."""
+        with self._lock:
+            return {
+                'rate': round(self.rate, 3),
+                'base_rate': round(self.base_rate, 3),
+                'requests': self.requests,
+                'throttled': self.throttled,
+                'total_wait': round(self.total_wait, 2)
+            }
+
+class RateLimiter:
+    """
+    Limitador de taxa por host, compartilhado por todo o transporte HTTP.
+
+    Hosts sem orçamento configurado não são limitados.
+    """
+
+    def __init__(self, budgets: Dict[str, Tuple[float, int]] = None):
+        """
+        Args:
+            budgets: Mapeamento host -> (requisições por segundo, rajada máxima)
+        """
+        self._buckets: Dict[str, TokenBucket] = {
+            host: TokenBucket(rate, capacity)
+            for host, (rate, capacity) in {**DEFAULT_BUDGETS, **(budgets or {})}.items()
+        }
+        self._lock = threading.Lock()
+
+    def configure(self, host: str, rate: float, capacity: int) -> None:
+        """Define (ou substitui) o orçamento de um host."""
+        with self._lock:
+            self._buckets[host] = TokenBucket(rate, capacity)
+
+    def bucket(self, host: str) -> Optional[TokenBucket]:
+        """Retorna o bucket do host, se houver."""
+        with self._lock:
+            return self._buckets.get(host)
+
+    def acquire(self, host: str) -> float:
+        """Aguarda a vez do host; retorna o tempo esperado em segundos."""
+        bucket = self.bucket(host)
+        return bucket.acquire() if bucket else 0.0
+
+    def reserve(self, host: str) -> float:
+        """Reserva a vez do host sem bloquear; retorna o tempo a aguardar em segundos."""
+        bucket = self.bucket(host)
+        return bucket.reserve() if bucket else 0.0
+
+    def try_acquire(self, host: str) -> bool:
+        """Toma a vez do host apenas se houver orçamento livre agora."""
+        bucket = self.bucket(host)
+        return bucket.try_acquire() if bucket else True
+
+    def record(self, host: str, status_code: int, retry_after: Optional[str] = None) -> None:
+        """
+        Informa ao limitador o resultado de uma requisição.
+
+        Args:
+            host: Host da requisição
+            status_code: Status HTTP recebido
+            retry_after: Valor bruto do cabeçalho Retry-After (opcional)
+        """
+        bucket = self.bucket(host)
+        if not bucket:
+            return
+        if status_code == 429:
+            bucket.on_throttle(parse_retry_after(retry_after))
+        elif status_code < 400:
+            bucket.on_success()
+
+    def stats(self) -> Dict[str, Dict]:
+        """Retorna as estatísticas de todos os hosts."""
+        with self._lock:
+            buckets = dict(self._buckets)
+        return {host: bucket.stats() for host, bucket in buckets.items()}
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Converte o cabeçalho Retry-After (segundos ou data HTTP) em segundos.
+
+    Returns:
+        float: Segundos a aguardar, ou None se ausente ou inválido
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,205 @@
+import time
+import heapq
+import queue
+import random
+import itertools
+import threading
+import concurrent.futures
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple, Type
+
+from utils.circuit_breaker import CircuitOpenError
+
+@dataclass
+class RetryPolicy:
+    """
+    Política de novas tentativas de um endpoint.
+
+    O atraso cresce exponencialmente a cada tentativa, limitado a `max_delay`;
+    com jitter, metade do atraso é sorteada para espalhar as novas tentativas
+    de uma rajada de falhas.
+
+    Attributes:
+        max_attempts: Número total de tentativas (incluindo a primeira)
+        base_delay: Atraso antes da segunda tentativa, em segundos
+        multiplier: Fator de crescimento do atraso a cada tentativa
+        max_delay: Atraso máximo, em segundos
+        jitter: Sorteia metade do atraso
+        retry_on: Exceções que justificam nova tentativa
+        give_up_on: Exceções que nunca são repetidas (por padrão, circuito aberto:
+            o host está fora e repetir só atrasaria o modo degradado)
+    """
+    max_attempts: int = 3
+    base_delay: float = 2.0
+    multiplier: float = 2.0
+    max_delay: float = 30.0
+    jitter: bool = True
+    retry_on: Tuple[Type[BaseException], ...] = (Exception,)
+    give_up_on: Tuple[Type[BaseException], ...] = (CircuitOpenError,)
+
+    def should_retry(self, attempt: int, error: BaseException) -> bool:
+        """Indica se a tentativa `attempt` (a partir de 1) que falhou com `error` deve ser repetida."""
+        return (attempt < self.max_attempts and isinstance(error, self.retry_on)
+                and not isinstance(error, self.give_up_on))
+
+    def delay(self, attempt: int) -> float:
+        """Atraso, em segundos, antes da tentativa seguinte à tentativa `attempt`."""
+        delay = min(self.max_delay, self.base_delay * self.multiplier ** (attempt - 1))
+        if self.jitter:
+            delay = delay / 2 + random.uniform(0, delay / 2)
+        return delay
+
+# Política padrão por endpoint
+DEFAULT_RETRY_POLICIES: Dict[str, RetryPolicy] = {
+    'appdetails': RetryPolicy(max_attempts=3, base_delay=2.0),
+    'steamspy': RetryPolicy(max_attempts=3, base_delay=2.0),
+    'default': RetryPolicy(max_attempts=3, base_delay=1.0),
+}
+
+_retry_policies: Dict[str, RetryPolicy] = dict(DEFAULT_RETRY_POLICIES)
+
+def retry_policy(endpoint: str) -> RetryPolicy:
+    """Retorna a política do endpoint (ou a padrão, se não houver uma específica)."""
+    return _retry_policies.get(endpoint, _retry_policies['default'])
+
+def configure_retry_policy(endpoint: str, policy: RetryPolicy) -> None:
+    """Define (ou substitui) a política de um endpoint."""
+    _retry_policies[endpoint] = policy
+
+class RetryScheduler:
+    """
+    Fila de atraso para novas tentativas, atendida por uma única thread.
+
+    Em vez de uma thread do pool dormir até a próxima tentativa, o trabalho
+    que falhou é agendado aqui e devolvido à fila de quem o executa quando o
+    atraso vence. As threads do pool ficam livres para o trabalho saudável.
+
+    Os callbacks rodam na thread do agendador e devem ser rápidos (tipicamente,
+    apenas recolocam o item em uma fila).
+
+    Attributes:
+        scheduled (int): Callbacks agendados desde a criação
+        fired (int): Callbacks já executados
+    """
+
+    def __init__(self):
+        self._heap: list = []
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self.scheduled = 0
+        self.fired = 0
+
+    def call_later(self, delay: float, callback: Callable[..., Any], *args) -> None:
+        """Agenda `callback(*args)` para daqui a `delay` segundos."""
+        with self._condition:
+            heapq.heappush(self._heap, (time.monotonic() + delay, next(self._counter), callback, args))
+            self.scheduled += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="retry-scheduler", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def _run(self) -> None:
+        """Executa os callbacks à medida que seus atrasos vencem."""
+        while True:
+            with self._condition:
+                while not self._heap:
+                    self._condition.wait()
+                due = self._heap[0][0]
+                now = time.monotonic()
+                if due > now:
+                    self._condition.wait(due - now)
+                    continue
+                _, _, callback, args = heapq.heappop(self._heap)
+                self.fired += 1
+            try:
+                callback(*args)
+            except Exception as e:
+                print(f"\n⚠️ Aviso: Erro ao reagendar tentativa: {str(e)}")
+
+    @property
+    def pending(self) -> int:
+        """Número de callbacks aguardando o atraso."""
+        with self._condition:
+            return len(self._heap)
+
+    def stats(self) -> Dict:
+        """Retorna os callbacks agendados, executados e pendentes."""
+        with self._condition:
+            return {'scheduled': self.scheduled, 'fired': self.fired, 'pending': len(self._heap)}
+
+_retry_scheduler: Optional[RetryScheduler] = None
+_retry_scheduler_lock = threading.Lock()
+
+def get_retry_scheduler() -> RetryScheduler:
+    """Retorna o agendador de novas tentativas compartilhado pelo processo."""
+    global _retry_scheduler
+    with _retry_scheduler_lock:
+        if _retry_scheduler is None:
+            _retry_scheduler = RetryScheduler()
+        return _retry_scheduler
+
+def retry_as_completed(executor: concurrent.futures.Executor, func: Callable[[Any], Any], items: Iterable[Any],
+                       policy: RetryPolicy = None, max_in_flight: int = None,
+                       scheduler: RetryScheduler = None) -> Iterator[Tuple[Any, concurrent.futures.Future]]:
+    """
+    Executa `func` em cada item no executor, repetindo falhas sem ocupar as threads do pool.
+
+    Tentativas que falham são agendadas no RetryScheduler conforme a política
+    e reenviadas ao executor quando o atraso vence. Itens ainda não enviados
+    só entram quando há vaga, então no máximo `max_in_flight` itens estão em
+    andamento ou aguardando nova tentativa.
+
+    Args:
+        executor: Pool que executa as tentativas
+        func: Função aplicada a cada item (deve levantar exceção para pedir nova tentativa)
+        items: Itens de entrada (pode ser um iterador preguiçoso)
+        policy: Política de novas tentativas (sem política, nenhuma falha é repetida)
+        max_in_flight: Limite de itens em andamento (padrão: sem limite)
+        scheduler: Agendador (padrão: o compartilhado pelo processo)
+
+    Yields:
+        (item, future) com o resultado final de cada item, em ordem de conclusão
+    """
+    scheduler = scheduler or get_retry_scheduler()
+    pending = iter(items)
+    ready: queue.SimpleQueue = queue.SimpleQueue()
+    in_flight: Dict[concurrent.futures.Future, Tuple[Any, int]] = {}
+    waiting = 0
+
+    def submit(item: Any, attempt: int) -> None:
+        in_flight[executor.submit(func, item)] = (item, attempt)
+
+    def refill() -> None:
+        free = max_in_flight - len(in_flight) - waiting if max_in_flight else None
+        for item in itertools.islice(pending, free):
+            submit(item, 1)
+
+    refill()
+    while in_flight or waiting:
+        if not in_flight:
+            item, attempt = ready.get()
+            waiting -= 1
+            submit(item, attempt)
+        while True:
+            try:
+                item, attempt = ready.get_nowait()
+            except queue.Empty:
+                break
+            waiting -= 1
+            submit(item, attempt)
+
+        # Com tentativas agendadas, acorda periodicamente para reenviá-las
+        done, _ = concurrent.futures.wait(
+            in_flight, timeout=0.05 if waiting else None, return_when=concurrent.futures.FIRST_COMPLETED
+        )
+        for future in done:
+            item, attempt = in_flight.pop(future)
+            error = future.exception()
+            if error is not None and policy is not None and policy.should_retry(attempt, error):
+                waiting += 1
+                scheduler.call_later(policy.delay(attempt), ready.put, (item, attempt + 1))
+            else:
+                yield item, future
+        refill()
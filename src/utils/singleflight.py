@@ -0,0 +1,128 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+class _Call:
+    """Chamada em andamento, compartilhada por todos os que pediram a mesma chave."""
+
+    __slots__ = ('done', 'result', 'error', 'waiters')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+class SingleFlight:
+    """
+    Agrupa chamadas concorrentes com a mesma chave em uma única execução.
+
+    A primeira thread a pedir uma chave executa a função; as que chegam
+    enquanto ela está em andamento esperam e recebem o mesmo resultado (ou a
+    mesma exceção). Nada é guardado depois que a chamada termina: o cache de
+    resultados continua sendo responsabilidade de quem chama.
+
+    Attributes:
+        executed (int): Chamadas efetivamente executadas
+        shared (int): Chamadas atendidas pelo resultado de outra em andamento
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.executed = 0
+        self.shared = 0
+
+    def do(self, key: Hashable, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Executa `func(*args, **kwargs)`, ou aguarda a execução em andamento da mesma chave.
+
+        Args:
+            key: Identificador da requisição (ex.: ('appdetails', appid))
+            func: Função a executar
+
+        Returns:
+            O resultado da execução compartilhada
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.shared += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> Dict:
+        """Retorna as chamadas executadas, compartilhadas e em andamento."""
+        with self._lock:
+            return {'executed': self.executed, 'shared': self.shared, 'in_flight': len(self._calls)}
+
+class AsyncSingleFlight:
+    """
+    Equivalente de SingleFlight para corrotinas em um mesmo event loop.
+
+    A primeira corrotina a pedir uma chave executa a chamada; as demais
+    aguardam a mesma tarefa, sem bloquear o loop.
+
+    Attributes:
+        executed (int): Chamadas efetivamente executadas
+        shared (int): Chamadas atendidas pelo resultado de outra em andamento
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        self.executed = 0
+        self.shared = 0
+
+    async def do(self, key: Hashable, func: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """
+        Executa `await func(*args, **kwargs)`, ou aguarda a execução em andamento da mesma chave.
+
+        Args:
+            key: Identificador da requisição (ex.: ('steamspy', appid))
+            func: Função assíncrona a executar
+
+        Returns:
+            O resultado da execução compartilhada
+        """
+        call = self._calls.get(key)
+        if call is not None and call.get_loop() is asyncio.get_running_loop():
+            self.shared += 1
+            return await asyncio.shield(call)
+
+        self.executed += 1
+        call = self._calls[key] = asyncio.ensure_future(func(*args, **kwargs))
+
+        def release(finished: asyncio.Future) -> None:
+            # A chamada segue até o fim mesmo se quem a iniciou for cancelado
+            if self._calls.get(key) is finished:
+                del self._calls[key]
+            if not finished.cancelled():
+                finished.exception()
+
+        call.add_done_callback(release)
+        return await asyncio.shield(call)
+
+    def stats(self) -> Dict:
+        """Retorna as chamadas executadas, compartilhadas e em andamento."""
+        return {'executed': self.executed, 'shared': self.shared, 'in_flight': len(self._calls)}
@@ -1,7 +1,14 @@
 import os
-from typing import Union, Dict, List
-from functools import lru_cache
-from steam_web_api import Steam
+import threading
+import concurrent.futures
+from typing import TYPE_CHECKING, Union, Dict, List, Optional, Callable
+from utils.cache import PersistentCache, MemoryCache, get_persistent_cache, get_memory_cache, memory_cached
+from utils.http import get_transport
+from utils.circuit_breaker import CircuitOpenError
+from utils.singleflight import SingleFlight
+
+if TYPE_CHECKING:
+    from services.compatibility import CompatibilityMatrix
 
 class SteamAPIError(Exception):
     """Exceção personalizada para erros da API do Steam."""
@@ -21,14 +28,39 @@ class SteamService:
     
     Attributes:
         KEY (str): Chave de API do Steam obtida das variáveis de ambiente.
-        steam (Steam): Instância do cliente Steam para comunicação com a API.
+        steam (Steam): Cliente Steam compartilhado pelo processo (usado só na busca de jogos por nome).
+        transport (TransportRegistry): Transporte HTTP das chamadas à Web API e à loja.
+        cache (PersistentCache): Cache em disco das respostas appdetails.
+        memory (MemoryCache): Cache em memória de perfis e jogos, compartilhado entre instâncias.
+        app_cache_hits (int): Acessos a jogos atendidos pelo cache de documentos.
+        app_cache_misses (int): Acessos a jogos que exigiram requisição à loja.
     
     Raises:
         ValueError: Se a STEAM_API_KEY não for encontrada nas variáveis de ambiente.
     """
 
-    def __init__(self):
-        """Inicializa o serviço Steam com a chave da API."""
+    APP_DETAILS_URL = "https://store.steampowered.com/api/appdetails"
+    WEB_API_URL = "https://api.steampowered.com"
+    PLAYER_SUMMARIES_URL = f"{WEB_API_URL}/ISteamUser/GetPlayerSummaries/v2/"
+    # Limite de Steam IDs por chamada de GetPlayerSummaries
+    PLAYER_SUMMARIES_BATCH = 100
+
+    # Filtros appdetails de que cada acessor precisa ('basic' traz nome, tipo,
+    # descrições, idade, gratuidade, idiomas e requisitos)
+    BASIC_FILTERS = "basic"
+    MEDIA_FILTERS = "screenshots,movies"
+    PRICE_FILTERS = "price_overview"
+    ACHIEVEMENT_FILTERS = "achievements"
+    CATEGORY_FILTERS = "basic,categories,genres"
+
+    def __init__(self, cache: Optional[PersistentCache] = None, memory: Optional[MemoryCache] = None):
+        """
+        Inicializa o serviço Steam com a chave da API.
+        
+        Args:
+            cache: Cache persistente a ser usado (padrão: cache compartilhado do processo)
+            memory: Cache em memória a ser usado (padrão: cache compartilhado do processo)
+        """
         self.KEY = os.environ.get("STEAM_API_KEY")
         if not self.KEY:
             print("❌ STEAM_API_KEY não encontrada nas variáveis de ambiente")
@@ -39,7 +71,19 @@ class SteamService:
             "demos,price_overview,metacritic,categories,genres,"
             "screenshots,movies,recommendations,achievements"
         )
-        self.steam = Steam(self.KEY)
+        self.transport = get_transport()
+        self.steam = self.transport.steam_client(self.KEY)
+        self.cache = cache or get_persistent_cache()
+        self.memory = memory or get_memory_cache()
+
+        # Cache de documentos appdetails por jogo, compartilhado pelos acessores
+        self._app_documents: Dict[str, Dict] = {}
+        self._app_documents_lock = threading.Lock()
+        self.app_cache_hits = 0
+        self.app_cache_misses = 0
+
+        # Requisições idênticas simultâneas (mesmo jogo ou usuário) compartilham uma única chamada
+        self._flight = SingleFlight()
 
     @staticmethod
     def _handle_api_error(operation: str):
@@ -65,20 +109,52 @@ class SteamService:
     
     # Métodos relacionados a usuários
 
+    def _web_api(self, path: str, **params) -> Dict:
+        """
+        Chama um método da Web API do Steam pelo transporte compartilhado.
+        
+        Passa pelo pool de conexões, pelo limite de taxa e pelo disjuntor do
+        host, como as demais requisições do serviço.
+        
+        Args:
+            path: Interface, método e versão (ex.: 'IPlayerService/GetBadges/v1/')
+            **params: Parâmetros da chamada (a chave da API é incluída aqui)
+            
+        Raises:
+            SteamAPIError: Se a API responder com status diferente de 200
+        """
+        response = self.transport.get(f"{self.WEB_API_URL}/{path}", params={'key': self.KEY, **params}, timeout=10)
+        if response.status_code != 200:
+            raise SteamAPIError(f"API retornou status {response.status_code}", response.status_code)
+        return response.json()
+
     @_handle_api_error("busca de conquistas")
     def get_user_badges(self, steamid: Union[str, int]) -> List[Dict]:
         """Obtém as conquistas do usuário."""
-        return self.steam.users.get_user_badges(str(steamid))
+        return self._web_api('IPlayerService/GetBadges/v1/', steamid=str(steamid))['response']
     
     @_handle_api_error("busca de jogos recentes")
     def get_recently_played_games(self, steamid: Union[str, int]) -> List[Dict]:
         """Obtém os últimos jogos jogados pelo usuário."""
-        return self.steam.users.get_user_recently_played_games(str(steamid))
+        return self._web_api('IPlayerService/GetRecentlyPlayedGames/v1/', steamid=str(steamid))['response']
     
     @_handle_api_error("busca de lista de amigos")
     def get_friends_list(self, steamid: Union[str, int], enriched: bool = True) -> List[Dict]:
-        """Obtém a lista de amigos do usuário."""
-        return self.steam.users.get_user_friends_list(str(steamid), enriched)
+        """
+        Obtém a lista de amigos do usuário.
+        
+        Com `enriched`, cada amigo traz o resumo do perfil (via get_player_summaries,
+        em lotes e com cache) junto com 'relationship' e 'friend_since'.
+        """
+        friends_list = self._web_api('ISteamUser/GetFriendList/v1/', steamid=str(steamid))['friendslist']
+        if not enriched:
+            return friends_list
+        summaries = self.get_player_summaries([friend['steamid'] for friend in friends_list['friends']])
+        return {'friends': [
+            {**summaries[friend['steamid']], 'relationship': friend['relationship'],
+             'friend_since': friend['friend_since']}
+            for friend in friends_list['friends'] if friend['steamid'] in summaries
+        ]}
     
     @_handle_api_error("busca de nome de usuário")
     def get_username(self, steamid: Union[str, int]) -> str:
@@ -87,7 +163,10 @@ class SteamService:
             print(f"❌ Tipo inválido para steamid: {type(steamid)}")
             raise ValueError("Steam ID deve ser uma string")
             
-        username = self.steam.users.get_username(str(steamid))
+        player = self.get_user_details(steamid).get('player')
+        if not player:
+            raise SteamAPIError(f"Usuário {steamid} não encontrado", 404)
+        username = player['personaname']
         print(f"✅ Nome de usuário encontrado: {username}")
         return username
 
@@ -98,29 +177,103 @@ class SteamService:
             print(f"❌ Tipo inválido para username: {type(username)}")
             raise ValueError("Username deve ser uma string")
             
-        steamid = str(self.steam.users.get_steamid(username)["steamid"])
+        response = self._web_api('ISteamUser/ResolveVanityURL/v1/', vanityurl=username)['response']
+        if response.get('success') != 1:
+            raise SteamAPIError(response.get('message', f"Usuário {username} não encontrado"), 404)
+        steamid = str(response["steamid"])
         print(f"✅ Steam ID encontrado: {steamid}")
         return steamid
     
     @_handle_api_error("busca de detalhes do usuário")
-    @lru_cache(maxsize=100)
     def get_user_details(self, steamid: Union[str, int]) -> Dict:
-        """Obtém detalhes do perfil do usuário com cache."""
-        return self.steam.users.get_user_details(str(steamid))
+        """
+        Obtém detalhes do perfil do usuário, consultando antes o cache em memória.
+        
+        Perfis inexistentes ({'player': None}) não ficam em cache.
+        """
+        details = self.memory.get('user', steamid)
+        if details is None:
+            players = self._flight.do(('user', str(steamid)), self._request_player_summaries, [str(steamid)])
+            details = {'player': players[0] if players else None}
+            if details['player']:
+                self.memory.set('user', steamid, details)
+        return details
+
+    def invalidate_user(self, steamid: Union[str, int]) -> None:
+        """Descarta o perfil do usuário guardado em memória, forçando nova consulta."""
+        self.memory.invalidate('user', steamid)
+
+    @_handle_api_error("busca de resumos de perfis")
+    def get_player_summaries(self, steamids: List[Union[str, int]], max_workers: int = 4) -> Dict[str, Dict]:
+        """
+        Obtém os resumos de perfil de vários usuários em lotes de 100 Steam IDs.
+        
+        Os resumos ficam no cache em memória e atendem chamadas seguintes de
+        get_user_details (de qualquer instância) sem nova requisição.
+        
+        Args:
+            steamids: Steam IDs dos usuários
+            max_workers: Número máximo de lotes buscados em paralelo
+            
+        Returns:
+            Dict: Steam ID -> resumo do perfil (perfis inexistentes ficam de fora)
+        """
+        steamids = list(dict.fromkeys(str(steamid) for steamid in steamids))
+        summaries: Dict[str, Dict] = {}
+        missing = []
+        for steamid in steamids:
+            details = self.memory.get('user', steamid)
+            if details is None or not details.get('player'):
+                missing.append(steamid)
+            else:
+                summaries[steamid] = details['player']
+        batches = [
+            missing[start:start + self.PLAYER_SUMMARIES_BATCH]
+            for start in range(0, len(missing), self.PLAYER_SUMMARIES_BATCH)
+        ]
+        
+        if batches:
+            print(f"👥 Buscando {len(missing)} perfis em {len(batches)} lote(s)...")
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for players in executor.map(self._request_player_summaries, batches):
+                    for player in players:
+                        if not player:
+                            continue
+                        summaries[str(player['steamid'])] = player
+                        self.memory.set('user', player['steamid'], {'player': player})
+        
+        return {steamid: summaries[steamid] for steamid in steamids if steamid in summaries}
+    
+    def _request_player_summaries(self, steamids: List[str]) -> List[Dict]:
+        """Uma chamada de GetPlayerSummaries (até PLAYER_SUMMARIES_BATCH Steam IDs), sem cache."""
+        response = self.transport.get(
+            self.PLAYER_SUMMARIES_URL,
+            params={'key': self.KEY, 'steamids': ','.join(steamids)},
+            timeout=10
+        )
+        if response.status_code != 200:
+            raise SteamAPIError(f"API retornou status {response.status_code}", response.status_code)
+        return response.json().get('response', {}).get('players', [])
+    
+    def _request_owned_games(self, steamid: str, include_appinfo: bool) -> Dict:
+        """Uma chamada de GetOwnedGames (com os jogos gratuitos já jogados), sem cache."""
+        return self._web_api(
+            'IPlayerService/GetOwnedGames/v1/', steamid=steamid,
+            include_appinfo=int(include_appinfo), include_played_free_games=1
+        )['response']
     
     @_handle_api_error("busca de jogos do usuário")
     def get_user_games(self, steamid: Union[str, int], include_details: bool = False) -> List[Dict]:
         """Obtém lista de jogos do usuário."""
         try:
-            games = self.steam.users.get_owned_games(
-                steam_id=str(steamid),
-                include_appinfo=include_details,
-                includ_free_games=True
+            games = self._flight.do(
+                ('owned_games', str(steamid), include_details),
+                self._request_owned_games, str(steamid), include_details
             )
             if include_details:
                 return [
                     {**game, 'details': self.get_game_info(game['appid'])}
-                    for game in games
+                    for game in games.get('games', [])
                 ]
             return games
         except Exception as e:
@@ -128,9 +281,162 @@ class SteamService:
             raise
     
     # Métodos relacionados a jogos
+
+    @staticmethod
+    def _split_filters(filters: str) -> set:
+        """Converte uma lista de filtros separada por vírgulas em conjunto."""
+        return {name.strip() for name in filters.split(',') if name.strip()}
+
+    def _load_app_document(self, key: str) -> Optional[Dict]:
+        """Retorna o documento do jogo em memória ou, se ausente, o do cache persistente."""
+        with self._app_documents_lock:
+            document = self._app_documents.get(key)
+        if document is not None:
+            return document
+
+        document = self.cache.get('appdetails', key)
+        if document is not None:
+            with self._app_documents_lock:
+                document = self._app_documents.setdefault(key, document)
+        return document
+
+    def _get_app_document(self, appid: Union[str, int], filters: str = None) -> Dict:
+        """
+        Obtém o documento appdetails do jogo com, no mínimo, os filtros pedidos.
+        
+        O documento de cada jogo é montado aos poucos: cada acessor pede só os
+        filtros de que precisa e apenas os filtros ainda ausentes são buscados
+        na loja, sendo mesclados ao documento existente. Documentos válidos são
+        gravados no cache persistente, permitindo que execuções seguintes não
+        acessem a rede.
+        
+        Args:
+            appid: ID do jogo
+            filters: Filtros appdetails necessários (padrão: all_filters)
+        
+        Returns:
+            Dict contendo 'success', 'data' e 'filters' (filtros já obtidos)
+        """
+        key = str(appid)
+        needed = self._split_filters(filters or self.all_filters)
+        
+        document = self._load_app_document(key)
+        missing = needed - set(document['filters']) if document is not None else needed
+        with self._app_documents_lock:
+            if not missing:
+                self.app_cache_hits += 1
+                return document
+            self.app_cache_misses += 1
+
+        return self._flight.do(
+            ('appdetails', key, ','.join(sorted(missing))),
+            self._fetch_app_filters, key, missing, document
+        )
+
+    def _fetch_app_filters(self, key: str, missing: set, document: Optional[Dict]) -> Dict:
+        """
+        Busca na loja os filtros ausentes do jogo e os mescla ao documento existente.
+        
+        Com o circuito da loja aberto, devolve a cópia expirada do cache (mesclada
+        ao documento em memória), sem gravá-la; sem cópia alguma, a falha segue.
+        """
+        try:
+            response = self.transport.get(
+                self.APP_DETAILS_URL,
+                params={'appids': key, 'cc': 'US', 'filters': ','.join(sorted(missing))},
+                endpoint='store_appdetails'
+            ).json()
+        except CircuitOpenError:
+            stale = self.cache.get_stale('appdetails', key)
+            if stale is None and document is None:
+                raise
+            stale = stale or {'success': False, 'data': {}, 'filters': []}
+            current = document or {'success': False, 'data': {}, 'filters': []}
+            return {
+                'success': current['success'] or stale['success'],
+                'data': {**stale['data'], **current['data']},
+                'filters': sorted(set(current['filters']) | set(stale['filters']))
+            }
+        fetched = response[key]
+        # A loja devolve uma lista vazia em 'data' quando nenhum campo pedido existe
+        data = fetched.get('data') if isinstance(fetched.get('data'), dict) else {}
+
+        with self._app_documents_lock:
+            current = self._app_documents.get(key) or document or {'success': False, 'data': {}, 'filters': []}
+            merged = {
+                'success': current['success'] or bool(fetched.get('success')),
+                'data': {**current['data'], **data},
+                'filters': sorted(set(current['filters']) | missing)
+            }
+            # Falhas da loja (success False) podem ser transitórias: não ficam guardadas
+            if merged['success']:
+                self._app_documents[key] = merged
+        
+        if merged['success']:
+            self.cache.set('appdetails', key, merged)
+        return merged
+
+    def is_app_cached(self, appid: Union[str, int], filters: str = None) -> bool:
+        """
+        Indica se os filtros pedidos do jogo estão disponíveis sem acessar a rede.
+        
+        Documentos encontrados no cache persistente são carregados na memória.
+        
+        Args:
+            appid: ID do jogo
+            filters: Filtros appdetails necessários (padrão: BASIC_FILTERS)
+        """
+        document = self._load_app_document(str(appid))
+        if document is None:
+            return False
+        return self._split_filters(filters or self.BASIC_FILTERS) <= set(document['filters'])
+
+    def _get_app_data(self, appid: Union[str, int], filters: str = None) -> Dict:
+        """
+        Retorna o bloco 'data' do documento appdetails do jogo com os filtros pedidos.
+        
+        Raises:
+            SteamAPIError: Se a loja não encontrou o jogo (success False)
+        """
+        document = self._get_app_document(appid, filters)
+        if not document['success']:
+            raise SteamAPIError(f"Loja não retornou dados do jogo {appid}", 404)
+        return document['data']
+
+    def get_app_cache_stats(self) -> Dict:
+        """
+        Retorna as estatísticas do cache de documentos de jogos.
+        
+        Returns:
+            Dict contendo acertos, falhas, quantidade de jogos em cache e
+            requisições compartilhadas entre chamadas simultâneas
+        """
+        with self._app_documents_lock:
+            return {
+                'hits': self.app_cache_hits,
+                'misses': self.app_cache_misses,
+                'size': len(self._app_documents),
+                'coalesced': self._flight.shared
+            }
+
+    def clear_app_cache(self) -> None:
+        """Descarta os documentos de jogos armazenados e zera os contadores."""
+        with self._app_documents_lock:
+            self._app_documents.clear()
+            self.app_cache_hits = 0
+            self.app_cache_misses = 0
+        self.memory.invalidate('game_info')
+    
+    def invalidate_app(self, appid: Union[str, int]) -> None:
+        """Descarta o jogo de todos os caches (memória e disco), forçando nova consulta à loja."""
+        key = str(appid)
+        with self._app_documents_lock:
+            self._app_documents.pop(key, None)
+        self.memory.invalidate('game_info', key)
+        self.cache.delete('appdetails', key)
     
     @_handle_api_error("busca de informações do jogo")
-    @lru_cache(maxsize=500)
+    @memory_cached('game_info')
     def get_game_info(self, appid: Union[str, int]) -> Dict:
         """
         Obtém informações básicas de um jogo.
@@ -138,8 +444,7 @@ class SteamService:
         Returns:
             Dict contendo: nome, descrição, tipo, idade requerida, gratuito
         """
-        response = self.steam.apps.get_app_details(str(appid), filters=self.all_filters)
-        game_data = response[str(appid)]['data']
+        game_data = self._get_app_data(appid, self.BASIC_FILTERS)
         
         return {
             'name': game_data.get('name'),
@@ -157,8 +462,7 @@ class SteamService:
         Returns:
             Dict contendo detalhes das conquistas disponíveis
         """
-        response = self.steam.apps.get_app_details(str(appid), filters=self.all_filters)
-        return response[str(appid)]['data'].get('achievements', {})
+        return self._get_app_data(appid, self.ACHIEVEMENT_FILTERS).get('achievements', {})
     
     @_handle_api_error("busca de requisitos")
     def get_game_requirements(self, appid: Union[str, int]) -> Dict:
@@ -168,8 +472,7 @@ class SteamService:
         Returns:
             Dict contendo requisitos para PC, Mac e Linux
         """
-        response = self.steam.apps.get_app_details(str(appid), filters=self.all_filters)
-        game_data = response[str(appid)]['data']
+        game_data = self._get_app_data(appid, self.BASIC_FILTERS)
         
         return {
             'pc': game_data.get('pc_requirements', {}),
@@ -185,8 +488,7 @@ class SteamService:
         Returns:
             Dict contendo screenshots e vídeos disponíveis
         """
-        response = self.steam.apps.get_app_details(str(appid), filters=self.all_filters)
-        game_data = response[str(appid)]['data']
+        game_data = self._get_app_data(appid, self.MEDIA_FILTERS)
         
         return {
             'screenshots': game_data.get('screenshots', []),
@@ -201,8 +503,7 @@ class SteamService:
         Returns:
             Dict contendo preço atual, inicial e desconto
         """
-        response = self.steam.apps.get_app_details(str(appid), filters=self.all_filters)
-        price_data = response[str(appid)]['data']['price_overview']
+        price_data = self._get_app_data(appid, self.PRICE_FILTERS)['price_overview']
         
         return {
             'currency': price_data.get('currency'),
@@ -221,11 +522,11 @@ class SteamService:
             Dict contendo todas as informações disponíveis do jogo
         """
         
-        response = self.steam.apps.get_app_details(str(appid), filters=self.all_filters)
-        if not response[str(appid)].get('success'):
+        document = self._get_app_document(appid)
+        if not document.get('success'):
             raise ValueError(f"Não foi possível obter detalhes do jogo {appid}")
             
-        return response[str(appid)]['data']
+        return document['data']
     
     @_handle_api_error("busca de categorias e gêneros")
     def get_game_categories(self, appid: Union[str, int]) -> Dict:
@@ -235,8 +536,7 @@ class SteamService:
         Returns:
             Dict contendo categorias e gêneros do jogo
         """
-        response = self.steam.apps.get_app_details(str(appid), filters=self.all_filters )
-        game_data = response[str(appid)]['data']
+        game_data = self._get_app_data(appid, self.CATEGORY_FILTERS)
         
         return {
             'categories': game_data.get('categories', []),
@@ -245,25 +545,37 @@ class SteamService:
         }
 
     # Métodos de descoberta e comparação
-    def get_games_in_common(self, steamid1: Union[str, int], steamid2: Union[str, int]) -> List[Dict]:
-        """Obtém jogos em comum entre dois usuários com detalhes completos."""
+    def get_games_in_common(self, steamid1: Union[str, int], steamid2: Union[str, int],
+                            include_details: bool = False, max_workers: int = 10,
+                            progress: Callable[[int, int], None] = None) -> List[Dict]:
+        """
+        Obtém jogos em comum entre dois usuários.
+        
+        Args:
+            steamid1: Steam ID do primeiro usuário
+            steamid2: Steam ID do segundo usuário
+            include_details: Se True, busca na loja os detalhes de todos os jogos ainda fora do cache
+            max_workers: Número máximo de threads para a busca de detalhes
+            progress: Função chamada com (processados, total) a cada jogo concluído (opcional)
+        """
         print("\n🔄 Iniciando busca de jogos em comum...")
         print("=" * 50)
         
-        # Buscando jogos dos usuários
-        print(f"📚 Buscando biblioteca do usuário 1 (ID: {steamid1})")
-        user1_games = self.get_user_games(steamid1)
-        print(f"✅ Encontrados {user1_games['game_count']} jogos para usuário 1")
-        
-        print(f"📚 Buscando biblioteca do usuário 2 (ID: {steamid2})")
-        user2_games = self.get_user_games(steamid2)
-        print(f"✅ Encontrados {user2_games['game_count']} jogos para usuário 2")
+        # Buscando as duas bibliotecas em paralelo, já com os nomes dos jogos
+        print(f"📚 Buscando bibliotecas dos usuários {steamid1} e {steamid2}")
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            future1 = executor.submit(self._fetch_library, str(steamid1))
+            future2 = executor.submit(self._fetch_library, str(steamid2))
+            try:
+                games1, games2 = future1.result(), future2.result()
+            except Exception as e:
+                print(f"❌ Erro ao buscar jogos: {e}")
+                raise
+        print(f"✅ Encontrados {len(games1)} jogos para usuário 1")
+        print(f"✅ Encontrados {len(games2)} jogos para usuário 2")
         
         # Processando dados
         print("\n🔄 Processando bibliotecas...")
-        games1 = user1_games.get('games', []) if isinstance(user1_games, dict) else user1_games
-        games2 = user2_games.get('games', []) if isinstance(user2_games, dict) else user2_games
-        
         games1_dict = {game['appid']: game for game in games1}
         games2_dict = {game['appid']: game for game in games2}
 
@@ -271,26 +583,58 @@ class SteamService:
         print(f"🎯 Encontrados {len(common_app_ids)} jogos em comum!")
         
         # Coletando detalhes dos jogos em comum
-        return self._process_common_games(common_app_ids, games1_dict, games2_dict)
+        return self._process_common_games(
+            common_app_ids, games1_dict, games2_dict,
+            include_details=include_details, max_workers=max_workers, progress=progress
+        )
 
-    def _process_common_games(self, common_app_ids: set, games1_dict: Dict, games2_dict: Dict) -> List[Dict]:
-        """Processa os jogos em comum e coleta seus detalhes."""
+    def _process_common_games(self, common_app_ids: set, games1_dict: Dict, games2_dict: Dict,
+                              include_details: bool = False, max_workers: int = 10,
+                              progress: Callable[[int, int], None] = None) -> List[Dict]:
+        """
+        Processa os jogos em comum e coleta seus detalhes em paralelo.
+        
+        Jogos com documento em cache usam os detalhes completos sem requisição.
+        Os demais só são buscados na loja quando `include_details` é True ou
+        quando a biblioteca não informou o nome do jogo.
+        """
         print("\n📊 Coletando detalhes dos jogos em comum...")
-        common_games = []
         total_games = len(common_app_ids)
+        progress = progress or (
+            lambda done, total: print(f"\r⏳ Progresso: {done / total * 100:.1f}% ({done}/{total} jogos)", end="")
+        )
         
-        for idx, appid in enumerate(common_app_ids, 1):
-            progress = (idx / total_games) * 100
-            print(f"\r⏳ Progresso: {progress:.1f}% ({idx}/{total_games} jogos)", end="")
-            
+        def known_name(appid) -> Optional[str]:
+            return games1_dict[appid].get('name') or games2_dict[appid].get('name')
+        
+        cached = {appid: self.is_app_cached(appid) for appid in common_app_ids}
+        
+        def process(appid) -> Dict:
+            name = known_name(appid)
+            if not (cached[appid] or include_details or not name):
+                return self._create_basic_game_info(appid, games1_dict, games2_dict, name)
             try:
-                game_details = self.get_game_info(appid)
-                game_info = self._create_game_info(appid, game_details, games1_dict, games2_dict)
-                common_games.append(game_info)
+                return self._create_game_info(
+                    appid, self._get_app_data(appid, self.BASIC_FILTERS), games1_dict, games2_dict
+                )
             except Exception as e:
                 print(f"\n⚠️ Aviso: Erro ao processar jogo {appid}: {str(e)}")
-                game_info = self._create_basic_game_info(appid, games1_dict, games2_dict)
-                common_games.append(game_info)
+                return self._create_basic_game_info(appid, games1_dict, games2_dict, name)
+        
+        to_fetch = [
+            appid for appid in common_app_ids
+            if (include_details or not known_name(appid)) and not cached[appid]
+        ]
+        if to_fetch:
+            print(f"🌐 {len(to_fetch)} de {total_games} jogos serão buscados na loja")
+            self.transport.ensure_pool_size(max_workers)
+        
+        common_games = []
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(process, appid) for appid in common_app_ids]
+            for idx, future in enumerate(concurrent.futures.as_completed(futures), 1):
+                common_games.append(future.result())
+                progress(idx, total_games)
         
         print("\n✨ Ordenando resultados por tempo de jogo...")
         common_games.sort(key=lambda x: x['total_playtime_hours'], reverse=True)
@@ -298,7 +642,8 @@ class SteamService:
         print("✅ Processamento concluído com sucesso!")
         return common_games
 
-    def print_common_games(self, steamid1: Union[str, int], steamid2: Union[str, int], num_games: int = 10):
+    def print_common_games(self, steamid1: Union[str, int], steamid2: Union[str, int], num_games: int = 10,
+                           max_workers: int = 10):
         """Imprime uma lista formatada dos jogos em comum entre dois usuários."""
         print(f"\n📊 Preparando análise dos top {num_games} jogos...")
         print("\n" + "="*50)
@@ -320,7 +665,7 @@ class SteamService:
         # Buscando jogos
         print("\n🎲 INICIANDO ANÁLISE DE BIBLIOTECAS")
         print("⏳ Isso pode levar alguns minutos...")
-        common_games = self.get_games_in_common(steamid1, steamid2)
+        common_games = self.get_games_in_common(steamid1, steamid2, max_workers=max_workers)
         
         # Estatísticas gerais
         total_games = len(common_games)
@@ -396,13 +741,112 @@ class SteamService:
         print("\n✅ ANÁLISE CONCLUÍDA COM SUCESSO! ✅")
         print("="*50)
 
+    def _fetch_library(self, steamid: str) -> List[Dict]:
+        """
+        Busca a biblioteca de um usuário, com os nomes dos jogos.
+        
+        Raises:
+            SteamAPIError: Se o perfil for privado (GetOwnedGames responde sem a contagem de jogos)
+        """
+        library = self._flight.do(('owned_games', steamid, True), self._request_owned_games, steamid, True)
+        if not isinstance(library, dict):
+            return library
+        if 'game_count' not in library:
+            raise SteamAPIError("Biblioteca privada ou indisponível", 403)
+        return library.get('games', [])
+
+    def get_libraries(self, steamids: List[Union[str, int]], max_workers: int = 10) -> Dict[str, List[Dict]]:
+        """
+        Busca as bibliotecas (com nomes dos jogos) de vários usuários em paralelo.
+        
+        Usuários com perfil privado ou erro na busca ficam fora do resultado
+        (indisponíveis), em vez de aparecerem com uma biblioteca vazia.
+        
+        Args:
+            steamids: Steam IDs dos usuários
+            max_workers: Número máximo de threads
+            
+        Returns:
+            Dict: Steam ID -> lista de jogos, só dos usuários cuja biblioteca foi obtida
+        """
+        steamids = [str(steamid) for steamid in steamids]
+        libraries: Dict[str, List[Dict]] = {}
+        self.transport.ensure_pool_size(max_workers)
+        
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(self._fetch_library, steamid): steamid for steamid in steamids}
+            for idx, future in enumerate(concurrent.futures.as_completed(futures), 1):
+                steamid = futures[future]
+                try:
+                    libraries[steamid] = future.result() or []
+                except Exception as e:
+                    print(f"\n⚠️ Aviso: Erro ao buscar biblioteca de {steamid}: {str(e)}")
+                print(f"\r⏳ Bibliotecas: {idx}/{len(steamids)} usuários", end="")
+        
+        print()
+        return {steamid: libraries[steamid] for steamid in steamids if steamid in libraries}
+
+    def get_compatibility_matrix(self, steamids: List[Union[str, int]], libraries: Dict[str, List[Dict]] = None,
+                                 max_workers: int = 10) -> 'CompatibilityMatrix':
+        """
+        Calcula jogos em comum e horas compartilhadas de todos os pares de um grupo.
+        
+        Args:
+            steamids: Steam IDs dos usuários do grupo
+            libraries: Bibliotecas já carregadas (Steam ID -> jogos), reaproveitadas sem nova busca
+            max_workers: Número máximo de threads para buscar as bibliotecas restantes
+            
+        Returns:
+            CompatibilityMatrix com as matrizes n × n e os jogos em comum por par
+            
+        Raises:
+            SteamAPIError: Se a biblioteca de algum usuário não puder ser obtida
+        """
+        from services.compatibility import CompatibilityMatrix
+        
+        libraries = {str(steamid): library for steamid, library in (libraries or {}).items()}
+        missing = [str(steamid) for steamid in steamids if str(steamid) not in libraries]
+        if missing:
+            print(f"\n📚 Buscando {len(missing)} bibliotecas...")
+            libraries.update(self.get_libraries(missing, max_workers))
+        
+        unavailable = [str(steamid) for steamid in steamids if str(steamid) not in libraries]
+        if unavailable:
+            raise SteamAPIError(f"Bibliotecas indisponíveis: {', '.join(unavailable)}", 403)
+        
+        print(f"🔄 Calculando compatibilidade entre {len(steamids)} usuários...")
+        return CompatibilityMatrix.from_libraries({str(steamid): libraries[str(steamid)] for steamid in steamids})
+
+    def print_compatibility(self, steamids: List[Union[str, int]], num_pairs: int = 10, num_games: int = 3,
+                            by: str = 'common_games') -> 'CompatibilityMatrix':
+        """Imprime os pares mais compatíveis de um grupo e seus jogos em comum mais jogados."""
+        matrix = self.get_compatibility_matrix(steamids)
+        
+        print("\n" + "="*50)
+        print("🤝 COMPATIBILIDADE ENTRE USUÁRIOS 🤝")
+        print("="*50)
+        
+        for i, (steamid1, steamid2, common, hours) in enumerate(matrix.top_pairs(num_pairs, by), 1):
+            print(f"\n{i}. 👥 {steamid1} × {steamid2}")
+            print(f"   📚 Jogos em comum: {common}")
+            print(f"   ⏰ Tempo total nos jogos em comum: {hours:.1f} horas")
+            for game in matrix.top_games(steamid1, steamid2, num_games):
+                print(
+                    f"      • {game['name']}: {game['user1_playtime_hours']:.1f}h + "
+                    f"{game['user2_playtime_hours']:.1f}h"
+                )
+        
+        print("\n✅ ANÁLISE CONCLUÍDA COM SUCESSO! ✅")
+        print("="*50)
+        return matrix
+
     def _create_game_info(self, appid: str, game_details: Dict, games1_dict: Dict, games2_dict: Dict) -> Dict:
         """
         Cria informações detalhadas de um jogo.
         
         Args:
             appid: ID do jogo
-            game_details: Detalhes do jogo da API
+            game_details: Bloco 'data' do documento appdetails do jogo
             games1_dict: Dicionário de jogos do usuário 1
             games2_dict: Dicionário de jogos do usuário 2
         
@@ -411,13 +855,13 @@ class SteamService:
         """
         return {
             'appid': appid,
-            'name': game_details['name'],
-            'description': game_details['description'],
-            'about_the_game': game_details['about_the_game'],
-            'pc_requirements': game_details['pc'],
-            'mac_requirements': game_details['mac'],
-            'linux_requirements': game_details['linux'],
-            'required_age': game_details['required_age'],
+            'name': game_details.get('name') or games1_dict[appid].get('name', f"Jogo {appid}"),
+            'description': game_details.get('short_description'),
+            'about_the_game': game_details.get('about_the_game'),
+            'pc_requirements': game_details.get('pc_requirements', {}),
+            'mac_requirements': game_details.get('mac_requirements', {}),
+            'linux_requirements': game_details.get('linux_requirements', {}),
+            'required_age': game_details.get('required_age'),
             'user1_playtime_hours': round(games1_dict[appid]['playtime_forever'] / 60, 2),
             'user2_playtime_hours': round(games2_dict[appid]['playtime_forever'] / 60, 2),
             'total_playtime_hours': round((games1_dict[appid]['playtime_forever'] + 
@@ -425,7 +869,8 @@ class SteamService:
             'details': game_details
         }
 
-    def _create_basic_game_info(self, appid: str, games1_dict: Dict, games2_dict: Dict) -> Dict:
+    def _create_basic_game_info(self, appid: str, games1_dict: Dict, games2_dict: Dict,
+                                name: Optional[str] = None) -> Dict:
         """
         Cria informações básicas de um jogo quando os detalhes completos não estão disponíveis.
         
@@ -433,13 +878,14 @@ class SteamService:
             appid: ID do jogo
             games1_dict: Dicionário de jogos do usuário 1
             games2_dict: Dicionário de jogos do usuário 2
+            name: Nome do jogo informado pela biblioteca (opcional)
         
         Returns:
             Dict: Informações básicas do jogo
         """
         return {
             'appid': appid,
-            'name': f"Jogo {appid}",
+            'name': name or f"Jogo {appid}",
             'description': f"Descrição não encontrada para o jogo {appid}",
             'about_the_game': f"Sobre o jogo não encontrado para o jogo {appid}",
             'pc_requirements': f"Requisitos não encontrados para o jogo {appid}",
@@ -452,4 +898,18 @@ class SteamService:
                                         games2_dict[appid]['playtime_forever']) / 60, 2)
         }
 
+_steam_service: Optional[SteamService] = None
+_steam_service_lock = threading.Lock()
 
+def get_steam_service() -> SteamService:
+    """
+    Retorna a instância de SteamService compartilhada pelo processo.
+    
+    Modelos que não recebem um serviço explícito usam esta instância, de modo
+    que caches e conexões são reaproveitados entre usuários e jogos.
+    """
+    global _steam_service
+    with _steam_service_lock:
+        if _steam_service is None:
+            _steam_service = SteamService()
+        return _steam_service
@@ -0,0 +1,49 @@
+import threading
+from typing import Dict, Iterable, List, Optional
+
+def normalize_term(term: str) -> str:
+    """Normaliza uma tag ou gênero: sem diferença de caixa e espaços extras."""
+    return " ".join(str(term).split()).casefold()
+
+class Vocabulary:
+    """
+    Vocabulário de termos (tags, gêneros) com IDs inteiros internados.
+
+    Termos que diferem apenas em caixa ou espaços recebem o mesmo ID. O
+    primeiro texto visto para cada termo é mantido para exibição.
+    """
+
+    def __init__(self, terms: Iterable[str] = ()):
+        self._ids: Dict[str, int] = {}
+        self._terms: List[str] = []
+        self._lock = threading.Lock()
+        for term in terms:
+            self.intern(term)
+
+    def intern(self, term: str) -> int:
+        """Retorna o ID do termo, registrando-o se ainda não existir."""
+        key = normalize_term(term)
+        term_id = self._ids.get(key)
+        if term_id is not None:
+            return term_id
+        with self._lock:
+            term_id = self._ids.get(key)
+            if term_id is None:
+                term_id = len(self._terms)
+                self._terms.append(" ".join(str(term).split()))
+                self._ids[key] = term_id
+            return term_id
+
+    def id_of(self, term: str) -> Optional[int]:
+        """Retorna o ID do termo, ou None se ele não estiver no vocabulário."""
+        return self._ids.get(normalize_term(term))
+
+    def term(self, term_id: int) -> str:
+        """Retorna o texto de exibição associado ao ID."""
+        return self._terms[term_id]
+
+    def __contains__(self, term: str) -> bool:
+        return normalize_term(term) in self._ids
+
+    def __len__(self) -> int:
+        return len(self._terms)